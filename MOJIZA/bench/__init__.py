@@ -0,0 +1,6 @@
+"""
+MOJIZA micro-benchmarklari.
+
+Ishga tushirish:
+    python -m MOJIZA.bench.routing_bench
+"""
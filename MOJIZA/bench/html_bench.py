@@ -0,0 +1,107 @@
+"""
+HTMLElement micro-benchmarklari:
+  - render: katta jadvalli sahifani eski rekursiv `html += ...` algoritmi va
+    yangi render dvigateli (pretty / minify) bilan solishtiradi;
+  - memory: bitta tugun uchun bayt va qurish vaqtini eski (`__dict__`li) tugun bilan solishtiradi.
+
+    python -m MOJIZA.bench.html_bench
+"""
+import time
+import timeit
+import tracemalloc
+
+from MOJIZA.engine.server import HTML, HTMLElement
+
+
+def _legacy_render(el, indent=0):
+    # Eski HTMLElement.render algoritmi (taqqoslash uchun)
+    sp = '    ' * indent
+    attrs = ' '.join(f'{k}="{v}"' for k, v in el.attrs.items())
+    if el.tag in ('meta', 'link', 'img', 'input', 'br', 'hr'):
+        return f"{sp}<{el.tag} {attrs}/>\n"
+    open_tag = f"<{el.tag}{' '+attrs if attrs else ''}>"
+    html = f"{sp}{open_tag}\n"
+    if el.content:
+        html += f"{sp}    {el.content}\n"
+    for c in el.children:
+        html += _legacy_render(c, indent+1) if isinstance(c, HTMLElement) else f"{sp}    {c}\n"
+    html += f"{sp}</{el.tag}>\n"
+    return html
+
+
+class _LegacyElement:
+    # Eski HTMLElement tuzilishi (taqqoslash uchun)
+    def __init__(self, tag, **attrs):
+        self.tag = tag
+        self.attrs = {k[2:]: v for k, v in attrs.items() if k.startswith('h_')}
+        self.children = []
+        self.content = ''
+        for k, v in attrs.items():
+            if not k.startswith('h_'):
+                self.attrs[k] = v
+
+
+def _build_nodes(cls, count):
+    table = cls('table')
+    row = None
+    for i in range(count):
+        if i % 10 == 0:
+            row = cls('tr', h_class="row")
+            table.children.append(row)
+        cell = cls('td')
+        cell.content = "x"
+        row.children.append(cell)
+    return table
+
+
+def measure_memory(cls, count=50000):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = _build_nodes(cls, count)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    nodes = count + count // 10 + 1
+    return size / nodes, elapsed
+
+
+def build_table_page(rows=500, cols=10):
+    page = HTML(title_document="Dashboard")
+    table = page.table(h_class="report")
+    head = table.thead().tr()
+    for c in range(cols):
+        head.th(f"col {c}")
+    body = table.tbody()
+    for r in range(rows):
+        tr = body.tr(h_class="row")
+        for c in range(cols):
+            tr.td(f"{r}:{c}", h_class="cell")
+    return page
+
+
+def run(rows=500, cols=10, number=10):
+    page = build_table_page(rows, cols)
+    legacy_html = page.doctype + "\n" + _legacy_render(page.html)
+    assert page.end() == legacy_html, "pretty render eski natija bilan bir xil bo'lishi kerak"
+
+    legacy = timeit.timeit(lambda: page.doctype + "\n" + _legacy_render(page.html), number=number) / number
+    pretty = timeit.timeit(lambda: page.end(), number=number) / number
+    minify = timeit.timeit(lambda: page.end(DEBUGS=False), number=number) / number
+
+    print(f"{rows}x{cols} table ({rows * cols} td)")
+    print(f"  legacy   {legacy * 1000:8.2f} ms  {len(legacy_html):>9} bytes")
+    print(f"  pretty   {pretty * 1000:8.2f} ms  {len(page.end()):>9} bytes")
+    print(f"  minified {minify * 1000:8.2f} ms  {len(page.end(DEBUGS=False)):>9} bytes")
+
+
+def run_memory(count=50000):
+    print(f"{count} td nodes")
+    for name, cls in (("legacy", _LegacyElement), ("slots", HTMLElement)):
+        per_node, elapsed = measure_memory(cls, count)
+        print(f"  {name:<8} {per_node:8.1f} bytes/node  {elapsed * 1000:8.2f} ms build")
+
+
+if __name__ == "__main__":
+    run()
+    run_memory()
@@ -0,0 +1,269 @@
+"""
+Yuklama benchmarki: serverni shu jarayonning o'zida (lokal portda) ishga
+tushirib, bir nechta ssenariy bo'yicha parallel so'rovlar yuboradi va
+requests/sec, kechikish persentillari (p50/p90/p99) hamda RSS'ni o'lchaydi.
+
+    python app.py bench
+    python app.py bench --scenarios view,table --concurrency 16 --duration 10
+    python app.py bench --json bench.json                  # natijani saqlash
+    python app.py bench --baseline bench.json              # saqlangan natija bilan solishtirish
+
+Ssenariylar: static (static fayl), view (oddiy view), table (katta HTML
+jadval sahifasi), 404 (mavjud bo'lmagan yo'l).
+
+Yuklama beruvchi thread'lar ham shu jarayonda ishlaydi (GIL umumiy), shuning
+uchun raqamlar mutlaq emas, balki o'zgarishlarni bir-biri bilan solishtirish uchun.
+"""
+import http.client
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import threading
+import time
+
+from MOJIZA.bench.html_bench import build_table_page
+
+logger = logging.getLogger("MOJIZA.bench.load")
+
+PREFIX = "/__bench"
+SCENARIOS = {
+    "static": PREFIX + "/static/asset.css",
+    "view": PREFIX + "/hello",
+    "table": PREFIX + "/table",
+    "404": PREFIX + "/missing",
+}
+
+
+def _hello(request):
+    return "hello"
+
+
+def _table(request):
+    return build_table_page(rows=500, cols=10).end()
+
+
+def rss_bytes():
+    """Joriy RSS (Linux'da /proc orqali, boshqa joyda eng yuqori RSS)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS baytda, Linux kilobaytda qaytaradi
+    return usage if platform.system() == "Darwin" else usage * 1024
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(p / 100.0 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def install_routes(router, static_dir):
+    from MOJIZA.static.files import StaticFiles
+
+    with open(os.path.join(static_dir, "asset.css"), "w") as f:
+        f.write("body { color: #333; }\n" * 200)
+    router.add_route(SCENARIOS["view"], _hello)
+    router.add_route(SCENARIOS["table"], _table)
+    router.add_route(PREFIX + "/static/", StaticFiles(static_dir, PREFIX + "/static"), exact=False)
+
+
+def start_server(engine="thread", workers=8):
+    """Serverni fon thread'ida ishga tushiradi: (port, stop) qaytaradi."""
+    if engine == "asyncio":
+        import asyncio
+        from MOJIZA.engine.aserver import AsyncServer
+        from MOJIZA.engine.routing import router
+
+        server = AsyncServer(router, port=0, host="127.0.0.1", workers=workers,
+                             max_keep_alive_requests=10 ** 9)
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(server.start())
+            ready.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        ready.wait()
+        port = server._server.sockets[0].getsockname()[1]
+
+        def stop():
+            # Server va ulanishlar loop ichida yopiladi, keyin loop to'xtatilib yopiladi
+            asyncio.run_coroutine_threadsafe(server.shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        return port, stop
+
+    from MOJIZA.engine.server import make_server
+
+    server = make_server(0, workers=workers, max_keep_alive_requests=10 ** 9)
+    # Har so'rov uchun stderr'ga yoziladigan access log o'lchovni buzadi
+    server.RequestHandlerClass.log_message = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+    return server.server_address[1], stop
+
+
+def drive(port, path, concurrency=8, duration=5.0, warmup=0.5):
+    """`concurrency` ta keep-alive ulanish bilan `duration` soniya davomida so'rov yuboradi."""
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    seen = [{} for _ in range(concurrency)]
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker(i):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        own = latencies[i]
+        statuses = seen[i]
+        while True:
+            t0 = time.perf_counter()
+            if t0 >= stop_at:
+                break
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors[i] += 1
+                conn.close()
+                continue
+            t1 = time.perf_counter()
+            if t0 >= start_at:
+                own.append(t1 - t0)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    merged = sorted(x for own in latencies for x in own)
+    statuses = {}
+    for own in seen:
+        for status, count in own.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        "path": path,
+        "requests": len(merged),
+        "errors": sum(errors),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "rps": len(merged) / duration,
+        "p50_ms": percentile(merged, 50) * 1000,
+        "p90_ms": percentile(merged, 90) * 1000,
+        "p99_ms": percentile(merged, 99) * 1000,
+        "max_ms": (merged[-1] if merged else 0.0) * 1000,
+        "rss_mb": rss_bytes() / (1024 * 1024),
+    }
+
+
+def run(scenarios=("static", "view", "table", "404"), concurrency=8, duration=5.0,
+        engine="thread", workers=8):
+    from MOJIZA.engine.routing import router
+
+    # So'rovlar logi natijani buzmasin
+    logging.getLogger("MOJIZA").setLevel(logging.WARNING)
+    logging.getLogger("MOJIZA.engine.routing").setLevel(logging.WARNING)
+
+    for name in scenarios:
+        if name not in SCENARIOS:
+            raise ValueError(f"Noma'lum ssenariy: {name} (mavjudlari: {', '.join(SCENARIOS)})")
+
+    static_dir = tempfile.mkdtemp(prefix="mojiza-bench-")
+    install_routes(router, static_dir)
+    port, stop = start_server(engine, workers)
+    results = {}
+    try:
+        for name in scenarios:
+            results[name] = drive(port, SCENARIOS[name], concurrency, duration)
+    finally:
+        stop()
+        shutil.rmtree(static_dir, ignore_errors=True)
+
+    return {
+        "engine": engine,
+        "workers": workers,
+        "concurrency": concurrency,
+        "duration": duration,
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def print_report(report):
+    print(f"engine={report['engine']} workers={report['workers']} "
+          f"concurrency={report['concurrency']} duration={report['duration']}s")
+    print(f"{'scenario':>9} {'req/s':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} {'rss MB':>7}")
+    for name, r in report["results"].items():
+        print(f"{name:>9} {r['rps']:>9.0f} {r['p50_ms']:>8.2f} {r['p90_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['max_ms']:>8.2f} {r['errors']:>7} {r['rss_mb']:>7.1f}")
+
+
+def compare(report, baseline, tolerance=0.10):
+    """
+    Natijani baseline bilan solishtiradi. req/s `tolerance` dan ko'proq tushsa
+    yoki p99 shuncha oshsa — regressiya. Regressiyalar ro'yxatini qaytaradi.
+    """
+    regressions = []
+    print(f"{'scenario':>9} {'req/s':>18} {'p99 ms':>20}")
+    for name, r in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        rps_delta = (r["rps"] - base["rps"]) / base["rps"] if base["rps"] else 0.0
+        p99_delta = (r["p99_ms"] - base["p99_ms"]) / base["p99_ms"] if base["p99_ms"] else 0.0
+        flag = ""
+        if rps_delta < -tolerance or p99_delta > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:>9} {base['rps']:>7.0f} -> {r['rps']:>7.0f} ({rps_delta:+.0%}) "
+              f"{base['p99_ms']:>6.2f} -> {r['p99_ms']:>6.2f} ({p99_delta:+.0%}){flag}")
+    return regressions
+
+
+def main(scenarios="static,view,table,404", concurrency=8, duration=5.0, engine="thread", workers=8,
+         json_path=None, baseline_path=None, tolerance=0.10):
+    """`runer.py bench` buyrug'i. Regressiya topilsa 1, aks holda 0 qaytaradi."""
+    names = [name.strip() for name in scenarios.split(",") if name.strip()]
+    try:
+        report = run(names, concurrency, duration, engine, workers)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return 2
+    print_report(report)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"JSON: {json_path}")
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
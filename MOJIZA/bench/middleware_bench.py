@@ -0,0 +1,67 @@
+"""
+Middleware zanjiri micro-benchmarki: har bir qatlam (layer) so'rovga qancha
+vaqt qo'shishini o'lchaydi. Oldindan yig'ilgan zanjir (closure'lar) har
+so'rovda ro'yxatni aylanib chiquvchi oddiy usul bilan solishtiriladi.
+
+    python -m MOJIZA.bench.middleware_bench
+"""
+import timeit
+
+from MOJIZA.engine.middleware import Middleware, compose
+
+
+class _Pre(Middleware):
+    def process_request(self, request, route):
+        return None
+
+
+class _Post(Middleware):
+    def process_response(self, request, route, response):
+        return response
+
+
+class _Both(_Pre, _Post):
+    pass
+
+
+class _Skipped(_Both):
+    def applies(self, route):
+        return False
+
+
+_RESPONSE = (200, "text/html", b"ok", None)
+
+
+def _core(request, route, path_params):
+    return _RESPONSE
+
+
+def _naive(middlewares, request, route, path_params):
+    # Har so'rovda ro'yxatni aylanib, hook'larni dinamik topuvchi usul (taqqoslash uchun)
+    for mw in middlewares:
+        response = getattr(mw, "process_request")(request, route)
+        if response is not None:
+            return response
+    response = _core(request, route, path_params)
+    for mw in reversed(middlewares):
+        response = getattr(mw, "process_response")(request, route, response)
+    return response
+
+
+def run(depths=(0, 1, 5, 10, 20), number=200000):
+    base = timeit.timeit(lambda: _core(None, None, None), number=number) / number * 1e9
+    print(f"core (middleware'siz): {base:.0f} ns/op")
+    print(f"{'layers':>7} {'pre ns':>8} {'post ns':>8} {'both ns':>8} {'skipped ns':>11} {'naive ns':>9} {'both/layer':>11}")
+    for depth in depths:
+        row = []
+        for cls in (_Pre, _Post, _Both, _Skipped):
+            chain = compose([cls() for _ in range(depth)], _core, route=object())
+            row.append(timeit.timeit(lambda: chain(None, None, None), number=number) / number * 1e9)
+        mws = [_Both() for _ in range(depth)]
+        naive = timeit.timeit(lambda: _naive(mws, None, None, None), number=number) / number * 1e9
+        per_layer = (row[2] - base) / depth if depth else 0.0
+        print(f"{depth:>7} {row[0]:>8.0f} {row[1]:>8.0f} {row[2]:>8.0f} {row[3]:>11.0f} {naive:>9.0f} {per_layer:>11.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,52 @@
+"""
+Router.get_view micro-benchmarki: route'lar soni oshganda qidiruv vaqti
+o'zgarmasligini (radix trie) eski chiziqli qidiruv bilan solishtiradi.
+
+    python -m MOJIZA.bench.routing_bench
+"""
+import logging
+import timeit
+
+from MOJIZA.engine.routing import Router
+
+
+def _view(request):
+    return ""
+
+
+def _linear_get_view(routes, path):
+    # Eski Router.get_view algoritmi (taqqoslash uchun)
+    for route in routes:
+        if route.exact and path == route.route:
+            return route.view
+        if not route.exact and path.startswith(route.route):
+            return route.view
+    return None
+
+
+def build_router(count):
+    router = Router()
+    for i in range(count):
+        router.add_route(f"/app{i}/items/detail", _view)
+        router.add_route(f"/app{i}/assets/", _view, exact=False)
+        router.add_route(f"/app{i}/users/<int:id>", _view)
+    return router
+
+
+def run(sizes=(10, 100, 1000, 5000), number=20000):
+    logging.getLogger("MOJIZA.engine.routing").setLevel(logging.WARNING)
+    print(f"{'routes':>8} {'trie ns/op':>12} {'param ns/op':>12} {'linear ns/op':>14}")
+    for size in sizes:
+        apps = max(size // 3, 1)
+        router = build_router(apps)
+        # Eng yomon holat chiziqli qidiruv uchun: oxirgi app'ning route'i
+        path = f"/app{apps - 1}/items/detail"
+        param_path = f"/app{apps - 1}/users/42"
+        trie = timeit.timeit(lambda: router.get_view(path), number=number) / number * 1e9
+        param = timeit.timeit(lambda: router.match(param_path), number=number) / number * 1e9
+        linear = timeit.timeit(lambda: _linear_get_view(router.routes, path), number=number // 10) / (number // 10) * 1e9
+        print(f"{size:>8} {trie:>12.0f} {param:>12.0f} {linear:>14.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,447 @@
+import asyncio
+import contextvars
+import io
+import inspect
+import logging
+import functools
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+
+from MOJIZA.engine.server import encode_result, is_stream
+from MOJIZA.engine.middleware import middleware
+from MOJIZA.engine.metrics import metrics, current_stats
+from MOJIZA.engine.request import Headers, Request, MAX_BODY_SIZE, CHUNK_SIZE
+from MOJIZA.engine.multipart import MultipartError, SPOOL_SIZE
+from MOJIZA.static.files import FileResponse
+
+logger = logging.getLogger("MOJIZA.engine.aserver")
+
+MAX_HEADER_SIZE = 64 * 1024
+
+
+class AsyncServer:
+    """
+    asyncio streams asosidagi server. `async def` view'lar event loop ichida
+    kutiladi (await), oddiy view'lar esa executor'da bajariladi.
+    """
+
+    def __init__(self, router, port=8000, host="", workers=None, backlog=128, header_timeout=30,
+                 keep_alive_timeout=5, max_keep_alive_requests=100, max_body_size=MAX_BODY_SIZE):
+        self.router = router
+        self.port = port
+        self.host = host or None
+        self.backlog = backlog
+        self.header_timeout = header_timeout
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_keep_alive_requests = max_keep_alive_requests if keep_alive_timeout else 1
+        self.max_body_size = max_body_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mojiza-async")
+        self._server = None
+        self._connections = set()
+
+    async def start(self):
+        # Oddiy (sync) view'lar `call_view` da loop'ning standart executor'ida bajariladi
+        asyncio.get_running_loop().set_default_executor(self.executor)
+        self._server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port,
+            backlog=self.backlog, limit=MAX_HEADER_SIZE,
+        )
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+        self.executor.shutdown(wait=False)
+
+    async def shutdown(self):
+        """
+        Loop ichidan to'xtatish: yangi ulanishlar qabul qilinmaydi, ochiq ulanishlar
+        task'lari bekor qilinadi va tugashi kutiladi (loop yopilganda osilib qolmaydi).
+        """
+        if self._server is not None:
+            self._server.close()
+        # Qabul qilingan, lekin task'i hali boshlanmagan ulanishlar ham yopilsin
+        await asyncio.sleep(0)
+        while self._connections:
+            connections = list(self._connections)
+            for task in connections:
+                task.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+            await asyncio.sleep(0)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        served = 0
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                # Birinchi so'rov uchun header_timeout, keyingilari uchun keep-alive idle timeout
+                timeout = self.header_timeout if served == 0 else self.keep_alive_timeout
+                request = await self._read_request(reader, writer, peer, timeout)
+                if request is None:
+                    return
+                served += 1
+                keep_alive = self._wants_keep_alive(request) and served < self.max_keep_alive_requests
+
+                if metrics.enabled:
+                    stats, token = metrics.begin()
+                    try:
+                        status, keep_alive = await self.respond(writer, request, keep_alive)
+                    finally:
+                        metrics.finish(stats, token)
+                else:
+                    status, keep_alive = await self.respond(writer, request, keep_alive)
+                logger.info(f'{peer[0] if peer else "-"} "{request.command} {request.full_path} {request.request_version}" {status}')
+                if not keep_alive:
+                    return
+        except _BadRequest as e:
+            await self._write_response(writer, e.status, "text/plain", e.message.encode())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # `shutdown()` bekor qildi. Task oddiy tugaydi: Python < 3.12 da streams
+            # callback'i bekor qilingan task'ni "Exception in callback" deb log qiladi
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _wants_keep_alive(request):
+        connection = request.headers.get("Connection", "").lower()
+        if request.request_version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    async def _read_request(self, reader, writer, peer, timeout):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise _BadRequest(400, "400 Bad Request")
+        except asyncio.LimitOverrunError:
+            raise _BadRequest(431, "431 Request Header Fields Too Large")
+
+        request_line, _, rest = head.partition(b"\r\n")
+        try:
+            command, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise _BadRequest(400, "400 Bad Request")
+        # Header'lar birinchi murojaatda parse qilinadi (http.client/email parser'isiz)
+        headers = Headers(rest)
+
+        if headers.get("Transfer-Encoding"):
+            raise _BadRequest(501, "501 Chunked request bodies are not supported")
+        try:
+            content_length = int(headers.get("Content-Length", 0))
+        except ValueError:
+            raise _BadRequest(400, "400 Bad Request")
+        if content_length > self.max_body_size:
+            # Body o'qilmaydi: javobdan keyin ulanish yopiladi
+            raise _BadRequest(413, "413 Payload Too Large")
+        if content_length > 0 and headers.get("Expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        rfile = await self._read_body(reader, content_length)
+
+        return Request(command, path, version, headers, rfile, peer)
+
+    @staticmethod
+    async def _read_body(reader, content_length):
+        """
+        Kichik body xotiraga o'qiladi, kattasi bo'laklab vaqtinchalik faylga yoziladi
+        (yuzlab MB lik yuklashlar ham xotirani to'ldirmaydi).
+        """
+        if content_length <= SPOOL_SIZE:
+            return io.BytesIO(await reader.readexactly(content_length) if content_length > 0 else b"")
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        try:
+            remaining = content_length
+            while remaining > 0:
+                chunk = await reader.read(min(remaining, CHUNK_SIZE))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                spool.write(chunk)
+                remaining -= len(chunk)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+    async def respond(self, writer, request, keep_alive):
+        """So'rovni bajarib, javobni yozadi: (status, keep_alive) qaytaradi."""
+        try:
+            status, content_type, content, headers = await self.dispatch(request)
+            if isinstance(content, FileResponse):
+                keep_alive = await self._write_file(writer, status, content_type, content, keep_alive,
+                                                    request.request_version, headers)
+            elif is_stream(content):
+                status, keep_alive = await self._write_stream(writer, status, content_type, content, keep_alive,
+                                                              request.request_version, headers)
+            else:
+                await self._write_response(writer, status, content_type, content, keep_alive,
+                                           request.request_version, headers)
+        finally:
+            request.close()
+            request.rfile.close()
+        return status, keep_alive
+
+    async def dispatch(self, request):
+        stats = current_stats()
+        if stats is None:
+            route, path_params = self.router.match(request.path)
+        else:
+            start = time.perf_counter()
+            route, path_params = self.router.match(request.path)
+            stats.routing = time.perf_counter() - start
+            if route is not None:
+                stats.route = route.route
+        if route is None:
+            return 404, "text/plain", b"404 Not Found", None
+
+        try:
+            return await route.async_chain(request, route, path_params)
+        except MultipartError as e:
+            return e.status, "text/plain", f"{e.status} {e}".encode(), None
+        except Exception as e:
+            logger.exception("Error during request handling")
+            return 500, "text/plain", f"500 Internal Server Error\n\n{e}".encode(), None
+
+    async def _write_response(self, writer, status, content_type, content, keep_alive=False,
+                              request_version="HTTP/1.1", headers=None):
+        head = (
+            f"HTTP/1.1 {status} {_reason(status)}\r\n"
+            f"Date: {formatdate(usegmt=True)}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            + ("" if status in (204, 304) else f"Content-Length: {len(content)}\r\n")
+            + _format_headers(headers)
+            + _connection_header(keep_alive, request_version)
+            + "\r\n"
+        )
+        writer.write(head.encode("latin-1"))
+        writer.write(content)
+        _record(status, len(content))
+        await writer.drain()
+
+    async def _write_file(self, writer, status, content_type, response, keep_alive=False,
+                          request_version="HTTP/1.1", headers=None):
+        """
+        Faylni `loop.sendfile` orqali yuboradi (imkon bo'lsa os.sendfile, zero-copy).
+        Ulanishni saqlash mumkinmi — shuni qaytaradi.
+        """
+        try:
+            f = open(response.path, "rb")
+        except OSError:
+            await self._write_response(writer, 404, "text/plain", b"File not found", keep_alive, request_version)
+            return keep_alive
+        with f:
+            head = (
+                f"HTTP/1.1 {status} {_reason(status)}\r\n"
+                f"Date: {formatdate(usegmt=True)}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {response.length}\r\n"
+                + _format_headers(headers)
+                + _connection_header(keep_alive, request_version)
+                + "\r\n"
+            )
+            writer.write(head.encode("latin-1"))
+            _record(status, response.length)
+            await writer.drain()
+            if response.length > 0:
+                loop = asyncio.get_running_loop()
+                sent = await loop.sendfile(writer.transport, f, response.offset, response.length)
+                if sent < response.length:
+                    return False
+        return keep_alive
+
+    async def _iter_stream(self, content):
+        if hasattr(content, "__anext__"):
+            async for chunk in content:
+                yield chunk
+            return
+        # Oddiy generatorlar render qiladi (CPU), shuning uchun executor'da aylantiramiz
+        loop = asyncio.get_running_loop()
+        done = object()
+        while True:
+            chunk = await loop.run_in_executor(self.executor, next, content, done)
+            if chunk is done:
+                return
+            yield chunk
+
+    async def _write_stream(self, writer, status, content_type, content, keep_alive=False,
+                            request_version="HTTP/1.1", headers=None):
+        """
+        Javobni `Transfer-Encoding: chunked` bilan yuboradi (HTTP/1.0 uchun —
+        ulanishni yopish orqali). Haqiqatda yuborilgan status va ulanishni saqlash
+        mumkinmi — shularni qaytaradi.
+        """
+        chunked = request_version != "HTTP/1.0"
+        stream = self._iter_stream(content)
+        sent = 0
+        try:
+            # Birinchi bo'lak header'lardan oldin olinadi: view xatosi hali 500 bo'lib qaytishi mumkin
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                first = b""
+            except (ConnectionError, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                logger.exception("Error during request handling")
+                await self._write_response(writer, 500, "text/plain",
+                                           f"500 Internal Server Error\n\n{e}".encode(), keep_alive, request_version)
+                return 500, keep_alive
+
+            keep_alive = keep_alive and chunked
+            head = (
+                f"HTTP/1.1 {status} {_reason(status)}\r\n"
+                f"Date: {formatdate(usegmt=True)}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                + ("Transfer-Encoding: chunked\r\n" if chunked else "")
+                + _format_headers(headers)
+                + ("" if keep_alive else "Connection: close\r\n")
+                + "\r\n"
+            )
+            writer.write(head.encode("latin-1"))
+            try:
+                chunk = first
+                while True:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    if chunk:
+                        sent += len(chunk)
+                        writer.write(b"%x\r\n%b\r\n" % (len(chunk), chunk) if chunked else chunk)
+                        await writer.drain()
+                    try:
+                        chunk = await stream.__anext__()
+                    except StopAsyncIteration:
+                        break
+                if chunked:
+                    writer.write(b"0\r\n\r\n")
+                await writer.drain()
+            except (ConnectionError, asyncio.CancelledError):
+                raise
+            except Exception:
+                # Header'lar allaqachon ketgan, 500 yuborib bo'lmaydi: ulanishni uzamiz
+                logger.exception("Error during streaming response")
+                return status, False
+            finally:
+                _record(status, sent)
+            return status, keep_alive
+        finally:
+            await stream.aclose()
+            await _close_stream(content)
+
+async def call_view(request, route, path_params):
+    """
+    Async middleware zanjirining markazi: async view kutiladi, oddiy view
+    loop'ning standart executor'ida (`AsyncServer.executor`) bajariladi.
+    """
+    params = request.params if route.needs_params else None
+    stats = current_stats()
+    start = time.perf_counter() if stats is not None else 0
+    if route.is_async:
+        result = await route.dispatch(request, params, path_params)
+    else:
+        loop = asyncio.get_running_loop()
+        # Kontekst nusxasi executor thread'iga o'tadi: HTML.end() render vaqtini yoza oladi
+        result = await loop.run_in_executor(
+            None, contextvars.copy_context().run,
+            functools.partial(route.dispatch, request, params, path_params)
+        )
+        if inspect.isawaitable(result):
+            result = await result
+    if stats is not None:
+        stats.view += time.perf_counter() - start
+    return encode_result(result)
+
+
+middleware.set_core(call_view, is_async=True)
+
+
+async def _close_stream(content):
+    """View generatorini yopadi (uning `finally` bloklari ishlasin), mijoz uzilgan bo'lsa ham."""
+    try:
+        if hasattr(content, "aclose"):
+            await content.aclose()
+        elif hasattr(content, "close"):
+            content.close()
+    except (RuntimeError, ValueError):
+        # Bekor qilingan `next()` executor'da hali ishlayapti: generatorni yopib bo'lmaydi
+        logger.debug("Stream generator could not be closed", exc_info=True)
+
+
+def _record(status, length):
+    stats = current_stats()
+    if stats is not None:
+        stats.status = status
+        stats.bytes += length
+
+
+def _reason(status):
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return ""
+
+
+def _connection_header(keep_alive, request_version):
+    if not keep_alive:
+        return "Connection: close\r\n"
+    if request_version == "HTTP/1.0":
+        return "Connection: keep-alive\r\n"
+    return ""
+
+
+def _format_headers(headers):
+    if not headers:
+        return ""
+    return "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+
+
+class _BadRequest(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def run_async_server(port=8000, workers=None, backlog=128, keep_alive_timeout=5, max_keep_alive_requests=100,
+                     max_body_size=MAX_BODY_SIZE):
+    """
+    Serverni asyncio dvigatelida ishga tushiradi. `workers` — oddiy (sync)
+    view'lar uchun executor hajmi.
+    """
+    from MOJIZA.engine.routing import router
+
+    server = AsyncServer(router, port=port, workers=workers, backlog=backlog,
+                         keep_alive_timeout=keep_alive_timeout, max_keep_alive_requests=max_keep_alive_requests,
+                         max_body_size=max_body_size)
+    logger.info(f"Async server running on port {port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        logger.info("Server stopped")
@@ -0,0 +1,128 @@
+"""
+Kesh vositalari.
+
+`LRUCache` — thread-safe LRU kesh: yozuvlar soni, umumiy hajm (bayt) va TTL bo'yicha cheklanadi.
+
+Fragment kesh — sahifaning o'zgarmaydigan qismlarini (navbar, footer, sidebar)
+bir marta render qilib, tayyor HTML sifatida qayta ishlatish uchun:
+
+    from MOJIZA.engine.cache import fragment
+
+    @fragment(ttl=300)
+    def navbar(user_name):
+        nav = HTMLElement('nav')
+        nav.a("Bosh sahifa", href="/")
+        nav.span(user_name)
+        return nav
+
+    page.body.children.append(navbar("Ali"))
+
+Kalit — funksiya nomi va argumentlari. Dev reloader ishlaganda kesh tozalanadi.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from MOJIZA.engine.render import RawHTML, render
+
+
+class LRUCache:
+    def __init__(self, maxsize=1024, max_bytes=None, ttl=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.bytes -= size
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size=0, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl else None
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Bitta yozuv butun keshdan katta bo'lsa, saqlamaymiz
+            return False
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, size, expires)
+            self.bytes += size
+            while self._data and (len(self._data) > self.maxsize or
+                                  (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+        return True
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FragmentCache(LRUCache):
+    """
+    Render qilingan HTMLElement qismlari uchun kesh. Qiymat — `RawHTML`
+    (render paytida o'zgarishsiz qo'yiladigan tayyor HTML satri).
+    """
+
+    def render(self, key, element, ttl=None, minify=False):
+        """
+        `element` — HTMLElement, satr yoki uni quruvchi funksiya (faqat kesh
+        bo'sh bo'lganda chaqiriladi).
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        if not isinstance(element, str) and not hasattr(element, 'tag'):
+            element = element()
+        html = RawHTML(element if isinstance(element, str) else render(element, pretty=not minify))
+        self.set(key, html, size=len(html.encode()), ttl=ttl)
+        return html
+
+
+fragment_cache = FragmentCache(maxsize=1024, max_bytes=16 * 1024 * 1024, ttl=None)
+
+
+def fragment(ttl=None, minify=False, cache=None):
+    """
+    Builder funksiyani fragment kesh bilan o'raydi. Kalit: funksiya (modul +
+    nom) va uning argumentlari, shuning uchun argumentlar hashable bo'lishi kerak.
+    """
+    def decorator(builder):
+        name = (builder.__module__, builder.__qualname__)
+
+        @wraps(builder)
+        def wrapper(*args, **kwargs):
+            target = cache if cache is not None else fragment_cache
+            key = (name, args, tuple(sorted(kwargs.items())) if kwargs else ())
+            return target.render(key, lambda: builder(*args, **kwargs), ttl=ttl, minify=minify)
+        return wrapper
+    return decorator
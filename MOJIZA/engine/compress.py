@@ -0,0 +1,213 @@
+"""
+Javoblarni siqish: `Accept-Encoding` bo'yicha kodlashni tanlash, qaysi turdagi
+kontent siqilishga arziydi va dinamik javoblarni (HTML.end(), HTML.stream())
+yuborishdan oldin siqish.
+
+    from MOJIZA.engine.compress import compression
+    compression.level = 5
+    compression.min_size = 2048
+
+brotli ixtiyoriy: `brotli` paketi o'rnatilgan bo'lsa ishlatiladi.
+"""
+import zlib
+from functools import lru_cache
+
+from MOJIZA.engine.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Matnli turlar yaxshi siqiladi; rasm/video/arxivlar allaqachon siqilgan
+COMPRESSIBLE_TYPES = frozenset((
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "application/wasm",
+    "image/svg+xml",
+    "image/x-icon",
+    "image/vnd.microsoft.icon",
+    "font/ttf",
+    "font/otf",
+))
+
+
+def is_compressible(content_type):
+    if not content_type:
+        return False
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+@lru_cache(maxsize=256)
+def accepted_encodings(header):
+    """
+    `Accept-Encoding` sarlavhasidan mijoz qabul qiladigan kodlashlar to'plamini
+    qaytaradi (`q=0` bilan rad etilganlari kirmaydi). Brauzerlar bir xil
+    sarlavha yuborgani uchun natija keshlanadi.
+    """
+    accepted = set()
+    rejected = set()
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        (accepted if q > 0 else rejected).add(name)
+    if "*" in accepted:
+        accepted |= {"br", "gzip"} - rejected
+    return frozenset(accepted)
+
+
+def choose_encoding(header, available=("br", "gzip")):
+    """`available` tartibida birinchi qabul qilinadigan kodlash yoki None."""
+    if not header:
+        return None
+    accepted = accepted_encodings(header)
+    for encoding in available:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def _header(headers, name):
+    """Header'ni registrga qaramay topadi: (kalit, qiymat) yoki (None, None)."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return key, value
+    return None, None
+
+
+def gzip_chunks(chunks, level=6):
+    """
+    Bo'laklar oqimini gzip bilan siqadi. Har bo'lakdan keyin Z_SYNC_FLUSH:
+    brauzer `<head>` ni kutmasdan ochib, CSS/JS'ni yuklay boshlaydi.
+    """
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield z.compress(chunk) + z.flush(zlib.Z_SYNC_FLUSH)
+        yield z.flush()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+async def agzip_chunks(chunks, level=6):
+    """`gzip_chunks` ning async generatorlar uchun varianti."""
+    z = zlib.compressobj(level, zlib.DEFLATED, 31)
+    try:
+        async for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield z.compress(chunk) + z.flush(zlib.Z_SYNC_FLUSH)
+        yield z.flush()
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class Compression:
+    """
+    Dinamik javoblarni siqish sozlamalari.
+
+    level    - siqish darajasi (1-9), 0 - siqish o'chirilgan;
+    min_size - bundan kichik javoblar siqilmaydi (bayt);
+    types    - siqiladigan MIME turlari to'plami (None - `is_compressible`).
+
+    Sarlavhasida ETag bo'lgan javoblarning (masalan sahifa keshidan) siqilgan
+    nusxasi saqlab qo'yiladi va har so'rovda qayta siqilmaydi.
+    """
+
+    def __init__(self, level=6, min_size=1024, types=None, cache_bytes=32 * 1024 * 1024):
+        self.level = level
+        self.min_size = min_size
+        self.types = types
+        self._cache = LRUCache(maxsize=4096, max_bytes=cache_bytes)
+
+    def allowed(self, content_type):
+        if self.types is None:
+            return is_compressible(content_type)
+        return bool(content_type) and content_type.split(";", 1)[0].strip().lower() in self.types
+
+    def compress(self, data, encoding):
+        if encoding == "br":
+            return brotli.compress(data, quality=min(self.level, 11))
+        z = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return z.compress(data) + z.flush()
+
+    def apply(self, request, status, content_type, content, headers=None):
+        """
+        Javobni (kerak bo'lsa) siqadi va yangi (status, content_type, content, headers) qaytaradi.
+        Fayllar, kichik javoblar, rasm/arxiv kabi turlar va allaqachon siqilgan
+        (`Content-Encoding` bor) javoblar o'zgarishsiz qoladi.
+        """
+        if not self.level or status < 200 or status in (204, 206, 304):
+            return status, content_type, content, headers
+        if isinstance(content, bytes):
+            if len(content) < self.min_size or content[:2] == b"\x1f\x8b":
+                return status, content_type, content, headers
+            available = ("br", "gzip") if brotli is not None else ("gzip",)
+        elif hasattr(content, "__next__") or hasattr(content, "__anext__"):
+            available = ("gzip",)
+        else:
+            return status, content_type, content, headers
+        if not self.allowed(content_type):
+            return status, content_type, content, headers
+        headers = dict(headers) if headers else {}
+        if _header(headers, "Content-Encoding")[0] is not None:
+            return status, content_type, content, headers
+
+        # Javob kodlashga qarab farq qiladi: oraliq keshlar buni bilishi kerak
+        vary_key, vary = _header(headers, "Vary")
+        if vary is None:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers[vary_key] = vary + ", Accept-Encoding"
+
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), available)
+        if encoding is None:
+            return status, content_type, content, headers
+        headers["Content-Encoding"] = encoding
+
+        etag_key, etag = _header(headers, "ETag")
+        if isinstance(content, bytes):
+            # Kuchli ETag bir xil mazmunni bildiradi, kuchsizi emas
+            cache_key = (etag, encoding) if etag and not etag.startswith("W/") else None
+            compressed = self._cache.get(cache_key) if cache_key else None
+            if compressed is None:
+                compressed = self.compress(content, encoding)
+                if cache_key:
+                    self._cache.set(cache_key, compressed, size=len(compressed))
+            content = compressed
+        elif hasattr(content, "__anext__"):
+            content = agzip_chunks(content, self.level)
+        else:
+            content = gzip_chunks(content, self.level)
+        if etag and not etag.startswith("W/"):
+            # Siqilgan nusxa baytma-bayt boshqa: kuchsiz ETag (If-None-Match baribir mos keladi)
+            headers[etag_key] = "W/" + etag
+        return status, content_type, content, headers
+
+    def clear(self):
+        self._cache.clear()
+
+
+compression = Compression()
@@ -0,0 +1,162 @@
+"""
+App'larni topish (discovery).
+
+Loyiha papkasi `os.walk` bilan aylanib chiqiladi, lekin app bo'la olmaydigan
+papkalar (`EXCLUDE_DIRS`: VCS, virtualenv, `site-packages`, `node_modules`,
+`__pycache__`, MOJIZA keshi) `dirs` ro'yxatidan olib tashlanadi — ularning
+ichiga umuman kirilmaydi. Boshqa papkalarni `--exclude` bilan qo'shish mumkin.
+`urls.py` bor har bir papka app hisoblanadi.
+
+Natija `.mojiza_cache/discovery/apps.json` manifestiga yoziladi: unda
+ko'rilgan har bir papkaning mtime'i saqlanadi. Keyingi ishga tushishda
+papkalar faqat `stat` qilinadi; hech biri o'zgarmagan bo'lsa (fayl
+qo'shilmagan/o'chirilmagan), qayta aylanib chiqilmaydi.
+"""
+import json
+import logging
+import os
+import tempfile
+from time import perf_counter
+
+logger = logging.getLogger("MOJIZA.engine.discovery")
+
+# Alohida papka: sahifa keshining `FileBackend(".mojiza_cache")` i `clear()` da faqat fayllarni o'chiradi
+CACHE_DIR = os.path.join(".mojiza_cache", "discovery")
+MANIFEST_NAME = "apps.json"
+MANIFEST_VERSION = 1
+
+# Faqat app bo'la olmaydigan papkalar: `build`, `media` kabi nomli app'lar ham topilishi kerak
+EXCLUDE_DIRS = frozenset({
+    "__pycache__", "site-packages", "node_modules", "venv", ".venv",
+    ".git", ".hg", ".svn", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".mojiza_cache",
+})
+
+
+class App:
+    __slots__ = ("name", "path", "urls", "views")
+
+    def __init__(self, name, path, urls, views):
+        self.name = name
+        self.path = path
+        self.urls = urls
+        self.views = views
+
+    def to_json(self):
+        return {"name": self.name, "path": self.path, "urls": self.urls, "views": self.views}
+
+    def __repr__(self):
+        return f"<App {self.name} {self.path}>"
+
+
+def is_excluded(name, exclude_dirs):
+    return name in exclude_dirs or name.endswith(".egg-info")
+
+
+def walk_apps(project_root, exclude_dirs=EXCLUDE_DIRS):
+    """(apps, dir_mtimes): `urls.py` bor papkalar va ko'rilgan papkalar mtime'lari."""
+    apps = []
+    dir_mtimes = {}
+    for root, dirs, files in os.walk(project_root):
+        skipped = [d for d in dirs if is_excluded(d, exclude_dirs)]
+        if skipped:
+            logger.debug(f"Discovery: {root} ichida o'tkazib yuborildi: {', '.join(sorted(skipped))}")
+            dirs[:] = sorted(d for d in dirs if d not in skipped)
+        else:
+            dirs.sort()
+        try:
+            dir_mtimes[root] = os.stat(root).st_mtime_ns
+        except OSError:
+            continue
+        if "urls.py" in files:
+            apps.append(App(os.path.basename(os.path.abspath(root)), root,
+                            os.path.join(root, "urls.py"), "views.py" in files))
+    return apps, dir_mtimes
+
+
+def _manifest_path(project_root):
+    return os.path.join(project_root, CACHE_DIR, MANIFEST_NAME)
+
+
+def load_manifest(project_root, exclude_dirs):
+    """Manifest hali to'g'ri bo'lsa app'lar ro'yxatini, aks holda None qaytaradi."""
+    try:
+        with open(_manifest_path(project_root), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"{MANIFEST_NAME} o'qilmadi: {e}")
+        return None
+    if data.get("version") != MANIFEST_VERSION or data.get("exclude") != sorted(exclude_dirs):
+        return None
+    for path, mtime in data.get("dirs", {}).items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+    return [App(**app) for app in data.get("apps", [])]
+
+
+def save_manifest(project_root, exclude_dirs, apps, dir_mtimes):
+    data = {
+        "version": MANIFEST_VERSION,
+        "exclude": sorted(exclude_dirs),
+        "dirs": dir_mtimes,
+        "apps": [app.to_json() for app in apps],
+    }
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.join(project_root, CACHE_DIR), prefix=MANIFEST_NAME)
+    except OSError as e:
+        # Faqat o'qiladigan papka: keyingi safar yana aylanib chiqamiz
+        logger.warning(f"{MANIFEST_NAME} yozilmadi: {e}")
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, _manifest_path(project_root))
+    except OSError as e:
+        logger.warning(f"{MANIFEST_NAME} yozilmadi: {e}")
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+_discovered = {}
+
+
+def discover_apps(project_root=".", exclude_dirs=EXCLUDE_DIRS, use_manifest=True, refresh=False, timings=None):
+    """
+    Loyihadagi app'lar ro'yxati. Bir jarayonda bir marta hisoblanadi
+    (`get_generated_apps` va `load_app_routes` bir xil natijani ishlatadi);
+    `refresh=True` — qaytadan topish (dev reloader uchun).
+    `timings` dict berilsa, unga `discovery` vaqti va manbasi yoziladi.
+    """
+    # Manifestdagi yo'llar absolyut: loyiha ko'chirilsa, stat xato beradi va qayta aylanib chiqiladi
+    project_root = os.path.abspath(project_root)
+    exclude_dirs = frozenset(exclude_dirs)
+    key = (project_root, exclude_dirs)
+    start = perf_counter()
+    source = "memory"
+    apps = None if refresh else _discovered.get(key)
+    if apps is None:
+        apps = load_manifest(project_root, exclude_dirs) if use_manifest and not refresh else None
+        source = "manifest"
+        if apps is None:
+            if use_manifest:
+                # Papka aylanib chiqishdan oldin yaratiladi: aks holda ildiz mtime'i
+                # manifest yozilgach o'zgarib, u keyingi safar eskirgan hisoblanadi
+                try:
+                    os.makedirs(os.path.join(project_root, CACHE_DIR), exist_ok=True)
+                except OSError:
+                    pass
+            apps, dir_mtimes = walk_apps(project_root, exclude_dirs)
+            source = "walk"
+            if use_manifest:
+                save_manifest(project_root, exclude_dirs, apps, dir_mtimes)
+        _discovered[key] = apps
+    if timings is not None:
+        timings["discovery"] = perf_counter() - start
+        timings["discovery_source"] = source
+    return apps
@@ -0,0 +1,198 @@
+"""
+So'rovlar metrikasi (Prometheus text formatida).
+
+Har bir route bo'yicha yig'iladi: routing, view va render (`HTML.end`) vaqti,
+umumiy javob vaqti, yuborilgan baytlar, status'lar soni va bajarilayotgan
+so'rovlar (in-flight).
+
+    python app.py run_script --metrics      # /__metrics route'i qo'shiladi
+
+Hisoblagichlar har bir thread uchun alohida (shard) saqlanadi, shuning uchun
+yozishda lock olinmaydi; `/__metrics` so'ralganda shard'lar yig'indisi olinadi.
+Joriy so'rov statistikasi `contextvars` orqali uzatiladi (thread va asyncio
+task'lari uchun bir xil ishlaydi).
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+# Soniyalarda, oxirgisidan kattalari `+Inf` ga tushadi
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED = "<unmatched>"
+
+_current = ContextVar("mojiza_request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("route", "start", "routing", "view", "render", "bytes", "status")
+
+    def __init__(self, start):
+        self.route = UNMATCHED
+        self.start = start
+        self.routing = 0.0
+        self.view = 0.0
+        self.render = 0.0
+        self.bytes = 0
+        self.status = 0
+
+
+def current_stats():
+    """Joriy so'rov statistikasi (metrika o'chirilgan bo'lsa yoki so'rovdan tashqarida - None)."""
+    return _current.get()
+
+
+class _Shard:
+    """Bitta thread'ning hisoblagichlari: faqat shu thread yozadi."""
+    __slots__ = ("counters", "histograms", "in_flight")
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.in_flight = 0
+
+
+class Metrics:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.enabled = False
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def begin(self):
+        """So'rov boshlanishi: statistikani joriy kontekstga o'rnatadi."""
+        stats = RequestStats(perf_counter())
+        self._shard().in_flight += 1
+        return stats, _current.set(stats)
+
+    def finish(self, stats, token):
+        """So'rov tugashi: statistikani hisoblagichlar va histogrammalarga yozadi."""
+        _current.reset(token)
+        shard = self._shard()
+        shard.in_flight -= 1
+        route = stats.route
+        counters = shard.counters
+        key = ("requests", route, stats.status)
+        counters[key] = counters.get(key, 0) + 1
+        key = ("bytes", route)
+        counters[key] = counters.get(key, 0) + stats.bytes
+
+        self._observe(shard, "request", route, perf_counter() - stats.start)
+        self._observe(shard, "routing", route, stats.routing)
+        if stats.view:
+            self._observe(shard, "view", route, stats.view)
+        if stats.render:
+            self._observe(shard, "render", route, stats.render)
+
+    def _observe(self, shard, name, route, value):
+        hist = shard.histograms.get((name, route))
+        if hist is None:
+            hist = shard.histograms[(name, route)] = [[0] * (len(self.buckets) + 1), 0.0]
+        hist[0][bisect_left(self.buckets, value)] += 1
+        hist[1] += value
+
+    def clear(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.counters = {}
+                shard.histograms = {}
+
+    def collect(self):
+        """Barcha shard'lar yig'indisi: (counters, histograms, in_flight)."""
+        counters = {}
+        histograms = {}
+        in_flight = 0
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            in_flight += shard.in_flight
+            # Boshqa thread yozayotgan bo'lishi mumkin: dict'dan nusxa olib o'qiymiz
+            for key, value in list(shard.counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, (counts, total) in list(shard.histograms.items()):
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = [list(counts), total]
+                else:
+                    merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                    merged[1] += total
+        return counters, histograms, in_flight
+
+    def render(self):
+        """Prometheus text exposition formati (0.0.4)."""
+        counters, histograms, in_flight = self.collect()
+        lines = [
+            "# HELP mojiza_requests_in_flight Requests currently being handled.",
+            "# TYPE mojiza_requests_in_flight gauge",
+            f"mojiza_requests_in_flight {in_flight}",
+            "# HELP mojiza_requests_total Requests handled, by route and status.",
+            "# TYPE mojiza_requests_total counter",
+        ]
+        for (kind, route, *rest), value in sorted(counters.items(), key=_sort_key):
+            if kind == "requests":
+                lines.append(f'mojiza_requests_total{{route="{_escape(route)}",status="{rest[0]}"}} {value}')
+        lines += [
+            "# HELP mojiza_response_bytes_total Response body bytes written, by route.",
+            "# TYPE mojiza_response_bytes_total counter",
+        ]
+        for (kind, route, *rest), value in sorted(counters.items(), key=_sort_key):
+            if kind == "bytes":
+                lines.append(f'mojiza_response_bytes_total{{route="{_escape(route)}"}} {value}')
+
+        for name, help_text in (
+            ("request", "Total request handling time in seconds."),
+            ("routing", "Route lookup time in seconds."),
+            ("view", "View call time in seconds (includes render)."),
+            ("render", "HTML.end() render time in seconds."),
+        ):
+            metric = f"mojiza_{name}_duration_seconds"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for (kind, route), (counts, total) in sorted(histograms.items(), key=_sort_key):
+                if kind != name:
+                    continue
+                label = f'route="{_escape(route)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{label}}} {total}")
+                lines.append(f"{metric}_count{{{label}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _sort_key(item):
+    return tuple(str(part) for part in item[0])
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_view(request):
+    return 200, METRICS_CONTENT_TYPE, metrics.render()
+
+
+def enable_metrics(router, path="/__metrics"):
+    """Metrikani yoqadi va (path berilgan bo'lsa) uni ko'rsatuvchi route qo'shadi."""
+    metrics.enabled = True
+    if path:
+        router.add_route(path, metrics_view)
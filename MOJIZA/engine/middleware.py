@@ -0,0 +1,208 @@
+"""
+Middleware zanjiri.
+
+Middleware — `process_request` va/yoki `process_response` hook'lariga ega obyekt:
+
+    from MOJIZA.engine.middleware import Middleware, middleware
+
+    class AuthMiddleware(Middleware):
+        def process_request(self, request, route):
+            if not request.headers.get("Authorization"):
+                return 401, "text/plain", b"Unauthorized", None   # zanjir shu yerda to'xtaydi
+            return None
+
+        def process_response(self, request, route, response):
+            status, content_type, content, headers = response
+            ...
+            return response
+
+    middleware.add(AuthMiddleware())
+
+Javob har doim `(status, content_type, content, headers)` ko'rinishida.
+`process_request` javob qaytarsa, ichki middleware'lar va view chaqirilmaydi;
+javob faqat tashqi middleware'lardan qaytib o'tadi.
+
+Zanjir route ro'yxatdan o'tganda bir marta yopilmalar (closure) sifatida
+quriladi va route'ning o'zida saqlanadi (`route.chain`, `route.async_chain`):
+so'rov paytida ro'yxat aylanilmaydi va hech narsa qidirilmaydi, qayta
+yozilmagan hook'lar va `applies(route)` False qaytargan middleware'lar
+zanjirga umuman kirmaydi. Middleware qo'shilsa yoki olib tashlansa, barcha
+route'larning zanjirlari qaytadan quriladi.
+"""
+import weakref
+
+from MOJIZA.engine import compress
+from MOJIZA.engine.pagecache import page_cache
+
+
+class Middleware:
+    def applies(self, route):
+        """Shu route uchun zanjirga qo'shilsinmi (qurish paytida bir marta chaqiriladi)."""
+        return True
+
+    def process_request(self, request, route):
+        return None
+
+    def process_response(self, request, route, response):
+        return response
+
+
+def _overrides(mw, name):
+    return getattr(type(mw), name, None) is not getattr(Middleware, name)
+
+
+def _wrap(mw, inner):
+    pre = mw.process_request if _overrides(mw, "process_request") else None
+    post = mw.process_response if _overrides(mw, "process_response") else None
+
+    if pre is not None and post is not None:
+        def handler(request, route, path_params):
+            response = pre(request, route)
+            if response is not None:
+                return response
+            return post(request, route, inner(request, route, path_params))
+    elif pre is not None:
+        def handler(request, route, path_params):
+            response = pre(request, route)
+            if response is not None:
+                return response
+            return inner(request, route, path_params)
+    elif post is not None:
+        def handler(request, route, path_params):
+            return post(request, route, inner(request, route, path_params))
+    else:
+        handler = inner
+    return handler
+
+
+def _wrap_async(mw, inner):
+    pre = mw.process_request if _overrides(mw, "process_request") else None
+    post = mw.process_response if _overrides(mw, "process_response") else None
+
+    if pre is not None and post is not None:
+        async def handler(request, route, path_params):
+            response = pre(request, route)
+            if response is not None:
+                return response
+            return post(request, route, await inner(request, route, path_params))
+    elif pre is not None:
+        async def handler(request, route, path_params):
+            response = pre(request, route)
+            if response is not None:
+                return response
+            return await inner(request, route, path_params)
+    elif post is not None:
+        async def handler(request, route, path_params):
+            return post(request, route, await inner(request, route, path_params))
+    else:
+        handler = inner
+    return handler
+
+
+def compose(middlewares, core, route=None, is_async=False):
+    """
+    `core(request, route, path_params) -> response` atrofida zanjirni quradi.
+    Birinchi middleware eng tashqi bo'ladi.
+    """
+    wrap = _wrap_async if is_async else _wrap
+    handler = core
+    for mw in reversed(middlewares):
+        if route is None or mw.applies(route):
+            handler = wrap(mw, handler)
+    return handler
+
+
+class MiddlewareStack:
+    """
+    Tartiblangan middleware ro'yxati. Zanjir markazi (`core`) — view'ni chaqiruvchi
+    funksiya, uni server dvigatellari beradi (`set_core`): sync va async alohida.
+    Router'lar `attach` bilan ulanadi; ularning route'lari zanjirlarini shu stack quradi.
+    """
+
+    def __init__(self, middlewares=()):
+        self.middlewares = list(middlewares)
+        self.core = None
+        self.async_core = None
+        self._routers = weakref.WeakSet()
+
+    def add(self, mw, index=None):
+        """Middleware qo'shadi (default — eng ichkariga, view'ga eng yaqin)."""
+        if index is None:
+            self.middlewares.append(mw)
+        else:
+            self.middlewares.insert(index, mw)
+        self.rebuild()
+        return mw
+
+    def remove(self, mw):
+        self.middlewares.remove(mw)
+        self.rebuild()
+
+    def set_core(self, core, is_async=False):
+        if is_async:
+            self.async_core = core
+        else:
+            self.core = core
+        self.rebuild()
+
+    def attach(self, router):
+        """Router route'lari zanjirlarini shu stack quradi va yangilab turadi."""
+        self._routers.add(router)
+        for route in router.routes:
+            self.build(route)
+
+    def build(self, route):
+        """Route zanjirlarini quradi (route ro'yxatdan o'tganda chaqiriladi)."""
+        route.chain = compose(self.middlewares, self.core, route) if self.core is not None else None
+        route.async_chain = (compose(self.middlewares, self.async_core, route, is_async=True)
+                             if self.async_core is not None else None)
+
+    def rebuild(self):
+        for router in list(self._routers):
+            for route in router.routes:
+                self.build(route)
+
+
+class PageCacheMiddleware(Middleware):
+    """`PAGE(route, cache=ttl)` route'larining GET javoblarini sahifa keshidan beradi."""
+
+    def __init__(self, cache=None):
+        self.cache = cache or page_cache
+
+    def applies(self, route):
+        return bool(route.cache)
+
+    def process_request(self, request, route):
+        if request.command != "GET":
+            return None
+        entry = self.cache.get(self.cache.key(request.path, request.query_string))
+        if entry is None:
+            return None
+        return self.cache.respond(entry, request.headers.get("If-None-Match"))
+
+    def process_response(self, request, route, response):
+        if request.command != "GET":
+            return response
+        status, content_type, content, headers = response
+        entry = self.cache.store(self.cache.key(request.path, request.query_string), status, content_type, content,
+                                 route.cache, headers)
+        if entry is None:
+            return response
+        return self.cache.respond(entry, request.headers.get("If-None-Match"))
+
+
+class CompressionMiddleware(Middleware):
+    """Dinamik javoblarni `Accept-Encoding` bo'yicha siqadi (MOJIZA.engine.compress)."""
+
+    def __init__(self, compression=None):
+        self.compression = compression if compression is not None else compress.compression
+
+    # `applies` yo'q: `level` route'lar ro'yxatdan o'tgandan keyin ham o'zgarishi mumkin
+    # (`run_server(compress_level=...)`), shuning uchun u har so'rovda `apply` ichida tekshiriladi
+
+    def process_response(self, request, route, response):
+        return self.compression.apply(request, *response)
+
+
+# Siqish eng tashqarida: sahifa keshi siqilmagan javobni saqlaydi
+middleware = MiddlewareStack([CompressionMiddleware(), PageCacheMiddleware()])
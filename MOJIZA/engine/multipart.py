@@ -0,0 +1,226 @@
+"""
+multipart/form-data parser'i (fayl yuklash).
+
+Body bo'laklab (`request.stream()`) o'qiladi va bo'laklab parse qilinadi:
+butun body hech qachon xotiraga yig'ilmaydi. Fayl qismlari
+`SpooledTemporaryFile` ga yoziladi — `spool_size` dan kichiklari xotirada,
+kattalari vaqtinchalik faylda. Shuning uchun yuzlab MB lik yuklashlar ham
+o'zgarmas xotira bilan qabul qilinadi.
+
+    def upload(request):
+        title = request.form["title"][0]
+        upload = request.files["file"][0]
+        upload.save(f"media/{upload.filename}")
+"""
+import os
+import re
+import shutil
+import tempfile
+from urllib.parse import unquote
+
+SPOOL_SIZE = 1024 * 1024
+# Fayl bo'lmagan maydonlar xotirada saqlanadi, shuning uchun ularga alohida chegara
+MAX_FIELD_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 16 * 1024
+
+_OPTION = re.compile(r';\s*([\w.*-]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)')
+
+
+class MultipartError(ValueError):
+    """Buzilgan yoki chegaradan oshgan multipart body. `status` — javob kodi."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class UploadedFile:
+    """Yuklangan fayl: `file` — boshiga qaytarilgan fayl obyekti."""
+    __slots__ = ("name", "filename", "content_type", "file", "size")
+
+    def __init__(self, name, filename, content_type, file, size):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.file = file
+        self.size = size
+
+    def read(self, size=-1):
+        return self.file.read(size)
+
+    def chunks(self, chunk_size=64 * 1024):
+        self.file.seek(0)
+        while True:
+            chunk = self.file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def save(self, path):
+        """Faylni `path` ga yozadi (bo'laklab, xotiraga to'liq o'qimasdan)."""
+        self.file.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self.file, f, 1024 * 1024)
+        return path
+
+    def close(self):
+        self.file.close()
+
+    def __repr__(self):
+        return f"<UploadedFile {self.name}={self.filename!r} {self.size} bytes>"
+
+
+def parse_options(value):
+    """`form-data; name="a"; filename="b.txt"` -> ('form-data', {'name': 'a', 'filename': 'b.txt'})"""
+    main, _, rest = value.partition(";")
+    options = {}
+    for key, val in _OPTION.findall(";" + rest):
+        key = key.lower()
+        val = val.strip()
+        if len(val) >= 2 and val[0] == val[-1] == '"':
+            val = val[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+        if key.endswith("*"):
+            # RFC 5987: filename*=UTF-8''%D1%84%D0%B0%D0%B9%D0%BB.txt
+            charset, _, encoded = val.partition("''")
+            val = unquote(encoded, encoding=charset or "utf-8", errors="replace")
+            key = key[:-1]
+        options[key] = val
+    return main.strip().lower(), options
+
+
+def get_boundary(content_type):
+    """Content-Type'dan boundary'ni oladi (multipart bo'lmasa None)."""
+    kind, options = parse_options(content_type or "")
+    if kind != "multipart/form-data":
+        return None
+    boundary = options.get("boundary", "")
+    if not boundary or len(boundary) > 200:
+        raise MultipartError("multipart boundary noto'g'ri")
+    return boundary.encode("latin-1")
+
+
+def _decode(raw):
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def _parse_part_headers(raw):
+    headers = {}
+    for line in _decode(raw).split("\r\n"):
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def parse_multipart(chunks, boundary, spool_size=SPOOL_SIZE, max_field_size=MAX_FIELD_SIZE):
+    """
+    `chunks` (bayt bo'laklari iteratori) dan multipart body'ni o'qiydi.
+    (fields, files) qaytaradi: {'nom': ['qiymat']}, {'nom': [UploadedFile]}.
+    """
+    chunks = iter(chunks)
+    delimiter = b"--" + boundary
+    separator = b"\r\n" + delimiter
+    keep = len(separator) + 1
+    fields = {}
+    files = {}
+    buf = b""
+
+    def fill():
+        nonlocal buf
+        for chunk in chunks:
+            if chunk:
+                buf += chunk
+                return True
+        return False
+
+    try:
+        # Preamble: birinchi delimiter'gacha hammasi tashlanadi
+        while True:
+            index = buf.find(delimiter)
+            if index != -1:
+                buf = buf[index + len(delimiter):]
+                break
+            buf = buf[-len(delimiter):]
+            if not fill():
+                raise MultipartError("multipart body'da boundary topilmadi")
+
+        while True:
+            while len(buf) < 2:
+                if not fill():
+                    raise MultipartError("multipart body to'liq emas")
+            if buf[:2] == b"--":
+                break
+            if buf[:2] != b"\r\n":
+                raise MultipartError("multipart delimiter noto'g'ri")
+            buf = buf[2:]
+
+            while True:
+                index = buf.find(b"\r\n\r\n")
+                if index != -1:
+                    break
+                if len(buf) > MAX_HEADER_SIZE:
+                    raise MultipartError("multipart qism header'lari juda katta")
+                if not fill():
+                    raise MultipartError("multipart body to'liq emas")
+            headers = _parse_part_headers(buf[:index])
+            buf = buf[index + 4:]
+
+            disposition, options = parse_options(headers.get("content-disposition", ""))
+            name = options.get("name")
+            if disposition != "form-data" or name is None:
+                raise MultipartError("multipart qismida Content-Disposition yo'q")
+            filename = options.get("filename")
+            if filename is None:
+                target = bytearray()
+            else:
+                target = tempfile.SpooledTemporaryFile(max_size=spool_size)
+            size = 0
+
+            # Qism ma'lumoti keyingi separator'gacha; oxirgi `keep` bayt keyingi bo'lak bilan birga tekshiriladi
+            while True:
+                index = buf.find(separator)
+                if index != -1:
+                    data, buf = buf[:index], buf[index + len(separator):]
+                elif len(buf) > keep:
+                    data, buf = buf[:-keep], buf[-keep:]
+                else:
+                    data = b""
+                if data:
+                    size += len(data)
+                    if filename is None and size > max_field_size:
+                        raise MultipartError(f"'{name}' maydoni juda katta", 413)
+                    if filename is None:
+                        target += data
+                    else:
+                        target.write(data)
+                if index != -1:
+                    break
+                if not fill():
+                    if filename is not None:
+                        target.close()
+                    raise MultipartError("multipart body to'liq emas")
+
+            if filename is None:
+                fields.setdefault(name, []).append(_decode(bytes(target)))
+            else:
+                target.seek(0)
+                upload = UploadedFile(name, os.path.basename(filename.replace("\\", "/")),
+                                      headers.get("content-type", "application/octet-stream"), target, size)
+                files.setdefault(name, []).append(upload)
+    except BaseException:
+        close_files(files)
+        raise
+
+    # Epilog (oxirgi delimiter'dan keyingi baytlar) o'qib tashlanadi
+    for _ in chunks:
+        pass
+    return fields, files
+
+
+def close_files(files):
+    for uploads in files.values():
+        for upload in uploads:
+            upload.close()
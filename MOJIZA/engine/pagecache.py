@@ -0,0 +1,197 @@
+"""
+To'liq javob keshi (page cache).
+
+`PAGE(route, cache=ttl)` bilan belgilangan route'larning GET javoblari
+`(status, content_type, body, headers)` ko'rinishida yo'l va normallashtirilgan query
+parametrlari bo'yicha saqlanadi. `Set-Cookie` li javoblar keshlanmaydi. Har bir yozuvga ETag beriladi; mijoz
+`If-None-Match` yuborsa va u mos kelsa, view umuman chaqirilmasdan 304 qaytariladi.
+
+Backend almashtirilishi mumkin:
+
+    from MOJIZA.engine.pagecache import page_cache, FileBackend
+    page_cache.backend = FileBackend(".mojiza_cache")
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from MOJIZA.engine.cache import LRUCache
+
+
+# 304 javobida takrorlanadigan header'lar (RFC 7232, 4.1)
+NOT_MODIFIED_HEADERS = frozenset({"cache-control", "content-location", "expires", "vary"})
+
+
+class CachedResponse:
+    __slots__ = ("status", "content_type", "body", "etag", "headers")
+
+    def __init__(self, status, content_type, body, etag, headers=None):
+        self.status = status
+        self.content_type = content_type
+        self.body = body
+        self.etag = etag
+        # View'ning o'z header'lari (Location, Cache-Control ...), ETag'dan tashqari
+        self.headers = headers or {}
+
+
+class CacheBackend:
+    """
+    Backend interfeysi. Boshqa saqlash joylari (redis, memcached ...) uchun shu
+    metodlarni amalga oshirish kifoya.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, entry, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Jarayon ichidagi LRU backend: yozuvlar soni va umumiy hajm (bayt) bo'yicha cheklangan."""
+
+    def __init__(self, maxsize=1024, max_bytes=64 * 1024 * 1024):
+        self._cache = LRUCache(maxsize=maxsize, max_bytes=max_bytes)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, entry, ttl):
+        self._cache.set(key, entry, size=len(entry.body), ttl=ttl)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def clear(self):
+        self._cache.clear()
+
+
+class FileBackend(CacheBackend):
+    """
+    Fayllarga yozuvchi backend (umumiy kesh serverining lokal o'rinbosari):
+    bir mashinadagi bir nechta jarayon (pre-fork) keshni bo'lishadi.
+    """
+
+    def __init__(self, directory=".mojiza_cache"):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                expires, stored_key, entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if stored_key != key:
+            return None
+        if expires is not None and expires <= time.time():
+            self.delete(key)
+            return None
+        return entry
+
+    def set(self, key, entry, ttl):
+        expires = time.time() + ttl if ttl else None
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires, key, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Boshqa jarayonlar yarim yozilgan faylni ko'rmasligi uchun atomik almashtirish
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+def make_etag(body):
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class PageCache:
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+
+    @staticmethod
+    def key(path, query=""):
+        """Kalit: yo'l + tartiblangan query parametrlari (`?b=2&a=1` == `?a=1&b=2`)."""
+        if not query:
+            return path
+        return path + "?" + urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def store(self, key, status, content_type, body, ttl, headers=None):
+        """
+        Faqat 200 va tayyor bytes javoblar saqlanadi; yozuvni (yoki None) qaytaradi.
+        `Set-Cookie` li javob saqlanmaydi: aks holda bir foydalanuvchining cookie'si boshqalarga ketadi.
+        """
+        if status != 200 or not isinstance(body, bytes):
+            return None
+        if headers and any(name.lower() == "set-cookie" for name in headers):
+            return None
+        entry = CachedResponse(status, content_type, body, make_etag(body), dict(headers) if headers else None)
+        self.backend.set(key, entry, ttl)
+        return entry
+
+    @staticmethod
+    def respond(entry, if_none_match=None):
+        """Yozuvdan (status, content_type, body, headers) javobini yasaydi (304 bo'lishi mumkin)."""
+        if etag_matches(if_none_match, entry.etag):
+            headers = {name: value for name, value in entry.headers.items()
+                       if name.lower() in NOT_MODIFIED_HEADERS}
+            headers["ETag"] = entry.etag
+            return 304, entry.content_type, b"", headers
+        headers = dict(entry.headers)
+        headers["ETag"] = entry.etag
+        return entry.status, entry.content_type, entry.body, headers
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+    def clear(self):
+        self.backend.clear()
+
+
+page_cache = PageCache()
@@ -0,0 +1,198 @@
+import os
+import select
+import signal
+import threading
+import time
+import logging
+
+logger = logging.getLogger("MOJIZA.engine.prefork")
+
+
+class PreforkServer:
+    """
+    Pre-fork rejimi: master jarayon socketni bir marta ochadi va N ta worker
+    jarayonni fork qiladi. Workerlar bitta listen socketni bo'lishadi.
+
+    Route'lar (`load_app_routes`) master ichida fork'dan oldin yuklanadi,
+    shuning uchun har bir worker ularni copy-on-write orqali oladi.
+
+    Signallar (masterga):
+      SIGTERM / SIGINT -> workerlarni ohista to'xtatish
+      SIGHUP           -> workerlarni birma-bir qayta ishga tushirish (rolling restart)
+    """
+
+    def __init__(self, server, processes=2, graceful_timeout=30):
+        self.server = server
+        self.processes = processes
+        self.graceful_timeout = graceful_timeout
+        self.workers = {}
+        self._running = False
+        self._restart = False
+        self._wakeup_r, self._wakeup_w = os.pipe()
+
+    # -- master ------------------------------------------------------------
+
+    def run(self):
+        self._running = True
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_restart)
+        signal.signal(signal.SIGCHLD, self._wakeup)
+
+        logger.info(f"Master {os.getpid()} started (processes={self.processes})")
+        try:
+            while self._running:
+                self._reap()
+                if self._restart:
+                    self._restart = False
+                    self._rolling_restart()
+                self._spawn_missing()
+                self._sleep(1.0)
+        finally:
+            self._stop_all()
+            self.server.server_close()
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            logger.info(f"Master {os.getpid()} stopped")
+
+    def _on_stop(self, signum, frame):
+        self._running = False
+        self._wakeup()
+
+    def _on_restart(self, signum, frame):
+        self._restart = True
+        self._wakeup()
+
+    def _wakeup(self, *args):
+        try:
+            os.write(self._wakeup_w, b"!")
+        except OSError:
+            pass
+
+    def _sleep(self, timeout):
+        try:
+            ready, _, _ = select.select([self._wakeup_r], [], [], timeout)
+        except InterruptedError:
+            return
+        if ready:
+            os.read(self._wakeup_r, 1024)
+
+    def _spawn_missing(self):
+        while self._running and len(self.workers) < self.processes:
+            self._spawn()
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._worker_main()
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+        logger.info(f"Worker {pid} started")
+        return pid
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if started is None:
+                continue
+            code = _exit_code(status)
+            if code != 0 and self._running:
+                logger.warning(f"Worker {pid} exited with code {code}, restarting")
+                # Darhol yiqilayotgan workerlar fork bo'roniga aylanmasin
+                if time.monotonic() - started < 1.0:
+                    time.sleep(1.0)
+
+    def _rolling_restart(self):
+        logger.info("Rolling restart")
+        for pid in list(self.workers):
+            if not self._running:
+                return
+            self._spawn()
+            self._terminate([pid])
+
+    def _stop_all(self):
+        self._terminate(list(self.workers))
+
+    def _terminate(self, pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self.graceful_timeout
+        pending = set(pids)
+        while pending and time.monotonic() < deadline:
+            for pid in list(pending):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    pending.discard(pid)
+                    self.workers.pop(pid, None)
+            if pending:
+                time.sleep(0.05)
+
+        for pid in pending:
+            logger.warning(f"Worker {pid} did not stop in time, killing")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.workers.pop(pid, None)
+
+    # -- worker ------------------------------------------------------------
+
+    def _worker_main(self):
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        server = self.server
+
+        def stop(signum, frame):
+            # shutdown() serve_forever tugashini kutadi, shuning uchun alohida threadda
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        server.serve_forever()
+        server.server_close()
+
+
+def _exit_code(status):
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def run_prefork(server, processes=2, graceful_timeout=30):
+    """
+    Tayyor (bind qilingan) serverni pre-fork rejimida ishga tushiradi.
+    os.fork mavjud bo'lmagan tizimlarda bitta jarayonda ishlaydi.
+    """
+    if not hasattr(os, "fork"):
+        logger.warning("os.fork mavjud emas, server bitta jarayonda ishlaydi")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+    PreforkServer(server, processes=processes, graceful_timeout=graceful_timeout).run()
@@ -0,0 +1,160 @@
+"""
+Dev reloader: kod o'zgarganda serverni qayta ishga tushirmasdan faqat
+o'zgargan app qayta yuklanadi.
+
+    python app.py run_script --reload
+
+watchdog app papkalarini kuzatadi. O'zgargan `.py` fayl qaysi app'ga
+tegishli ekani aniqlanadi, shu app'ning modullari (`views.py`, `urls.py` ...)
+qayta import qilinadi va uning route'lari router'da atomik almashtiriladi
+(`Router.replace_app_routes`). Bajarilayotgan so'rovlar eski view'da
+tugaydi, boshqa app'lar umuman tegilmaydi. Ketma-ket o'zgarishlar
+(saqlash paytidagi bir nechta hodisa) `debounce` soniya ichida bittaga
+yig'iladi. Import xato bersa, eski route'lar ishlashda davom etadi.
+
+App'ga tegishli bo'lmagan (umumiy) modul o'zgarsa yoki yangi app
+qo'shilsa, serverni qayta ishga tushirish kerak.
+"""
+import logging
+import os
+import sys
+import threading
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from MOJIZA.engine.discovery import EXCLUDE_DIRS, discover_apps, is_excluded
+from MOJIZA.engine.routing import import_urls, register_app_routes
+from MOJIZA.engine.server import fire_reload_hooks
+
+logger = logging.getLogger("MOJIZA.engine.reloader")
+
+WATCHED_EVENTS = frozenset({"modified", "created", "moved", "deleted"})
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    def __init__(self, reloader):
+        super().__init__()
+        self.reloader = reloader
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in WATCHED_EVENTS:
+            return
+        self.reloader.notify(os.fsdecode(getattr(event, "dest_path", "") or event.src_path))
+        if event.event_type == "moved":
+            self.reloader.notify(os.fsdecode(event.src_path))
+
+
+class Reloader:
+    def __init__(self, router, project_root=".", exclude_dirs=EXCLUDE_DIRS, debounce=0.3):
+        self.router = router
+        self.project_root = os.path.abspath(project_root)
+        self.exclude_dirs = frozenset(exclude_dirs)
+        self.debounce = debounce
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._observer = None
+
+    def apps(self):
+        return discover_apps(self.project_root, self.exclude_dirs)
+
+    def start(self):
+        observer = Observer()
+        watched = []
+        # Faqat app papkalari kuzatiladi (node_modules va h.k. ga inotify qo'yilmaydi)
+        for path in sorted(app.path for app in self.apps()):
+            if not any(path.startswith(parent + os.sep) for parent in watched):
+                watched.append(path)
+                observer.schedule(_ChangeHandler(self), path, recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        logger.info(f"Reloader: {len(watched)} ta papka kuzatilmoqda")
+        return self
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+    def app_for(self, path):
+        """Fayl tegishli app (eng ichki app papkasi) yoki None."""
+        best = None
+        for app in self.apps():
+            if path.startswith(app.path + os.sep) and (best is None or len(app.path) > len(best.path)):
+                best = app
+        return best
+
+    def notify(self, path):
+        if not path.endswith(".py"):
+            return
+        path = os.path.abspath(path)
+        relative = os.path.relpath(path, self.project_root)
+        if any(is_excluded(part, self.exclude_dirs) for part in relative.split(os.sep)[:-1]):
+            return
+        app = self.app_for(path)
+        if app is None:
+            logger.info(f"{relative} hech bir app'ga tegishli emas: o'zgarish uchun serverni qayta ishga tushiring")
+            return
+        with self._lock:
+            self._pending.add(app.path)
+            # Har bir yangi hodisa kutish vaqtini qaytadan boshlaydi
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            self._timer = None
+        if not pending:
+            return
+        with self._flush_lock:
+            apps = {app.path: app for app in self.apps()}
+            reloaded = 0
+            for path in sorted(pending):
+                if path in apps and self.reload_app(apps[path]):
+                    reloaded += 1
+            if reloaded:
+                fire_reload_hooks()
+
+    def reload_app(self, app):
+        """App'ni qayta import qilib, route'larini almashtiradi. Muvaffaqiyatli bo'lsa True."""
+        purge_modules(app.path)
+        if not os.path.exists(app.urls):
+            self.router.replace_app_routes(app.path, lambda: None)
+            logger.warning(f"{app.urls} o'chirildi: {app.name} route'lari olib tashlandi")
+            return True
+        try:
+            module, seconds = import_urls(app)
+            routes = self.router.replace_app_routes(
+                app.path, lambda: register_app_routes(module, self.router, app.path))
+        except Exception:
+            logger.exception(f"❌ {app.name} qayta yuklanmadi, eski route'lar ishlashda davom etadi")
+            return False
+        logger.info(f"♻️ {app.name} qayta yuklandi: {len(routes)} ta route, {seconds * 1000:.1f} ms")
+        return True
+
+
+def purge_modules(directory):
+    """`directory` ichidagi fayllardan yuklangan modullarni `sys.modules` dan olib tashlaydi."""
+    prefix = directory + os.sep
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path:
+            inside = os.path.abspath(path).startswith(prefix)
+        else:
+            # Namespace package (`__init__.py` siz app papkasi)
+            inside = directory in [os.path.abspath(p) for p in getattr(module, "__path__", None) or ()]
+        if inside:
+            del sys.modules[name]
+
+
+def start_reloader(router, project_root=".", exclude_dirs=EXCLUDE_DIRS, debounce=0.3):
+    return Reloader(router, project_root, exclude_dirs, debounce).start()
@@ -0,0 +1,162 @@
+"""
+HTMLElement daraxtlari uchun render dvigateli.
+
+Daraxt bir marta aylanib chiqiladi va tekis satr bo'laklari ro'yxatiga
+yig'iladi, oxirida bitta `"".join(...)` bilan birlashtiriladi.
+
+Ikki rejim bor:
+  pretty=True  - debug rejimi, avvalgi `render()` bilan bir xil chiroyli (indentatsiyali) natija;
+  pretty=False - production uchun minify qilingan natija (bo'sh joy va yangi qatorlarsiz).
+
+`iter_chunks` hujjatni bytes bo'laklari generatori sifatida qaytaradi (chunked
+javoblar uchun): `<head>` darhol yuboriladi, body esa qismlarga bo'lib.
+"""
+
+VOID_TAGS = frozenset(('meta', 'link', 'img', 'input', 'br', 'hr'))
+
+
+class RawHTML(str):
+    """
+    Oldindan render qilingan HTML (masalan fragment keshdan). Bola sifatida
+    qo'shilganda indentatsiyasiz, o'zgarishsiz chiqariladi.
+    """
+    __slots__ = ()
+
+_INDENTS = ['    ' * i for i in range(32)]
+
+
+def _indent(depth):
+    if depth < len(_INDENTS):
+        return _INDENTS[depth]
+    return '    ' * depth
+
+
+def _attrs(el):
+    attrs = el._attrs
+    if not attrs:
+        return ''
+    return ' '.join([f'{k}="{v}"' for k, v in attrs.items()])
+
+
+def _emit_pretty(el, depth, append):
+    sp = _indent(depth)
+    tag = el.tag
+    attrs = _attrs(el)
+    if tag in VOID_TAGS:
+        append(f"{sp}<{tag} {attrs}/>\n")
+        return
+    append(f"{sp}<{tag} {attrs}>\n" if attrs else f"{sp}<{tag}>\n")
+    inner = _indent(depth + 1)
+    if el.content:
+        append(f"{inner}{el.content}\n")
+    for c in el._children:
+        if isinstance(c, str):
+            append(c if c.__class__ is RawHTML else f"{inner}{c}\n")
+        else:
+            _emit_pretty(c, depth + 1, append)
+    append(f"{sp}</{tag}>\n")
+
+
+def _emit_minified(el, append):
+    tag = el.tag
+    attrs = _attrs(el)
+    if tag in VOID_TAGS:
+        append(f"<{tag} {attrs}/>" if attrs else f"<{tag}/>")
+        return
+    append(f"<{tag} {attrs}>" if attrs else f"<{tag}>")
+    if el.content:
+        append(el.content)
+    for c in el._children:
+        if isinstance(c, str):
+            append(c)
+        else:
+            _emit_minified(c, append)
+    append(f"</{tag}>")
+
+
+def compile_chunks(element, indent=0, pretty=True, out=None):
+    """
+    Elementni satr bo'laklari ro'yxatiga kompilyatsiya qiladi.
+    `out` berilsa, bo'laklar unga qo'shiladi.
+    """
+    if out is None:
+        out = []
+    if pretty:
+        _emit_pretty(element, indent, out.append)
+    else:
+        _emit_minified(element, out.append)
+    return out
+
+
+def render(element, indent=0, pretty=True):
+    return ''.join(compile_chunks(element, indent, pretty))
+
+
+def render_document(doctype, root, pretty=True):
+    out = [doctype, "\n"] if pretty else [doctype]
+    compile_chunks(root, 0, pretty, out)
+    return ''.join(out)
+
+
+def _open_tag(el, depth, pretty, append):
+    """Ochuvchi teg va content'ni qo'shadi, yopuvchi tegni qaytaradi."""
+    tag = el.tag
+    attrs = _attrs(el)
+    if pretty:
+        sp = _indent(depth)
+        append(f"{sp}<{tag} {attrs}>\n" if attrs else f"{sp}<{tag}>\n")
+        if el.content:
+            append(f"{_indent(depth + 1)}{el.content}\n")
+        return f"{sp}</{tag}>\n"
+    append(f"<{tag} {attrs}>" if attrs else f"<{tag}>")
+    if el.content:
+        append(el.content)
+    return f"</{tag}>"
+
+
+def iter_chunks(root, doctype=None, pretty=True, flush_every=512, stream_depth=4, extra=None):
+    """
+    Hujjatni bytes bo'laklari generatori sifatida render qiladi.
+
+    flush_every  - nechta satr bo'lagi yig'ilganda yuborilsin;
+    stream_depth - shu chuqurlikdan pastdagi elementlar bir butun holda kompilyatsiya qilinadi;
+    extra        - (element, iterable) juftligi: iterable'dan kelgan elementlar shu
+                   elementning oxiriga render paytida (dangasa) qo'shiladi.
+    `</head>` dan keyin bufer doim yuboriladi.
+    """
+    out = []
+    if doctype:
+        out.append(doctype + "\n" if pretty else doctype)
+    yield from _stream(root, 0, pretty, out, flush_every, stream_depth, extra)
+    if out:
+        yield ''.join(out).encode()
+
+
+def _stream(el, depth, pretty, out, flush_every, stream_depth, extra):
+    late = extra[1] if extra is not None and extra[0] is el else None
+    if late is None and (depth >= stream_depth or el.tag in VOID_TAGS or not el._children):
+        compile_chunks(el, depth, pretty, out)
+        return
+
+    append = out.append
+    close = _open_tag(el, depth, pretty, append)
+    inner = _indent(depth + 1) if pretty else ''
+
+    def children():
+        yield from el._children
+        if late is not None:
+            yield from late
+
+    for c in children():
+        if isinstance(c, str):
+            append(f"{inner}{c}\n" if pretty and c.__class__ is not RawHTML else c)
+        else:
+            yield from _stream(c, depth + 1, pretty, out, flush_every, stream_depth, extra)
+        if len(out) >= flush_every:
+            yield ''.join(out).encode()
+            out.clear()
+
+    append(close)
+    if el.tag == 'head':
+        yield ''.join(out).encode()
+        out.clear()
@@ -0,0 +1,248 @@
+"""
+So'rov obyekti.
+
+View'larga beriladigan `request`. Hamma narsa dangasa (lazy) hisoblanadi va
+keshlanadi: query string, forma, cookie'lar va body faqat birinchi
+murojaatda o'qiladi/parse qilinadi, keyin saqlanadi.
+
+    def upload(request):
+        request.path            # '/upload' (query'siz)
+        request.query           # {'page': ['2']}
+        request.form            # POST forma maydonlari (urlencoded yoki multipart)
+        request.files           # {'file': [UploadedFile]} (multipart/form-data)
+        request.cookies         # {'session': 'abc'}
+        for chunk in request.stream():   # katta body'ni xotiraga yig'masdan o'qish
+            ...
+
+Eski `BaseHTTPRequestHandler` atributlari ham bor: `command`, `headers`,
+`request_version`, `rfile`, `client_address`.
+"""
+from urllib.parse import parse_qs
+
+from MOJIZA.engine.multipart import get_boundary, parse_multipart, close_files
+
+CHUNK_SIZE = 64 * 1024
+# Server shundan katta Content-Length'li so'rovni body'ni o'qimasdan 413 bilan rad etadi
+MAX_BODY_SIZE = 1024 * 1024 * 1024
+
+
+class Headers:
+    """
+    Registrga sezgir bo'lmagan header'lar. Xom baytlardan yaratilsa, faqat
+    birinchi murojaatda parse qilinadi (`email` parser'idan ancha tez).
+    """
+    __slots__ = ("_raw", "_items", "_map")
+
+    def __init__(self, raw=b"", items=None):
+        self._raw = raw
+        self._items = items
+        self._map = None
+        if items is not None:
+            self._index()
+
+    def _parse(self):
+        items = []
+        for line in self._raw.decode("latin-1").split("\r\n"):
+            if not line:
+                continue
+            if line[0] in " \t" and items:
+                # Eski uslubdagi davom qatori (obs-fold)
+                name, value = items[-1]
+                items[-1] = (name, value + " " + line.strip())
+                continue
+            name, sep, value = line.partition(":")
+            if sep:
+                items.append((name.strip(), value.strip()))
+        self._items = items
+        self._raw = None
+        self._index()
+
+    def _index(self):
+        mapping = {}
+        for name, value in self._items:
+            mapping.setdefault(name.lower(), value)
+        self._map = mapping
+
+    def get(self, name, default=None):
+        if self._map is None:
+            self._parse()
+        return self._map.get(name.lower(), default)
+
+    def get_all(self, name, default=None):
+        if self._map is None:
+            self._parse()
+        name = name.lower()
+        values = [value for key, value in self._items if key.lower() == name]
+        return values or default
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def __contains__(self, name):
+        if self._map is None:
+            self._parse()
+        return name.lower() in self._map
+
+    def items(self):
+        if self._map is None:
+            self._parse()
+        return list(self._items)
+
+    def keys(self):
+        return [name for name, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        if self._map is None:
+            self._parse()
+        return len(self._items)
+
+
+def parse_cookies(header):
+    cookies = {}
+    for part in header.split(";"):
+        name, sep, value = part.partition("=")
+        name = name.strip()
+        if not sep or not name:
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        cookies.setdefault(name, value)
+    return cookies
+
+
+class Request:
+    __slots__ = (
+        "method", "path", "query_string", "full_path", "request_version", "headers",
+        "client_address", "rfile", "content_length", "_remaining", "_reusable", "_body", "_query",
+        "_form", "_files", "_cookies",
+    )
+
+    def __init__(self, method, target, request_version, headers, rfile, client_address=None):
+        self.method = method
+        self.full_path = target
+        path, _, query = target.partition("?")
+        self.path = path
+        self.query_string = query
+        self.request_version = request_version
+        self.headers = headers
+        self.rfile = rfile
+        self.client_address = client_address
+        self._body = None
+        self._query = None
+        self._form = None
+        self._files = None
+        self._cookies = None
+        # Chunked body'ni o'qimaymiz: ulanishni qayta ishlatib bo'lmaydi
+        self._reusable = not headers.get("Transfer-Encoding")
+        try:
+            self.content_length = max(int(headers.get("Content-Length") or 0), 0) if self._reusable else 0
+        except ValueError:
+            self.content_length = 0
+            self._reusable = False
+        self._remaining = self.content_length
+
+    @property
+    def command(self):
+        """`BaseHTTPRequestHandler.command` bilan moslik uchun."""
+        return self.method
+
+    @property
+    def content_type(self):
+        return self.headers.get("Content-Type", "")
+
+    @property
+    def query(self):
+        """Query string parametrlari: {'nom': ['qiymat', ...]}."""
+        if self._query is None:
+            self._query = parse_qs(self.query_string) if self.query_string else {}
+        return self._query
+
+    @property
+    def cookies(self):
+        if self._cookies is None:
+            header = self.headers.get("Cookie")
+            self._cookies = parse_cookies(header) if header else {}
+        return self._cookies
+
+    @property
+    def body(self):
+        """Butun body (bir marta o'qiladi). Katta body'lar uchun `stream()` dan foydalaning."""
+        if self._body is None:
+            self._body = b"".join(self.stream())
+        return self._body
+
+    @property
+    def form(self):
+        """POST forma maydonlari (application/x-www-form-urlencoded yoki multipart/form-data)."""
+        if self._form is None:
+            self._parse_form()
+        return self._form
+
+    @property
+    def files(self):
+        """multipart/form-data orqali yuklangan fayllar: {'nom': [UploadedFile]}."""
+        if self._files is None:
+            self._parse_form()
+        return self._files
+
+    def _parse_form(self):
+        self._files = {}
+        if self.method != "POST":
+            self._form = {}
+            return
+        boundary = get_boundary(self.content_type)
+        if boundary is not None:
+            # Body bo'laklab parse qilinadi, fayllar vaqtinchalik fayllarga yoziladi
+            self._form, self._files = parse_multipart(self.stream(), boundary)
+            return
+        body = self.body
+        self._form = parse_qs(body.decode("utf-8")) if body else {}
+
+    @property
+    def params(self):
+        """Eski `params`: POST bo'lsa forma, aks holda query parametrlari."""
+        return self.form if self.method == "POST" else self.query
+
+    def stream(self, chunk_size=CHUNK_SIZE):
+        """
+        Body'ni `chunk_size` bo'laklab o'qiydi (xotirada butun body yig'ilmaydi).
+        Body faqat bir marta o'qilishi mumkin; `body` allaqachon o'qilgan bo'lsa, u qaytariladi.
+        """
+        if self._body is not None:
+            if self._body:
+                yield self._body
+            return
+        while self._remaining > 0:
+            chunk = self.rfile.read(min(self._remaining, chunk_size))
+            if not chunk:
+                self._remaining = 0
+                self._reusable = False
+                return
+            self._remaining -= len(chunk)
+            yield chunk
+
+    def discard(self):
+        """
+        O'qilmagan body'ni tashlab yuboradi (aks holda keep-alive ulanishdagi
+        keyingi so'rov buziladi). Ulanishni qayta ishlatish mumkinmi — shuni qaytaradi.
+        """
+        for _ in self.stream():
+            pass
+        return self._reusable
+
+    def close(self):
+        """Yuklangan fayllarning vaqtinchalik fayllarini yopadi (javobdan keyin server chaqiradi)."""
+        if self._files:
+            close_files(self._files)
+
+    @property
+    def reusable(self):
+        """Body to'liq o'qilgan va ulanishni keyingi so'rov uchun ishlatish mumkin bo'lsa True."""
+        return self._reusable and self._remaining == 0
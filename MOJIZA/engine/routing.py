@@ -1,116 +1,581 @@
 import logging
 import importlib.util
-from urllib.parse import unquote
-import os
+import re
+from inspect import signature, iscoroutinefunction
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from time import perf_counter
+
+from MOJIZA.engine.discovery import EXCLUDE_DIRS, discover_apps
+from MOJIZA.engine.middleware import middleware as default_middleware
+from MOJIZA.static.files import StaticFiles
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("MOJIZA.engine.routing")
 
 
+class _StrConverter:
+    """`<str:name>` — '/' belgisigacha bo'lgan bo'sh bo'lmagan segment."""
+    backtrack = True
+
+    def match(self, path, i):
+        end = path.find("/", i)
+        return len(path) if end == -1 else end
+
+    def to_python(self, value):
+        return value
+
+
+class _IntConverter:
+    """`<int:name>` — faqat raqamlardan iborat segment."""
+    backtrack = True
+
+    def match(self, path, i):
+        n = len(path)
+        while i < n and path[i] in "0123456789":
+            i += 1
+        return i
+
+    def to_python(self, value):
+        return int(value)
+
+
+class _SlugConverter:
+    """`<slug:name>` — harf, raqam, '-' va '_' belgilari."""
+    chars = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_")
+    backtrack = True
+
+    def match(self, path, i):
+        n = len(path)
+        chars = self.chars
+        while i < n and path[i] in chars:
+            i += 1
+        return i
+
+    def to_python(self, value):
+        return value
+
+
+class _PathConverter:
+    """`<path:name>` — yo'lning qolgan barcha qismi ('/' bilan birga). Faqat oxirida bo'lishi mumkin."""
+    # Oxirgi token: qisqaroq qiymat hech qachon yordam bermaydi
+    backtrack = False
+
+    def match(self, path, i):
+        return len(path)
+
+    def to_python(self, value):
+        return value
+
+
+# Tartib ustuvorlikni bildiradi: bir joyda bir nechta parametr bo'lsa, aniqrog'i oldin tekshiriladi
+CONVERTERS = {
+    "int": _IntConverter(),
+    "slug": _SlugConverter(),
+    "str": _StrConverter(),
+    "path": _PathConverter(),
+}
+
+_PARAM_RE = re.compile(r"<(?:(\w+):)?(\w+)>")
+
+
+def parse_route(route):
+    """
+    Route satrini literal qismlar va parametrlarga ajratadi:
+      "/users/<int:id>" -> ["/users/", ("int", "id")]
+    """
+    tokens = []
+    pos = 0
+    for m in _PARAM_RE.finditer(route):
+        if m.start() > pos:
+            tokens.append(route[pos:m.start()])
+        converter = m.group(1) or "str"
+        if converter not in CONVERTERS:
+            raise ValueError(f"Noma'lum converter '{converter}' route ichida: {route}")
+        tokens.append((converter, m.group(2)))
+        pos = m.end()
+    if pos < len(route):
+        tokens.append(route[pos:])
+
+    for token in tokens[:-1]:
+        if isinstance(token, tuple) and token[0] == "path":
+            raise ValueError(f"<path:...> parametri route oxirida bo'lishi kerak: {route}")
+    return tokens
+
+
+def build_dispatcher(view, path_param_names=()):
+    """
+    View imzosini bir marta (ro'yxatdan o'tishda) tahlil qilib, uni chaqiruvchi
+    funksiyani qaytaradi: `dispatch(request, params, path_params)`.
+
+    Qo'llab-quvvatlanadigan parametr nomlari:
+      request  - so'rov obyekti
+      method   - "GET" / "POST"
+      params   - query yoki form parametrlari (parse_qs dict)
+      <nom>    - route'dagi `<int:nom>` kabi parametr
+      **kwargs - route parametrlarining qolgani
+    Masalan: `(request)`, `(method, params)`, `(request, params)`, `(request, id)`, `()`.
+
+    Ikkinchi qiymat — view `params`ni ishlatadimi (aks holda ular parse qilinmaydi).
+    """
+    try:
+        sig = signature(view)
+    except (TypeError, ValueError):
+        return (lambda request, params, path_params: view(request)), False
+
+    providers = []
+    accepts_kwargs = False
+    accepted = set()
+    for p in sig.parameters.values():
+        if p.kind is p.VAR_KEYWORD:
+            accepts_kwargs = True
+        elif p.kind is p.VAR_POSITIONAL:
+            continue
+        elif p.name in path_param_names:
+            accepted.add(p.name)
+        elif p.name in ("request", "method", "params"):
+            providers.append(p.name)
+        elif p.default is p.empty:
+            names = list(sig.parameters.keys())
+            message = f"View funksiyasi noto‘g‘ri formatda! Parametrlar: {names}"
+            logger.warning(f"{getattr(view, '__name__', view)}: {message}")
+
+            def invalid(request, params, path_params):
+                raise Exception(message)
+            return invalid, False
+
+    needs_params = "params" in providers
+    if accepts_kwargs or accepted == set(path_param_names):
+        pick = None
+    else:
+        pick = accepted
+
+    # Eng ko'p uchraydigan imzolar uchun tayyor chaqiruvlar
+    if providers == ["request"]:
+        if pick is None:
+            return (lambda request, params, path_params: view(request, **path_params)), needs_params
+    elif providers == ["method", "params"]:
+        if pick is None:
+            return (lambda request, params, path_params:
+                    view(method=request.command, params=params, **path_params)), needs_params
+    elif not providers and pick is None:
+        return (lambda request, params, path_params: view(**path_params)), needs_params
+
+    def dispatch(request, params, path_params):
+        kwargs = {}
+        for name in providers:
+            if name == "request":
+                kwargs[name] = request
+            elif name == "method":
+                kwargs[name] = request.command
+            else:
+                kwargs[name] = params
+        if pick is None:
+            kwargs.update(path_params)
+        else:
+            for name in pick:
+                kwargs[name] = path_params[name]
+        return view(**kwargs)
+    return dispatch, needs_params
+
+
 class Route:
-    def __init__(self, route, view, exact=True):
+    def __init__(self, route, view, exact=True, cache=None, app=None):
         self.route = route
         self.view = view
         self.exact = exact
+        # Javob keshining TTL'i (soniya); None - keshlanmaydi
+        self.cache = cache
+        # Route qaysi app'ga tegishli (app papkasi); dev reloader shu bo'yicha almashtiradi
+        self.app = app
+        self.tokens = parse_route(route)
+        self.params = [(name, CONVERTERS[conv]) for conv, name in
+                       (t for t in self.tokens if isinstance(t, tuple))]
+        self.dispatch, self.needs_params = build_dispatcher(view, [name for name, _ in self.params])
+        self.is_async = iscoroutinefunction(view)
+        # Middleware zanjirlari (sync va async dvigatel uchun); MiddlewareStack.build quradi
+        self.chain = None
+        self.async_chain = None
+
+
+class _Node:
+    __slots__ = ("label", "children", "params", "exact", "prefix")
+
+    def __init__(self, label):
+        self.label = label
+        self.children = {}
+        self.params = []
+        self.exact = None
+        self.prefix = None
 
 
 class Router:
-    def __init__(self):
-        self.routes = []
+    """
+    Route'lar radix trie'da saqlanadi, shuning uchun qidiruv route'lar soniga
+    emas, yo'l uzunligiga bog'liq: O(len(path)).
+
+    Route ichida tipli parametrlar bo'lishi mumkin: `<int:id>`, `<slug:name>`,
+    `<str:name>` (yoki `<name>`), `<path:rest>`. Ular ro'yxatdan o'tishda trie
+    tugunlariga kompilyatsiya qilinadi va view'ga keyword argument sifatida beriladi.
+
+    Ustuvorlik tartibi:
+      1. to'liq mos keluvchi (exact) route har doim prefix route'dan ustun;
+      2. har bir pozitsiyada literal qism parametrdan ustun, parametrlar orasida
+         int > slug > str > path;
+      3. prefix route'lar (`exact=False`, `path.startswith(route)`) orasida eng uzuni tanlanadi;
+      4. bir xil route bir necha marta qo'shilsa, birinchi qo'shilgani ishlatiladi.
+
+    Parametr avval eng uzun qiymatni oladi; route'ning qolgan qismi mos
+    kelmasa, qisqaroq qiymatlar sinab ko'riladi (backtracking). Shuning uchun
+    parametrdan keyin istalgan literal kelishi mumkin: `/p/<name>.html` yo'li
+    `/p/x.html` ga mos keladi (`name='x'`), `/file-<int:id>.txt` ham ishlaydi.
+
+    Trie (ildiz, parametrlar bormi) bitta atributda saqlanadi: `replace_app_routes`
+    yangi trie'ni alohida quradi va uni bitta o'zlashtirish bilan almashtiradi,
+    shuning uchun parallel `match()` chaqiruvlari yarim qurilgan holatni ko'rmaydi.
+    Middleware zanjirlari ham route qo'shilganda quriladi (`route.chain`).
+    """
 
-    def add_route(self, route, view, exact=True):
-        self.routes.append(Route(route, view, exact))
-        logger.info(f"Route added: {route} -> {view.__name__}")
+    def __init__(self, middleware=None):
+        self.routes = []
+        self._trie = (_Node(""), False)
+        self._lock = threading.Lock()
+        self._scope = None
+        self._collecting = None
+        self.middleware = middleware if middleware is not None else default_middleware
+        self.middleware.attach(self)
+
+    def add_route(self, route, view, exact=True, cache=None, app=None):
+        route_obj = Route(route, view, exact, cache, app if app is not None else self._scope)
+        # Zanjir shu yerda bir marta quriladi: so'rov paytida faqat `route.chain` chaqiriladi
+        self.middleware.build(route_obj)
+        if self._collecting is not None:
+            # replace_app_routes ichida: route'lar yangi trie uchun yig'iladi
+            self._collecting.append(route_obj)
+            return
+        self.routes.append(route_obj)
+        root, has_params = self._trie
+        if self._insert(root, route_obj):
+            self._trie = (root, True)
+        logger.info(f"Route added: {route} -> {getattr(view, '__name__', type(view).__name__)}")
+
+    def replace_app_routes(self, app, register):
+        """
+        `app` ga tegishli route'larni atomik almashtiradi. `register()` ichidagi
+        `add_route` chaqiruvlari yangi route'lar sifatida yig'iladi; xato bo'lsa,
+        eski route'lar o'zgarishsiz qoladi. Bajarilayotgan so'rovlar eski view'da tugaydi.
+        """
+        with self._lock:
+            new_routes = self._collecting = []
+            try:
+                with self.app_scope(app):
+                    register()
+            finally:
+                self._collecting = None
+
+            routes = []
+            inserted = False
+            for route in self.routes:
+                if route.app != app:
+                    routes.append(route)
+                elif not inserted:
+                    # Yangi route'lar eski route'lar turgan joyga (ustuvorlik saqlanadi)
+                    routes.extend(new_routes)
+                    inserted = True
+            if not inserted:
+                routes.extend(new_routes)
+
+            root = _Node("")
+            has_params = False
+            for route in routes:
+                has_params = self._insert(root, route) or has_params
+            self.routes = routes
+            self._trie = (root, has_params)
+        logger.info(f"Route'lar yangilandi: {app} ({len(new_routes)} ta)")
+        return new_routes
+
+    @contextmanager
+    def app_scope(self, app):
+        """Blok ichida `app` ko'rsatilmagan `add_route` chaqiruvlari shu app'ga tegishli bo'ladi."""
+        previous, self._scope = self._scope, app
+        try:
+            yield
+        finally:
+            self._scope = previous
+
+    def _insert(self, root, route):
+        """Route'ni trie'ga qo'shadi; parametrli bo'lsa True qaytaradi."""
+        node = root
+        has_params = False
+        for token in route.tokens:
+            if isinstance(token, tuple):
+                node = self._insert_param(node, token[0])
+                has_params = True
+            else:
+                node = self._insert_literal(node, token)
+
+        if route.exact:
+            if node.exact is None:
+                node.exact = route
+        elif node.prefix is None:
+            node.prefix = route
+        return has_params
+
+    @staticmethod
+    def _insert_param(node, converter):
+        for existing, _, child in node.params:
+            if existing == converter:
+                return child
+        child = _Node("")
+        node.params.append((converter, CONVERTERS[converter], child))
+        order = list(CONVERTERS)
+        node.params.sort(key=lambda p: order.index(p[0]))
+        return child
+
+    @staticmethod
+    def _insert_literal(node, key):
+        i = 0
+        while i < len(key):
+            child = node.children.get(key[i])
+            if child is None:
+                child = _Node(key[i:])
+                node.children[key[i]] = child
+                return child
+
+            label = child.label
+            j = 0
+            n = min(len(label), len(key) - i)
+            while j < n and label[j] == key[i + j]:
+                j += 1
+
+            if j < len(label):
+                # Qirrani umumiy qism bo'yicha ikkiga bo'lamiz
+                middle = _Node(label[:j])
+                child.label = label[j:]
+                middle.children[child.label[0]] = child
+                node.children[key[i]] = middle
+                child = middle
+
+            node = child
+            i += j
+        return node
+
+    def match(self, path):
+        """
+        Yo'lga mos (Route, path_params) juftligini qaytaradi, topilmasa (None, None).
+        """
+        root, has_params = self._trie
+        if not has_params:
+            route = self._match_literal(root, path)
+            return (route, {}) if route is not None else (None, None)
+
+        best = [None, -1, ()]
+        values = []
+        found = self._search(root, path, 0, values, best)
+        if found is None:
+            route, _, values = best
+            if route is None:
+                return None, None
+        else:
+            route = found
+        return route, {name: conv.to_python(value) for (name, conv), value in zip(route.params, values)}
+
+    @staticmethod
+    def _match_literal(node, path):
+        best = node.prefix
+        i = 0
+        n = len(path)
+        while i < n:
+            child = node.children.get(path[i])
+            if child is None or not path.startswith(child.label, i):
+                return best
+            node = child
+            i += len(child.label)
+            if node.prefix is not None:
+                best = node.prefix
+        return node.exact or best
+
+    def _search(self, node, path, i, values, best):
+        n = len(path)
+        while True:
+            if node.prefix is not None and i > best[1]:
+                best[:] = [node.prefix, i, tuple(values)]
+            if i == n:
+                return node.exact
+            child = node.children.get(path[i])
+            if node.params:
+                break
+            # Parametrsiz tugunlarda rekursiyasiz yuramiz
+            if child is None or not path.startswith(child.label, i):
+                return None
+            node = child
+            i += len(child.label)
+
+        if child is not None and path.startswith(child.label, i):
+            found = self._search(child, path, i + len(child.label), values, best)
+            if found is not None:
+                return found
+
+        for _, converter, param_node in node.params:
+            end = converter.match(path, i)
+            while end > i:
+                values.append(path[i:end])
+                found = self._search(param_node, path, end, values, best)
+                if found is not None:
+                    return found
+                values.pop()
+                if not converter.backtrack:
+                    break
+                # Qisqaroq qiymat faqat keyingi literal shu belgidan boshlansa (yoki parametr bo'lsa) yordam beradi
+                end -= 1
+                while end > i and not param_node.params and path[end] not in param_node.children:
+                    end -= 1
+        return None
 
     def get_view(self, path):
-        for route in self.routes:
-            if route.exact and path == route.route:
-                return route.view
-            if not route.exact and path.startswith(route.route):
-                return route.view
-        return None
+        route, _ = self.match(path)
+        return route.view if route is not None else None
 
 
 router = Router()
 
 
-def PAGE(route):
+DEFAULT_PAGE_CACHE_TTL = 60
+
+
+def PAGE(route, cache=None):
     """
     PAGE dekoratori routing tizimiga sahifa qo'shish uchun.
+    Route ichida tipli parametrlar ishlatish mumkin:
+
+        @PAGE('/users/<int:id>')
+        def user_page(request, id): ...
+
+    `cache` — GET javobini to'liq keshlash (TTL soniyalarda, True - standart TTL).
+    Faqat natijasi faqat yo'l va query parametrlariga bog'liq sahifalar uchun:
+
+        @PAGE('/about', cache=300)
+        def about(request): ...
     """
+    if cache is True:
+        cache = DEFAULT_PAGE_CACHE_TTL
+
     def decorator(view_func):
         view_func.__route__ = route
+        view_func.__cache__ = cache or None
         return view_func
     return decorator
 
 
-def load_app_routes(project_root):
-    routes = []
-
-    exclude_dirs = {'.venv', '__pycache__', 'site-packages', '.git'}
+def import_urls(app):
+    """App'ning `urls.py` modulini bajaradi: (module, soniya) qaytaradi."""
+    start = perf_counter()
+    spec = importlib.util.spec_from_file_location(f"{app.name}.urls", app.urls)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module, perf_counter() - start
 
-    for root, dirs, files in os.walk(project_root):
-        if any(exclude in root for exclude in exclude_dirs):
-            continue
 
-        if 'urls.py' in files:
-            app_urls_path = os.path.join(root, 'urls.py')
-            app_name = os.path.basename(root)
+def register_app_routes(module, target=None, app=None):
+    """
+    `urls.py` modulidagi `@PAGE` view'larni router'ga qo'shadi: (base_url, space_name).
+    `app` — route'lar egasi (app papkasi), `register_routes()` qo'shganlari ham shunga tegishli.
+    """
+    target = target or router
+    with target.app_scope(app):
+        return _register_app_routes(module, target)
 
-            try:
-                spec = importlib.util.spec_from_file_location(f"{app_name}.urls", app_urls_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-
-                base_url = getattr(module, "base_urls", "")
-                space_name = getattr(module, "space_name", "")
-
-                if hasattr(module, "register_routes"):
-                    module.register_routes()
-
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if callable(attr) and hasattr(attr, "__route__"):
-                        route_path = attr.__route__
-
-                        if base_url.endswith("/") and route_path.startswith("/"):
-                            full_path = base_url[:-1] + route_path
-                        elif not base_url.endswith("/") and not route_path.startswith("/"):
-                            full_path = base_url + "/" + route_path
-                        else:
-                            full_path = base_url + route_path
-
-                        full_path = full_path.replace("\\", "/")
-                        router.add_route(full_path, attr)
-
-                routes.append({
-                    "app_name": app_name,
-                    "base_url": base_url,
-                    "space_name": space_name or ""
-                })
-            except Exception as e:
-                logger.warning(f"❌ Failed to load {app_urls_path}: {e}")
 
-    return routes
+def _register_app_routes(module, target):
+    base_url = getattr(module, "base_urls", "")
+    space_name = getattr(module, "space_name", "")
 
+    if hasattr(module, "register_routes"):
+        module.register_routes()
 
-def add_static_routes(router, static_url_path="/static", static_folder="STATIC"):
-    static_folder = os.path.abspath(static_folder)
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if callable(attr) and hasattr(attr, "__route__"):
+            route_path = attr.__route__
 
-    def serve_static_file(request, **kwargs):
-        rel_path = unquote(request.path[len(static_url_path):].lstrip("/"))
-        file_path = os.path.join(static_folder, rel_path)
+            if base_url.endswith("/") and route_path.startswith("/"):
+                full_path = base_url[:-1] + route_path
+            elif not base_url.endswith("/") and not route_path.startswith("/"):
+                full_path = base_url + "/" + route_path
+            else:
+                full_path = base_url + route_path
 
-        if os.path.isdir(file_path):
-            return 403, "text/plain", b"Directory listing is forbidden"
+            full_path = full_path.replace("\\", "/")
+            target.add_route(full_path, attr, cache=getattr(attr, "__cache__", None))
+    return base_url, space_name
 
-        if not os.path.exists(file_path):
-            return 404, "text/plain", b"File not found"
 
-        with open(file_path, "rb") as f:
-            content = f.read()
+def _import_all(apps, workers):
+    """
+    `urls.py` modullarini parallel bajaradi (`@PAGE` faqat atribut qo'yadi, router'ga
+    tegmaydi). Natija app'lar tartibida: (app, module yoki xato, soniya).
+    """
+    def safe_import(app):
+        try:
+            return import_urls(app)
+        except Exception as e:
+            return e, 0.0
+
+    if workers is None:
+        workers = min(8, len(apps))
+    if workers <= 1 or len(apps) <= 1:
+        results = [safe_import(app) for app in apps]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mojiza-import") as executor:
+            results = list(executor.map(safe_import, apps))
+    return [(app, module, seconds) for app, (module, seconds) in zip(apps, results)]
+
+
+def load_app_routes(project_root, exclude_dirs=EXCLUDE_DIRS, workers=None, use_manifest=True, timings=None):
+    """
+    Loyihadagi app'larni topib, ularning route'larini router'ga qo'shadi.
+    `workers` — `urls.py` modullarini parallel import qiluvchi thread'lar soni (1 — ketma-ket).
+    `timings` dict berilsa, unga bosqichlar vaqti yoziladi (startup hisoboti uchun).
+    """
+    routes = []
+    apps = discover_apps(project_root, exclude_dirs, use_manifest, timings=timings)
+
+    start = perf_counter()
+    imported = _import_all(apps, workers)
+    import_time = perf_counter() - start
+
+    # Route'lar ketma-ket va topilish tartibida qo'shiladi (bir xil route'da birinchisi ustun)
+    start = perf_counter()
+    app_times = {}
+    for app, module, seconds in imported:
+        if isinstance(module, Exception):
+            logger.warning(f"❌ Failed to load {app.urls}: {module}")
+            continue
+        try:
+            base_url, space_name = register_app_routes(module, app=app.path)
+        except Exception as e:
+            logger.warning(f"❌ Failed to load {app.urls}: {e}")
+            continue
+        app_times[app.name] = seconds
+        routes.append({
+            "app_name": app.name,
+            "base_url": base_url,
+            "space_name": space_name or ""
+        })
+
+    if timings is not None:
+        timings["imports"] = import_time
+        timings["routes"] = perf_counter() - start
+        timings["apps"] = app_times
+    return routes
 
-        content_type = "image/png" if file_path.endswith(".png") else "text/plain"
-        return 200, content_type, content
 
+def add_static_routes(router, static_url_path="/static", static_folder="STATIC", cache_control="no-cache"):
+    """
+    Static papkani `static_url_path/` prefiksi ostida ulaydi. Fayllar xotiraga
+    o'qilmaydi: server ularni sendfile orqali yuboradi, Range so'rovlari ham ishlaydi.
+    `cache_control` - static javoblardagi `Cache-Control` qiymati.
+    """
+    serve_static_file = StaticFiles(static_folder, static_url_path, cache_control=cache_control)
     router.add_route(f"{static_url_path}/", serve_static_file, exact=False)
@@ -1,17 +1,26 @@
 import sys
-import os
-import importlib
+import collections
 import logging
+import selectors
+import socket
 import threading
 import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-from pathlib import Path
 from http.server import BaseHTTPRequestHandler
-from inspect import signature
 import logging
 import traceback
+from MOJIZA.engine.render import render, render_document, iter_chunks
+from MOJIZA.engine.cache import fragment_cache
+from MOJIZA.engine.pagecache import page_cache
+from MOJIZA.engine.compress import compression
+from MOJIZA.engine.middleware import middleware
+from MOJIZA.engine.metrics import metrics, current_stats
+from MOJIZA.engine.request import Request, MAX_BODY_SIZE
+from MOJIZA.engine.multipart import MultipartError
+from MOJIZA.engine.discovery import EXCLUDE_DIRS, discover_apps
+from MOJIZA.static.files import FileResponse
 
 
 
@@ -19,15 +28,57 @@ logger = logging.getLogger("MOJIZA")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_EMPTY = ()
+
+
 class HTMLElement:
+    """
+    Ixcham HTML tuguni: `__slots__` ishlatiladi, bolalari yoki atributlari yo'q
+    tugunlar umumiy bo'sh tuple'ni bo'lishadi (ro'yxat/dict faqat kerak bo'lganda yaratiladi),
+    teg nomlari intern qilinadi.
+    """
+    __slots__ = ('tag', '_attrs', '_children', 'content')
+
     def __init__(self, tag, **attrs):
-        self.tag = tag
-        self.attrs = {k[2:]: v for k, v in attrs.items() if k.startswith('h_')}
-        self.children = []
+        self.tag = sys.intern(tag)
+        self._children = _EMPTY
         self.content = ''
+        if not attrs:
+            self._attrs = _EMPTY
+            return
+        # h_ prefiksli atributlar oldin, qolganlari keyin (avvalgi tartib saqlanadi)
+        merged = {}
+        rest = None
         for k, v in attrs.items():
-            if not k.startswith('h_'):
-                self.attrs[k] = v
+            if k.startswith('h_'):
+                merged[k[2:]] = v
+            elif rest is None:
+                rest = [(k, v)]
+            else:
+                rest.append((k, v))
+        if rest:
+            merged.update(rest)
+        self._attrs = merged
+
+    @property
+    def attrs(self):
+        if self._attrs is _EMPTY:
+            self._attrs = {}
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, value):
+        self._attrs = value
+
+    @property
+    def children(self):
+        if self._children is _EMPTY:
+            self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._children = value
 
     def __call__(self, *args):
         for c in args:
@@ -36,6 +87,10 @@ class HTMLElement:
         return self
 
     def __getattr__(self, tag):
+        if tag.startswith('_'):
+            # copy/pickle kabi protokollar (__deepcopy__, __setstate__ ...) teg sifatida qabul qilinmasin
+            raise AttributeError(tag)
+
         def create(*args, **attrs):
             el = HTMLElement(tag, **attrs)
             self.children.append(el)
@@ -49,19 +104,8 @@ class HTMLElement:
         self.content = text
         return self
 
-    def render(self, indent=0):
-        sp = '    ' * indent
-        attrs = ' '.join(f'{k}="{v}"' for k, v in self.attrs.items())
-        if self.tag in ('meta', 'link', 'img', 'input', 'br', 'hr'):
-            return f"{sp}<{self.tag} {attrs}/>\n"
-        open_tag = f"<{self.tag}{' '+attrs if attrs else ''}>"
-        html = f"{sp}{open_tag}\n"
-        if self.content:
-            html += f"{sp}    {self.content}\n"
-        for c in self.children:
-            html += c.render(indent+1) if isinstance(c, HTMLElement) else f"{sp}    {c}\n"
-        html += f"{sp}</{self.tag}>\n"
-        return html
+    def render(self, indent=0, minify=False):
+        return render(self, indent, pretty=not minify)
 
 class HTML:
     def __init__(self, title_document, lang="en", **attrs):
@@ -894,6 +938,35 @@ class HTML:
         return self
 
     def end(self, sleep=0, LOGGER=False, DEBUGS=True, AUTHOR="", others=0):
+        self._add_author(AUTHOR)
+        # DEBUGS=True - chiroyli (indentatsiyali) HTML, DEBUGS=False - minify qilingan HTML
+        stats = current_stats()
+        if stats is None:
+            return render_document(self.doctype, self.html, pretty=DEBUGS)
+        start = time.perf_counter()
+        html = render_document(self.doctype, self.html, pretty=DEBUGS)
+        stats.render += time.perf_counter() - start
+        return html
+
+    def stream(self, *parts, DEBUGS=True, AUTHOR="", flush_every=512):
+        """
+        Hujjatni bytes bo'laklari generatori sifatida qaytaradi; server uni
+        `Transfer-Encoding: chunked` bilan yuboradi. `<head>` va sahifa boshi
+        darhol yuboriladi.
+
+        `parts` — elementlar (yoki satrlar) beruvchi iterable/generatorlar; ular
+        body oxiriga faqat yuborish paytida quriladi:
+
+            def rows():
+                for item in load_items():
+                    yield HTMLElement('p').set_content(item)
+            return page.stream(rows())
+        """
+        self._add_author(AUTHOR)
+        late = (self.body, itertools.chain.from_iterable(parts)) if parts else None
+        return iter_chunks(self.html, self.doctype, pretty=DEBUGS, flush_every=flush_every, extra=late)
+
+    def _add_author(self, AUTHOR):
         if AUTHOR:
             script_content = f'''
 const INFORMATION = `
@@ -909,160 +982,587 @@ console.log(INFORMATION);
 '''
             self.add_script(script_content)
 
-        return self.doctype + "\n" + self.html.render()
-
-
-def get_generated_apps():
-
-
-    current_dir = Path(__file__).parent.parent.parent
-    apps = []
 
-    for item in current_dir.iterdir():
-        if item.is_dir():
-            views_file = item / "views.py"
-            urls_file = item / "urls.py"
-            if views_file.exists() and urls_file.exists():
-                apps.append(item.name)
-
-    return apps
+def get_generated_apps(project_root=".", exclude_dirs=EXCLUDE_DIRS):
+    """
+    `views.py` va `urls.py` bor app'lar nomlari. Papkalar qayta aylanib chiqilmaydi:
+    `load_app_routes` bilan bir xil discovery natijasi ishlatiladi.
+    """
+    return [app.name for app in discover_apps(project_root, exclude_dirs) if app.views]
+
+
+def is_stream(content):
+    """Iterator/generator (masalan `HTML.stream()`) bo'lsa True."""
+    return hasattr(content, "__next__") or hasattr(content, "__anext__")
+
+
+def encode_result(result):
+    """
+    View natijasini (status, content_type, content, headers) ko'rinishiga keltiradi.
+    View `(status, content_type, content)` yoki qo'shimcha header'lar bilan
+    `(status, content_type, content, headers)` qaytarishi mumkin.
+    Agar content iterator (stream) yoki FileResponse bo'lsa, u o'zgarishsiz qaytariladi.
+    """
+    if isinstance(result, FileResponse):
+        return result.status, result.content_type, result, result.headers
+    if isinstance(result, tuple) and len(result) in (3, 4):
+        status, content_type, content = result[:3]
+        headers = result[3] if len(result) == 4 else None
+        if isinstance(content, str):
+            content = content.encode()
+        elif not isinstance(content, (bytes, FileResponse)) and not is_stream(content):
+            content = str(content).encode()
+        return status, content_type, content, headers
+    if is_stream(result):
+        return 200, "text/html", result, None
+    return 200, "text/html", str(result).encode(), None
+
+
+def call_view(request, route, path_params):
+    """Middleware zanjirining markazi: view'ni chaqiradi (params dangasa o'qiladi)."""
+    params = request.params if route.needs_params else None
+    stats = current_stats()
+    if stats is None:
+        return encode_result(route.dispatch(request, params, path_params))
+    start = time.perf_counter()
+    result = route.dispatch(request, params, path_params)
+    stats.view += time.perf_counter() - start
+    return encode_result(result)
+
+
+middleware.set_core(call_view)
 
 
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/1.1 handler. Ulanishlar keep-alive bo'yicha qayta ishlatiladi:
+    `timeout` — boshlangan so'rovni o'qishda socket timeout'i (soniya; bo'sh ulanishni server o'zi yopadi),
+    `max_keep_alive_requests` — bitta ulanishdagi so'rovlar chegarasi,
+    `max_body_size` — body hajmi chegarasi (undan kattasi o'qilmasdan 413 bilan rad etiladi).
+    Har bir javob Content-Length bilan yuboriladi, shuning uchun pipelining ham ishlaydi.
+    """
+    protocol_version = "HTTP/1.1"
+    timeout = 5
+    max_keep_alive_requests = 100
+    max_body_size = MAX_BODY_SIZE
+    # Header va body alohida yoziladi: Nagle + delayed ACK keep-alive'da ~40ms kechikish beradi
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        # Ulanish so'rovlar orasida server selector'ida kutadi: hisob server'da saqlanadi
+        self.requests_served = self.server.served_requests(self.request)
+        self._stats = None
+
+    def handle(self):
+        """
+        Tayyor so'rovlarni bajaradi: birinchisini va pipelining bilan allaqachon
+        kelganlarini. Keyingi so'rov kelmagan bo'lsa qaytadi — bo'sh ulanish
+        worker'ni band qilmaydi, u server selector'ida kutadi (`close_connection` False qoladi).
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._next_request_ready():
+            self.handle_one_request()
+
+    def _next_request_ready(self):
+        """Keyingi so'rov baytlari buferda yoki socketda bormi — kutmasdan tekshiradi."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def handle_expect_100(self):
+        # Katta body'ni mijoz yubora boshlashidan oldin rad etamiz
+        if self._too_large():
+            self._reject_too_large()
+            return False
+        return super().handle_expect_100()
+
+    def _too_large(self):
+        try:
+            return int(self.headers.get("Content-Length") or 0) > self.max_body_size
+        except ValueError:
+            return False
 
+    def _reject_too_large(self):
+        # Body o'qilmaydi, shuning uchun ulanish yopiladi
+        self.close_connection = True
+        self._send(413, "text/plain", b"413 Payload Too Large")
 
-class RequestHandler(BaseHTTPRequestHandler):
     def do_GET(self):  self._handle()
     def do_POST(self): self._handle()
     def _handle(self):
-        from MOJIZA.engine.routing import router
-        from inspect import signature
-        from urllib.parse import parse_qs
-        import logging
-
-        path = self.path.split("?", 1)[0]
-        view = router.get_view(path)
-
-        if view is None:
-            self.send_response(404)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"404 Not Found")
+        if not metrics.enabled:
+            self._dispatch(None)
             return
-
+        stats, token = metrics.begin()
+        self._stats = stats
         try:
-            if self.command == "POST":
-                content_length = int(self.headers.get("Content-Length", 0))
-                body = self.rfile.read(content_length).decode("utf-8")
-                params = parse_qs(body)  
-            else:
-                params = {}
-                if "?" in self.path:
-                    query = self.path.split("?", 1)[1]
-                    params = parse_qs(query)
+            self._dispatch(stats)
+        finally:
+            self._stats = None
+            metrics.finish(stats, token)
 
-            if path.startswith("/static/"):
-                result = view(self)
+    def _dispatch(self, stats):
+        from MOJIZA.engine.routing import router
 
-            else:
-                sig = signature(view)
-                names = list(sig.parameters.keys())
+        self.requests_served += 1
+        if self._too_large():
+            self._reject_too_large()
+            return
+        request = Request(self.command, self.path, self.request_version, self.headers,
+                          self.rfile, self.client_address)
+
+        if stats is None:
+            route, path_params = router.match(request.path)
+        else:
+            start = time.perf_counter()
+            route, path_params = router.match(request.path)
+            stats.routing = time.perf_counter() - start
+            if route is not None:
+                stats.route = route.route
+
+        if route is None:
+            self._finish_body(request)
+            self._send(404, "text/plain", b"404 Not Found")
+            return
 
-                if names == ["request"]:
-                    result = view(self)
-                elif names == ["method", "params"]:
-                    result = view(method=self.command, params=params)
-                else:
-                    raise Exception(f"View funksiyasi noto‘g‘ri formatda! Parametrlar: {names}")
-
-            if isinstance(result, tuple) and len(result) == 3:
-                status, content_type, content = result
-                if isinstance(content, str):
-                    content = content.encode()
-                elif not isinstance(content, bytes):
-                    content = str(content).encode()
-            else:
-                status, content_type, content = 200, "text/html", str(result).encode()
+        try:
+            response = route.chain(request, route, path_params)
+            # View body'ni o'qimagan bo'lishi mumkin (yoki javob keshdan kelgan)
+            self._finish_body(request)
+            self._send(*response)
 
-            self.send_response(status)
-            self.send_header("Content-Type", content_type)
-            self.send_header("Content-Length", str(len(content)))
-            self.end_headers()
-            self.wfile.write(content)
+        except MultipartError as e:
+            if not request.reusable:
+                self.close_connection = True
+            self._send(e.status, "text/plain", f"{e.status} {e}".encode())
 
         except Exception as e:
             logging.getLogger("MOJIZA.engine.server").exception("Error during request handling")
-            self.send_response(500)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(f"500 Internal Server Error\n\n{e}".encode())
+            if not request.reusable:
+                self.close_connection = True
+            self._send(500, "text/plain", f"500 Internal Server Error\n\n{e}".encode())
 
+        finally:
+            request.close()
 
-def run_server(port=8000):
-    httpd = HTTPServer(('', port), RequestHandler)
-    logger.info(f'Server running on port {port}')
+    def _finish_body(self, request):
+        """O'qilmagan body ulanishda qolsa keyingi so'rov buziladi, shuning uchun uni tashlab yuboramiz."""
+        if not request.discard():
+            self.close_connection = True
 
-    def reload_views():
-        project_dir = os.path.join(os.getcwd(), 'projectpapca')
-        if not os.path.exists(project_dir):
-            logger.warning("projectpapca papkasi topilmadi!")
+    def _send(self, status, content_type, content, headers=None):
+        if is_stream(content):
+            self._send_stream(status, content_type, content, headers)
+            return
+        if self.requests_served >= self.max_keep_alive_requests:
+            self.close_connection = True
+
+        is_file = isinstance(content, FileResponse)
+        if is_file:
+            # Fayl header'lardan oldin ochiladi: yo'qolgan bo'lsa hali 500 yuborish mumkin
+            f = open(content.path, "rb")
+
+        length = content.length if is_file else len(content)
+        if self._stats is not None:
+            self._stats.status = status
+            self._stats.bytes += length
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if status not in (204, 304):
+            self.send_header("Content-Length", str(length))
+        if headers:
+            for name, value in headers.items():
+                self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        elif self.request_version == "HTTP/1.0":
+            self.send_header("Connection", "keep-alive")
+        self.end_headers()
+        if is_file:
+            with f:
+                self._send_file(f, content.offset, content.length)
+            return
+        self.wfile.write(content)
+
+    def _send_file(self, f, offset, length):
+        """
+        Faylni socketga zero-copy yuboradi (`socket.sendfile` -> `os.sendfile`).
+        sendfile ishlamaydigan joylarda (TLS, Windows) bo'laklab o'qib yuboriladi.
+        """
+        if length <= 0:
+            return
+        try:
+            sent = self.connection.sendfile(f, offset, length)
+        except OSError:
+            # Header'lar ketgan, qancha yuborilgani noma'lum: ulanishni uzamiz
+            logging.getLogger("MOJIZA.engine.server").warning("sendfile failed", exc_info=True)
+            self.close_connection = True
             return
+        if sent < length:
+            self.close_connection = True
+
+    def _send_stream(self, status, content_type, chunks, headers=None):
+        """
+        Javobni `Transfer-Encoding: chunked` bilan bo'lib-bo'lib yuboradi.
+        HTTP/1.0 mijozlarga esa oddiy oqim sifatida yuborib, ulanishni yopadi.
+        """
+        # Birinchi bo'lak header'lardan oldin olinadi: view xatosi hali 500 bo'lib qaytishi mumkin
+        chunks = iter(chunks)
+        first = next(chunks, b"")
+
+        chunked = self.request_version != "HTTP/1.0"
+        if not chunked or self.requests_served >= self.max_keep_alive_requests:
+            self.close_connection = True
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        if headers:
+            for name, value in headers.items():
+                self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+
+        write = self.wfile.write
+        sent = 0
+        try:
+            for chunk in itertools.chain((first,), chunks):
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                if not chunk:
+                    continue
+                sent += len(chunk)
+                if chunked:
+                    write(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+                else:
+                    write(chunk)
+            if chunked:
+                write(b"0\r\n\r\n")
+        except Exception:
+            # Header'lar allaqachon ketgan, 500 yuborib bo'lmaydi: ulanishni uzamiz
+            logging.getLogger("MOJIZA.engine.server").exception("Error during streaming response")
+            self.close_connection = True
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            if self._stats is not None:
+                self._stats.status = status
+                self._stats.bytes += sent
+
+
+reload_hooks = []
+
+
+def on_reload(hook):
+    """
+    Dev reloader ishlaganda chaqiriladigan funksiyani ro'yxatga oladi
+    (masalan keshlarni tozalash uchun).
+    """
+    reload_hooks.append(hook)
+    return hook
+
+
+def fire_reload_hooks():
+    for hook in reload_hooks:
+        try:
+            hook()
+        except Exception:
+            logger.exception(f"Reload hook failed: {hook}")
+
+
+on_reload(fragment_cache.clear)
+on_reload(page_cache.clear)
+
+
+class KeepAliveHTTPServer(HTTPServer):
+    """
+    Bitta oqimli HTTP/1.1 server. Bo'sh keep-alive ulanishlar handler ichida
+    kutilmaydi: ular listen socket bilan birga selector'da turadi va faqat
+    yangi so'rov kelganda (socket o'qishga tayyor bo'lganda) qayta ishlanadi.
+    Shuning uchun ulanishni ochiq ushlab turgan mijoz boshqalarni to'sib qo'ymaydi.
+
+    `keep_alive_timeout` soniya davomida so'rov kelmagan ulanish yopiladi
+    (0 — har bir javobdan keyin ulanish yopiladi). Yangi ulanish birinchi so'rovini
+    `keep_alive_timeout` (u 0 bo'lsa `header_timeout`) soniya ichida yuborishi kerak.
+    Ochiq ulanishlar `max_connections` ga yetsa, eng eski bo'sh ulanish yopiladi;
+    bo'shi bo'lmasa yangi ulanishlar yadro navbatida (`backlog`) kutadi.
+    """
+    max_connections = 512
+    header_timeout = 5
+
+    def __init__(self, server_address, handler_class, bind_and_activate=True, keep_alive_timeout=5):
+        super().__init__(server_address, handler_class, bind_and_activate)
+        self.keep_alive_timeout = keep_alive_timeout or 0
+        self._idle = {}       # socket -> (client_address, muddat); qo'shilish tartibi = muddat tartibi
+        self._served = {}     # socket -> shu ulanishda bajarilgan so'rovlar soni
+        self._returned = collections.deque()
+        self._active = 0
+        self._selector = None
+        self._listening = False
+        self._wakeup_r = self._wakeup_w = None
+        self._shutdown_request = False
+        self._is_shut_down = threading.Event()
+
+    def served_requests(self, sock):
+        return self._served.get(sock, 0)
+
+    def serve_forever(self, poll_interval=0.5):
+        self._shutdown_request = False
+        self._is_shut_down.clear()
+        # Pre-fork'da listen socket umumiy: accept'ni boshqa worker olib qo'ysa kutib qolmaymiz
+        self.socket.setblocking(False)
+        # Har bir jarayon o'z wakeup juftligini oladi (fork'dan keyin yaratiladi)
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        try:
+            with selectors.DefaultSelector() as selector:
+                self._selector = selector
+                selector.register(self, selectors.EVENT_READ)
+                self._listening = True
+                selector.register(self._wakeup_r, selectors.EVENT_READ)
+                while not self._shutdown_request:
+                    ready = selector.select(self._select_timeout(poll_interval))
+                    if self._shutdown_request:
+                        break
+                    for key, _ in ready:
+                        if key.fileobj is self:
+                            self._handle_request_noblock()
+                        elif key.fileobj is self._wakeup_r:
+                            self._drain_wakeup()
+                        else:
+                            self._resume(key.fileobj)
+                    self._park_returned()
+                    self._close_expired()
+                    self._update_listening()
+                    self.service_actions()
+        finally:
+            self._selector = None
+            for sock in list(self._idle):
+                self._close(sock)
+            self._wakeup_r.close()
+            self._wakeup_w.close()
+            self._is_shut_down.set()
+
+    def shutdown(self):
+        self._shutdown_request = True
+        self._wakeup()
+        self._is_shut_down.wait()
+
+    def _wakeup(self):
+        try:
+            self._wakeup_w.send(b"!")
+        except (AttributeError, OSError):
+            pass
 
-        for item in os.listdir(project_dir):
-            app_path = os.path.join(project_dir, item)
-            views_file = os.path.join(app_path, 'views.py')
-            urls_file = os.path.join(app_path, 'urls.py')
-
-            if os.path.isfile(views_file) and os.path.isfile(urls_file):
-                try:
-                    module_path = f'projectpapca.{item}.views'
-                    if module_path in sys.modules:
-                        importlib.reload(sys.modules[module_path])
-                        logger.info(f'{module_path} qayta yuklandi.')
-                    else:
-                        __import__(module_path)
-                        logger.info(f'{module_path} yuklandi.')
-                    urls_module = importlib.import_module(f'projectpapca.{item}.urls')
-                    base_url = getattr(urls_module, 'base_url_name', None)
-                    if base_url:
-                        logger.info(f"App `{item}` uchun URL path: '{base_url}/'")
-                    else:
-                        logger.warning(f"{item}.urls ichida `base_url_name` topilmadi.")
-
-                except Exception as e:
-                    logger.error(f"{item} moduli reload qilinmadi: {e}")
-
-    threading.Thread(target=reload_views, daemon=True).start()
+    def _drain_wakeup(self):
+        try:
+            self._wakeup_r.recv(4096)
+        except OSError:
+            pass
+
+    def _select_timeout(self, poll_interval):
+        if not self._idle:
+            return poll_interval
+        deadline = next(iter(self._idle.values()))[1]
+        return max(0.0, min(poll_interval, deadline - time.monotonic()))
+
+    def process_request(self, request, client_address):
+        # Yangi ulanish birinchi so'rovi kelguncha selector'da kutadi
+        if len(self._idle) + self._active >= self.max_connections and self._idle:
+            self._close(next(iter(self._idle)))
+        self._served[request] = 0
+        # keep_alive_timeout=0 da qaytgan ulanishlar saqlanmaydi, shuning uchun
+        # `_idle` da faqat yangi ulanishlar bo'ladi va muddat tartibi buzilmaydi
+        self._park(request, client_address, self.keep_alive_timeout or self.header_timeout)
+
+    def _park(self, sock, client_address, timeout):
+        self._idle[sock] = (client_address, time.monotonic() + timeout)
+        self._selector.register(sock, selectors.EVENT_READ)
+
+    def _resume(self, sock):
+        client_address, _ = self._idle.pop(sock)
+        self._selector.unregister(sock)
+        self._active += 1
+        self.dispatch_connection(sock, client_address)
+
+    def dispatch_connection(self, sock, client_address):
+        """So'rov kelgan ulanishni qayta ishlaydi (bu serverda — shu oqimda)."""
+        self._release(sock, client_address, self._serve_connection(sock, client_address))
+
+    def _serve_connection(self, sock, client_address):
+        """Ulanishdagi tayyor so'rov(lar)ni bajaradi; ulanishni saqlash kerakmi — shuni qaytaradi."""
+        try:
+            handler = self.RequestHandlerClass(sock, client_address, self)
+        except Exception:
+            self.handle_error(sock, client_address)
+            return False
+        self._served[sock] = handler.requests_served
+        return not handler.close_connection and bool(self.keep_alive_timeout)
+
+    def _release(self, sock, client_address, keep):
+        # Ulanishlar hisobini faqat selector oqimi yuritadi
+        self._returned.append((sock, client_address, keep))
+
+    def _park_returned(self):
+        while self._returned:
+            sock, client_address, keep = self._returned.popleft()
+            self._active -= 1
+            if keep and not self._shutdown_request:
+                self._park(sock, client_address, self.keep_alive_timeout)
+            else:
+                self._close(sock)
+
+    def _close_expired(self):
+        now = time.monotonic()
+        while self._idle:
+            sock, (_, deadline) = next(iter(self._idle.items()))
+            if deadline > now:
+                return
+            self._close(sock)
+
+    def _close(self, sock):
+        if self._idle.pop(sock, None) is not None and self._selector is not None:
+            self._selector.unregister(sock)
+        self._served.pop(sock, None)
+        self.shutdown_request(sock)
+
+    def _update_listening(self):
+        # Hamma ulanishlar band bo'lsa, yangilari yadro navbatida kutadi
+        full = self._active >= self.max_connections
+        if full and self._listening:
+            self._selector.unregister(self)
+            self._listening = False
+        elif not full and not self._listening:
+            self._selector.register(self, selectors.EVENT_READ)
+            self._listening = True
+
+    def server_close(self):
+        super().server_close()
+        while self._returned:
+            sock, _, _ = self._returned.popleft()
+            self.shutdown_request(sock)
+
+
+class PooledHTTPServer(KeepAliveHTTPServer):
+    """
+    So'rovlarni cheklangan thread pool ichida parallel qayta ishlovchi server.
+
+    Worker'ga faqat so'rovi kelgan ulanish beriladi; bo'sh keep-alive
+    ulanishlar selector'da kutadi, shuning uchun `workers` ta bo'sh mijoz
+    qolgan mijozlarni to'sib qo'ymaydi. Bir vaqtda ko'pi bilan `workers` ta
+    so'rov bajariladi, qolganlari navbatda turadi; jarayon ichidagi ulanishlar
+    `max_connections` bilan cheklangan, ortig'i yadroning listen navbatida (`backlog`) kutadi.
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, workers=8, backlog=128, bind_and_activate=True,
+                 keep_alive_timeout=5):
+        self.request_queue_size = backlog
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mojiza-worker")
+        super().__init__(server_address, handler_class, bind_and_activate, keep_alive_timeout)
+
+    def dispatch_connection(self, sock, client_address):
+        try:
+            self._executor.submit(self._process_connection, sock, client_address)
+        except RuntimeError:
+            self._release(sock, client_address, False)
 
+    def _process_connection(self, sock, client_address):
+        keep = False
+        try:
+            keep = self._serve_connection(sock, client_address)
+        finally:
+            self._release(sock, client_address, keep)
+            self._wakeup()
+
+    def server_close(self):
+        self._executor.shutdown(wait=True)
+        super().server_close()
+
+
+def make_handler(keep_alive_timeout=5, max_keep_alive_requests=100, max_body_size=MAX_BODY_SIZE):
+    """
+    Keep-alive sozlamalari bilan RequestHandler subclass'ini yaratadi.
+    keep_alive_timeout=0 bo'lsa har bir javobdan keyin ulanish yopiladi.
+    """
+    if not keep_alive_timeout:
+        # Boshlangan so'rovni o'qish baribir cheklanadi (sekin mijoz worker'ni ushlab qolmasin)
+        keep_alive_timeout, max_keep_alive_requests = RequestHandler.timeout, 1
+    return type("RequestHandler", (RequestHandler,), {
+        "timeout": keep_alive_timeout,
+        "max_keep_alive_requests": max_keep_alive_requests,
+        "max_body_size": max_body_size,
+    })
+
+
+def make_server(port=8000, workers=1, backlog=128, keep_alive_timeout=5, max_keep_alive_requests=100,
+                max_body_size=MAX_BODY_SIZE):
+    """
+    workers <= 1 bo'lsa bitta oqimli KeepAliveHTTPServer, aks holda PooledHTTPServer qaytaradi.
+    """
+    handler = make_handler(keep_alive_timeout, max_keep_alive_requests, max_body_size)
+    if workers and workers > 1:
+        return PooledHTTPServer(('', port), handler, workers=workers, backlog=backlog,
+                                keep_alive_timeout=keep_alive_timeout)
+    server = KeepAliveHTTPServer(('', port), handler, bind_and_activate=False,
+                                 keep_alive_timeout=keep_alive_timeout)
+    server.request_queue_size = backlog
     try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        pass
-    httpd.server_close()
-    logger.info('Server stopped')
-
-
-class ReloadHandler(FileSystemEventHandler):
-    def __init__(self, cb):
-        super().__init__()
-        self.cb = cb
-
-    def on_modified(self, event):
-        if event.src_path.endswith('.py'):
-            logger.info(f'Reloading due to change in: {event.src_path}')
-            self.cb()
+        server.server_bind()
+        server.server_activate()
+    except Exception:
+        server.server_close()
+        raise
+    return server
+
+
+def run_server(port=8000, workers=1, backlog=128, processes=1, engine="thread",
+               keep_alive_timeout=5, max_keep_alive_requests=100, compress_level=6, metrics_path=None,
+               max_body_size=MAX_BODY_SIZE):
+    # 0 - dinamik javoblar siqilmaydi
+    compression.level = compress_level
+    if metrics_path:
+        from MOJIZA.engine.metrics import enable_metrics
+        from MOJIZA.engine.routing import router
+        enable_metrics(router, metrics_path)
+    if engine == "asyncio":
+        from MOJIZA.engine.aserver import run_async_server
+        if processes and processes > 1:
+            logger.warning(f"asyncio dvigateli pre-fork rejimini qo'llamaydi: processes={processes} e'tiborsiz, "
+                           f"server bitta jarayonda ishlaydi")
+        run_async_server(port=port, workers=workers if workers and workers > 1 else None, backlog=backlog,
+                         keep_alive_timeout=keep_alive_timeout, max_keep_alive_requests=max_keep_alive_requests,
+                         max_body_size=max_body_size)
+        return
+
+    server = make_server(port, workers=workers, backlog=backlog, keep_alive_timeout=keep_alive_timeout,
+                         max_keep_alive_requests=max_keep_alive_requests, max_body_size=max_body_size)
+    if workers and workers > 1:
+        logger.info(f"Server running on port {port} (workers={workers}, backlog={backlog})")
+    else:
+        logger.info(f"Server running on port {port}")
+
+    if processes and processes > 1:
+        from MOJIZA.engine.prefork import run_prefork
+        run_prefork(server, processes=processes)
+        return
 
-def start_auto_reload(callback, path='.'):
-    observer = Observer()
-    observer.schedule(ReloadHandler(callback), path=path, recursive=True)
-    observer.start()
     try:
-        while True:
-            time.sleep(1)
+        server.serve_forever()
     except KeyboardInterrupt:
-        observer.stop()
-    observer.join()
-
-def run_server(port=8000):
-    server = HTTPServer(('', port), RequestHandler)
-    logger.info(f"Server running on port {port}")
-    server.serve_forever()
+        pass
+    finally:
+        server.server_close()
+        logger.info("Server stopped")
@@ -1,3 +1,3 @@
 # MOJIZA/models/__init__.py
 
-from .base import Model
+from .base import Model, Field, Database, db, create_tables
@@ -1 +1,443 @@
-"""Hali mavjud emas"""
+"""
+Yengil ORM (standart `sqlite3` ustida).
+
+    from MOJIZA.models.base import Model, Field
+
+    class User(Model):
+        username = Field('string', unique=True)
+        email = Field('string')
+        age = Field('integer', default=0)
+
+    User.create_table()
+    user = User.create(username="ali", email="ali@example.com")
+    User.filter(age=0, order_by="-id", limit=10)
+    User.bulk_create([User(username=f"u{i}") for i in range(10000)])   # bitta tranzaksiya
+
+Ulanishlar har bir thread uchun bittadan ochiladi va qayta ishlatiladi
+(server worker thread'lari doimiy, shuning uchun har so'rovda yangi ulanish
+ochilmaydi). Baza WAL rejimida: o'quvchilar yozuvchini kutmaydi. SQL matnlari
+har bir model uchun bir marta quriladi, `sqlite3` esa ularni har bir ulanishda
+tayyor (prepared) holda keshlaydi (`cached_statements`).
+"""
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+logger = logging.getLogger("MOJIZA.models")
+
+DEFAULT_DATABASE = os.environ.get("MOJIZA_DATABASE", "db.sqlite3")
+
+
+def _identity(value):
+    return value
+
+
+def _to_bool(value):
+    return None if value is None else bool(value)
+
+
+def _from_bool(value):
+    return None if value is None else int(bool(value))
+
+
+def _iso(value):
+    return None if value is None else value.isoformat()
+
+
+def _parser(cls):
+    def parse(value):
+        return None if value is None else cls.fromisoformat(value)
+    return parse
+
+
+def _dump_json(value):
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _load_json(value):
+    return None if value is None else json.loads(value)
+
+
+# tur: (SQL turi, Python -> baza, baza -> Python)
+FIELD_TYPES = {
+    "string": ("TEXT", _identity, _identity),
+    "text": ("TEXT", _identity, _identity),
+    "integer": ("INTEGER", _identity, _identity),
+    "float": ("REAL", _identity, _identity),
+    "boolean": ("INTEGER", _from_bool, _to_bool),
+    "datetime": ("TEXT", _iso, _parser(datetime.datetime)),
+    "date": ("TEXT", _iso, _parser(datetime.date)),
+    "bytes": ("BLOB", _identity, _identity),
+    "json": ("TEXT", _dump_json, _load_json),
+}
+
+
+class Field:
+    def __init__(self, type="string", primary_key=False, null=True, default=None, unique=False, index=False):
+        if type not in FIELD_TYPES:
+            raise ValueError(f"Noma'lum maydon turi: {type} (mavjudlari: {', '.join(FIELD_TYPES)})")
+        self.type = type
+        self.primary_key = primary_key
+        self.null = null and not primary_key
+        self.default = default
+        self.unique = unique
+        self.index = index
+        self.name = None
+        self.sql_type, self.to_db, self.to_python = FIELD_TYPES[type]
+
+    def get_default(self):
+        return self.default() if callable(self.default) else self.default
+
+    def column_sql(self):
+        sql = f'"{self.name}" {self.sql_type}'
+        if self.primary_key:
+            sql += " PRIMARY KEY"
+            if self.sql_type == "INTEGER":
+                sql += " AUTOINCREMENT"
+        if not self.null and not self.primary_key:
+            sql += " NOT NULL"
+        if self.unique:
+            sql += " UNIQUE"
+        return sql
+
+    def __repr__(self):
+        return f"<Field {self.name}: {self.type}>"
+
+
+# fork()'dan keyin bola jarayonda ulanishlar pool'ini tozalash uchun
+_databases = weakref.WeakSet()
+# Bola jarayonga o'tgan ota ulanishlari: ular ishlatilmaydi ham, yopilmaydi ham
+# (yopish WAL checkpoint qilib, ota jarayonning bazasini buzishi mumkin)
+_inherited = []
+
+
+class Database:
+    """
+    SQLite bazasi. Har bir thread o'z ulanishini oladi (thread-local pool),
+    ulanish thread yashagan davomida qayta ishlatiladi.
+
+    SQLite ulanishini `fork()` orqali o'tkazish mumkin emas: pre-fork rejimida
+    master ochgan ulanishlar (masalan import paytidagi `create_tables`) worker'da
+    ishlatilmaydi — bola jarayonda pool bo'shatiladi va yangi ulanishlar ochiladi.
+    """
+
+    def __init__(self, path=DEFAULT_DATABASE, timeout=5.0, cached_statements=256, wal=True):
+        self.path = path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.wal = wal
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        _databases.add(self)
+
+    def _after_fork(self):
+        _inherited.extend(self._connections)
+        self._connections = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: tranzaksiyalarni o'zimiz boshqaramiz (`transaction()`)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                   cached_statements=self.cached_statements, check_same_thread=False)
+            if self.wal and self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                # WAL'da NORMAL xavfsiz va har commit'da fsync qilmaydi
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def execute(self, sql, params=()):
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql, rows):
+        return self.connection().executemany(sql, rows)
+
+    @contextmanager
+    def transaction(self):
+        """
+        `BEGIN IMMEDIATE ... COMMIT` (xato bo'lsa ROLLBACK). Ichma-ich chaqirilsa,
+        tashqi tranzaksiyaga qo'shiladi.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        """Joriy thread ulanishini yopadi."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._connections.remove(conn)
+            conn.close()
+
+    def close_all(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+def _reset_after_fork():
+    for database in list(_databases):
+        database._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+db = Database()
+
+
+def _quote(name):
+    return f'"{name}"'
+
+
+class ModelMeta(type):
+    """Maydonlarni yig'adi va model SQL'larini bir marta quradi."""
+
+    def __new__(mcs, name, bases, attrs):
+        cls = super().__new__(mcs, name, bases, attrs)
+        fields = {}
+        for base in reversed(cls.__mro__[1:]):
+            fields.update(getattr(base, "__fields__", {}))
+        for key, value in attrs.items():
+            if isinstance(value, Field):
+                value.name = key
+                fields[key] = value
+
+        if attrs.get("__abstract__"):
+            # Jadvalsiz asos model: maydonlari voris modellarga o'tadi
+            cls.__fields__ = fields
+            return cls
+
+        pk = next((f for f in fields.values() if f.primary_key), None)
+        if pk is None:
+            pk = Field("integer", primary_key=True)
+            pk.name = "id"
+            fields = {"id": pk, **fields}
+            cls.id = pk
+        cls.__fields__ = fields
+        cls.__pk__ = pk.name
+        cls.__table__ = attrs.get("__table__") or name.lower()
+
+        table = _quote(cls.__table__)
+        columns = [f for f in fields.values() if f is not pk]
+        cls._columns = tuple(fields)
+        cls._insert_fields = tuple(f.name for f in columns)
+        cls._select_sql = f"SELECT {', '.join(_quote(n) for n in fields)} FROM {table}"
+        if columns:
+            cls._insert_sql = (f"INSERT INTO {table} ({', '.join(_quote(f.name) for f in columns)}) "
+                               f"VALUES ({', '.join('?' for _ in columns)})")
+        else:
+            cls._insert_sql = f"INSERT INTO {table} DEFAULT VALUES"
+        cls._insert_pk_sql = (f"INSERT INTO {table} ({', '.join(_quote(n) for n in fields)}) "
+                              f"VALUES ({', '.join('?' for _ in fields)})")
+        # Faqat id'dan iborat modelda yangilanadigan maydon yo'q: SET o'rniga pk'ning o'zi
+        assignments = [f"{_quote(f.name)} = ?" for f in columns] or [f"{_quote(pk.name)} = {_quote(pk.name)}"]
+        cls._update_sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE {_quote(pk.name)} = ?"
+        cls._delete_sql = f"DELETE FROM {table} WHERE {_quote(pk.name)} = ?"
+        return cls
+
+
+class Model(metaclass=ModelMeta):
+    __abstract__ = True
+    # Boshqa baza uchun: class Log(Model): __database__ = Database("logs.sqlite3")
+    __database__ = db
+
+    def __init__(self, **values):
+        fields = self.__fields__
+        for key in values:
+            if key not in fields:
+                raise TypeError(f"{type(self).__name__}: noma'lum maydon '{key}'")
+        for name, field in fields.items():
+            setattr(self, name, values[name] if name in values else field.get_default())
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.__pk__}={getattr(self, self.__pk__)!r}>"
+
+    def __eq__(self, other):
+        pk = self.__pk__
+        return type(other) is type(self) and getattr(self, pk) is not None and getattr(self, pk) == getattr(other, pk)
+
+    def __hash__(self):
+        return hash((type(self), getattr(self, self.__pk__)))
+
+    # --- jadval ---
+
+    @classmethod
+    def create_table(cls, if_not_exists=True):
+        exists = "IF NOT EXISTS " if if_not_exists else ""
+        columns = ", ".join(f.column_sql() for f in cls.__fields__.values())
+        with cls.__database__.transaction() as conn:
+            conn.execute(f"CREATE TABLE {exists}{_quote(cls.__table__)} ({columns})")
+            for field in cls.__fields__.values():
+                if field.index and not field.unique and not field.primary_key:
+                    conn.execute(f"CREATE INDEX {exists}{_quote(f'{cls.__table__}_{field.name}_idx')} "
+                                 f"ON {_quote(cls.__table__)} ({_quote(field.name)})")
+
+    @classmethod
+    def drop_table(cls, if_exists=True):
+        cls.__database__.execute(f"DROP TABLE {'IF EXISTS ' if if_exists else ''}{_quote(cls.__table__)}")
+
+    # --- o'qish ---
+
+    @classmethod
+    def _from_row(cls, row):
+        obj = cls.__new__(cls)
+        values = obj.__dict__
+        for field, value in zip(cls.__fields__.values(), row):
+            values[field.name] = field.to_python(value)
+        return obj
+
+    @classmethod
+    def _where(cls, where):
+        clauses = []
+        params = []
+        fields = cls.__fields__
+        for key, value in where.items():
+            field = fields.get(key)
+            if field is None:
+                raise TypeError(f"{cls.__name__}: noma'lum maydon '{key}'")
+            if value is None:
+                clauses.append(f"{_quote(key)} IS NULL")
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                value = list(value)
+                clauses.append(f"{_quote(key)} IN ({', '.join('?' for _ in value)})")
+                params.extend(field.to_db(v) for v in value)
+            else:
+                clauses.append(f"{_quote(key)} = ?")
+                params.append(field.to_db(value))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @classmethod
+    def filter(cls, order_by=None, limit=None, offset=None, **where):
+        """`name=qiymat` (None - IS NULL, ro'yxat - IN). `order_by="-id"` - kamayish tartibida."""
+        sql, params = cls._where(where)
+        sql = cls._select_sql + sql
+        if order_by:
+            name = order_by.lstrip("-")
+            if name not in cls.__fields__:
+                raise TypeError(f"{cls.__name__}: noma'lum maydon '{name}'")
+            sql += f" ORDER BY {_quote(name)}{' DESC' if order_by.startswith('-') else ''}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+            if offset:
+                sql += " OFFSET ?"
+                params.append(int(offset))
+        from_row = cls._from_row
+        return [from_row(row) for row in cls.__database__.execute(sql, params)]
+
+    @classmethod
+    def all(cls):
+        return cls.filter()
+
+    @classmethod
+    def get(cls, **where):
+        """Birinchi mos yozuv yoki None."""
+        rows = cls.filter(limit=1, **where)
+        return rows[0] if rows else None
+
+    @classmethod
+    def count(cls, **where):
+        sql, params = cls._where(where)
+        return cls.__database__.execute(f"SELECT COUNT(*) FROM {_quote(cls.__table__)}{sql}", params).fetchone()[0]
+
+    # --- yozish ---
+
+    def _values(self, names):
+        fields = self.__fields__
+        return [fields[name].to_db(getattr(self, name)) for name in names]
+
+    @classmethod
+    def create(cls, **values):
+        obj = cls(**values)
+        obj.save()
+        return obj
+
+    def save(self):
+        """Yangi bo'lsa INSERT, aks holda UPDATE."""
+        pk = self.__pk__
+        database = self.__database__
+        if getattr(self, pk) is None:
+            cursor = database.execute(self._insert_sql, self._values(self._insert_fields))
+            setattr(self, pk, cursor.lastrowid)
+        else:
+            cursor = database.execute(self._update_sql, self._values(self._insert_fields + (pk,)))
+            if cursor.rowcount == 0:
+                database.execute(self._insert_pk_sql, self._values(self._columns))
+        return self
+
+    def delete(self):
+        self.__database__.execute(self._delete_sql, (getattr(self, self.__pk__),))
+
+    @classmethod
+    def bulk_create(cls, objects, batch_size=None):
+        """
+        Ko'p yozuvni bitta tranzaksiyada `executemany` bilan qo'shadi
+        (har bir yozuv uchun alohida commit/fsync bo'lmaydi). Yangi id'lar obyektlarga yoziladi.
+        """
+        objects = list(objects)
+        pk = cls.__pk__
+        new = [obj for obj in objects if getattr(obj, pk) is None]
+        existing = [obj for obj in objects if getattr(obj, pk) is not None]
+        batch_size = batch_size or len(objects) or 1
+        with cls.__database__.transaction() as conn:
+            for start in range(0, len(existing), batch_size):
+                conn.executemany(cls._insert_pk_sql,
+                                 [obj._values(cls._columns) for obj in existing[start:start + batch_size]])
+            for start in range(0, len(new), batch_size):
+                batch = new[start:start + batch_size]
+                conn.executemany(cls._insert_sql, [obj._values(cls._insert_fields) for obj in batch])
+                if cls.__fields__[pk].sql_type == "INTEGER":
+                    # BEGIN IMMEDIATE: boshqa yozuvchi yo'q, rowid'lar ketma-ket beriladi
+                    last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    for offset, obj in enumerate(batch, start=last - len(batch) + 1):
+                        setattr(obj, pk, offset)
+        return objects
+
+    @classmethod
+    def bulk_update(cls, objects, fields=None, batch_size=None):
+        """Berilgan maydonlarni (default - hammasi) bitta tranzaksiyada `executemany` bilan yangilaydi."""
+        objects = list(objects)
+        pk = cls.__pk__
+        names = tuple(fields) if fields else cls._insert_fields
+        for name in names:
+            if name not in cls.__fields__ or name == pk:
+                raise TypeError(f"{cls.__name__}: '{name}' maydonini yangilab bo'lmaydi")
+        table = _quote(cls.__table__)
+        sql = (f"UPDATE {table} SET {', '.join(f'{_quote(n)} = ?' for n in names)} "
+               f"WHERE {_quote(pk)} = ?")
+        batch_size = batch_size or len(objects) or 1
+        with cls.__database__.transaction() as conn:
+            for start in range(0, len(objects), batch_size):
+                conn.executemany(sql, [obj._values(names + (pk,)) for obj in objects[start:start + batch_size]])
+        return len(objects)
+
+
+def create_tables(*models):
+    for model in models:
+        model.create_table()
@@ -3,8 +3,11 @@ from MOJIZA.engine.server import run_server
 from MOJIZA.engine.routing import load_app_routes, router,add_static_routes
 from MOJIZA.engine.p_gen import create_project_structure
 from MOJIZA.engine.server import get_generated_apps
+from MOJIZA.static.manifest import static_url
 import os
+import time
 from urllib.parse import urljoin
+from MOJIZA.engine.discovery import EXCLUDE_DIRS
 
 BASE_URL = os.environ.get("MOJIZA_BASE_URL", "http://localhost:5000")
 DEFAULT_NAME = "config"
@@ -30,49 +33,114 @@ def Static(request, filename: str) -> str:
     """
     Fayl nomidan to‘liq static URL hosil qiladi:
       Static(request, "mojiza.png")
-      -> "http://site.com/static/mojiza.png"
+      -> "http://site.com/static/mojiza.3f9a1c2b4d5e.png"
+    Nomdagi hash fayl mazmunidan olinadi (manifest orqali).
     """
     base = HostName(request)
     # urljoin bilan slash’larni to‘g‘ri bog‘laymiz
-    return urljoin(f"{base}/", f"static/{filename}")
+    return urljoin(f"{base}/", static_url(filename).lstrip("/"))
 
 
 
+def print_startup_report(timings):
+    """Ishga tushish bosqichlari vaqti (ms): qaysi bosqich sekinligini ko'rish uchun."""
+    ms = lambda seconds: f"{seconds * 1000:.1f} ms"
+    print(f"INFO:MOJIZA: startup {ms(timings['total'])}: "
+          f"discovery {ms(timings['discovery'])} ({timings['discovery_source']}), "
+          f"imports {ms(timings['imports'])} ({len(timings['apps'])} app), "
+          f"routes {ms(timings['routes'])}, static {ms(timings['static'])}")
+    slowest = sorted(timings["apps"].items(), key=lambda item: item[1], reverse=True)[:5]
+    if slowest:
+        print("INFO:MOJIZA: eng sekin import'lar: " + ", ".join(f"{name} {ms(t)}" for name, t in slowest))
+
+
 def main():
     parser = argparse.ArgumentParser(description="MOJIZA Framework Boshqaruv Paneli")
 
-    parser.add_argument("command", nargs="?", help="commands: run_script | generate")
+    parser.add_argument("command", nargs="?", help="commands: run_script | generate | collectstatic | bench")
     parser.add_argument("--port", type=int, default=8000, help="Server qaysi portda ishlasin? Default=8000")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel ishlovchi threadlar soni (run_script bilan). Default=1")
+    parser.add_argument("--processes", type=int, default=1, help="Pre-fork rejimida worker jarayonlar soni. Default=1")
+    parser.add_argument("--engine", choices=["thread", "asyncio"], default="thread", help="Server dvigateli: thread yoki asyncio. Default=thread")
+    parser.add_argument("--backlog", type=int, default=128, help="Kutayotgan ulanishlar navbati hajmi. Default=128")
+    parser.add_argument("--keep-alive", type=int, default=5, help="Bo'sh keep-alive ulanish timeout'i (soniya), 0 - o'chirish. Default=5")
+    parser.add_argument("--max-requests", type=int, default=100, help="Bitta ulanishdagi so'rovlar chegarasi. Default=100")
+    parser.add_argument("--compress-level", type=int, default=6, help="Dinamik javoblarni gzip/brotli siqish darajasi (1-9), 0 - o'chirish. Default=6")
+    parser.add_argument("--max-body-size", type=int, default=1024, help="So'rov body'sining eng katta hajmi (MB), kattasi 413 bilan rad etiladi. Default=1024")
+    parser.add_argument("--metrics", action="store_true", help="So'rov metrikalarini yig'ish va /__metrics (Prometheus) route'ini yoqish")
+    parser.add_argument("--exclude", type=str, default="", help="App qidirishda o'tkazib yuboriladigan qo'shimcha papkalar (vergul bilan), masalan build,dist,media")
+    parser.add_argument("--import-workers", type=int, default=None, help="urls.py modullarini parallel import qiluvchi thread'lar soni, 1 - ketma-ket. Default=min(8, app'lar soni)")
+    parser.add_argument("--reload", action="store_true", help="Dev rejim: o'zgargan app'ni serverni to'xtatmasdan qayta yuklash")
+    parser.add_argument("--static-cache", type=str, default="no-cache", help="Static fayllar uchun Cache-Control qiymati. Default='no-cache'")
+    parser.add_argument("--scenarios", type=str, default="static,view,table,404", help="bench: ssenariylar (vergul bilan). Default=static,view,table,404")
+    parser.add_argument("--concurrency", type=int, default=8, help="bench: parallel ulanishlar soni. Default=8")
+    parser.add_argument("--duration", type=float, default=5.0, help="bench: har bir ssenariy davomiyligi (soniya). Default=5")
+    parser.add_argument("--json", type=str, default=None, help="bench: natijani JSON faylga yozish")
+    parser.add_argument("--baseline", type=str, default=None, help="bench: saqlangan JSON natija bilan solishtirish")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="bench: ruxsat etilgan regressiya ulushi. Default=0.10")
     parser.add_argument("--v", action="store_true", help="Show framework version")
     parser.add_argument("-n", "--name", type=str, default=DEFAULT_NAME, help="Yangi loyiha nomi (generate bilan)")
 
     args = parser.parse_args()
 
     if args.command == "run_script":
-        apps = get_generated_apps()
+        started = time.perf_counter()
+        timings = {}
+        exclude_dirs = EXCLUDE_DIRS | {name.strip() for name in args.exclude.split(",") if name.strip()}
+        routes = load_app_routes(".", exclude_dirs=exclude_dirs, workers=args.import_workers, timings=timings)
+        apps = get_generated_apps(".", exclude_dirs)
         if apps:
             print(f"INFO:MOJIZA: apps: {', '.join(apps)}")
         else:
             print("INFO:MOJIZA: apps: No generated apps found.")
 
-        routes = load_app_routes(".")
-        add_static_routes(router, static_url_path="/static", static_folder="STATIC")
+        static_start = time.perf_counter()
+        add_static_routes(router, static_url_path="/static", static_folder="STATIC",
+                          cache_control=args.static_cache)
+        timings["static"] = time.perf_counter() - static_start
+        timings["total"] = time.perf_counter() - started
+        print_startup_report(timings)
 
         for route in routes:
             print(f"Route added: {route['base_url']} -> {route['app_name']} (namespace: {route['space_name']})")
 
+        if args.reload:
+            if args.processes > 1:
+                print("⚠️ --reload pre-fork rejimida (--processes > 1) ishlamaydi, o'chirildi")
+            else:
+                from MOJIZA.engine.reloader import start_reloader
+                start_reloader(router, ".", exclude_dirs)
+
         print(f"Server started on http://localhost:{args.port}")
         print("Available routes:")
         for r in router.routes:
             print(f" -> {r.route}")
-        run_server(port=args.port)
+        run_server(port=args.port, workers=args.workers, backlog=args.backlog, processes=args.processes,
+                   engine=args.engine, keep_alive_timeout=args.keep_alive,
+                   max_keep_alive_requests=args.max_requests, compress_level=args.compress_level,
+                   metrics_path="/__metrics" if args.metrics else None,
+                   max_body_size=args.max_body_size * 1024 * 1024)
 
     elif args.command == "generate":
         create_project_structure(args.name)
 
+    elif args.command == "collectstatic":
+        from MOJIZA.static.collect import collect_static
+        written, skipped, names = collect_static("STATIC")
+        print(f"INFO:MOJIZA: collectstatic: {written} ta siqilgan nusxa yozildi, {skipped} ta o'zgarmagan")
+        print(f"INFO:MOJIZA: manifest: {names} ta fayl (STATIC/staticfiles.json)")
+
+    elif args.command == "bench":
+        from MOJIZA.bench.load import main as bench_main
+        code = bench_main(args.scenarios, concurrency=args.concurrency, duration=args.duration,
+                          engine=args.engine, workers=max(args.workers, args.concurrency),
+                          json_path=args.json, baseline_path=args.baseline, tolerance=args.tolerance)
+        if code:
+            raise SystemExit(code)
+
     elif args.command:
         print(f"⚠️ Noma'lum komanda: '{args.command}'")
-        print("✅ Foydalanish:\n  python3 runer.py run_script\n  python3 runer.py generate -n yourproject")
+        print("✅ Foydalanish:\n  python3 runer.py run_script\n  python3 runer.py generate -n yourproject\n  python3 runer.py collectstatic\n  python3 runer.py bench")
 
     else:
         print("ℹ️ Komanda kiriting. Masalan: `--v`, `run_script`, yoki `generate`")
\ No newline at end of file
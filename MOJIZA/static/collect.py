@@ -0,0 +1,104 @@
+"""
+`collectstatic` buyrug'i: deploy paytida static papkadagi matnli fayllar
+(css, js, svg, json ...) yoniga oldindan siqilgan `.gz` (va `brotli` o'rnatilgan
+bo'lsa `.br`) nusxalarini yozadi. Server so'rovda `Accept-Encoding` ga qarab mos
+nusxani tanlaydi, shuning uchun siqish har so'rovda emas, bir marta bajariladi.
+Hash'li static nomlar manifesti (`staticfiles.json`) ham shu yerda yoziladi.
+
+    python app.py collectstatic
+"""
+import gzip
+import logging
+import os
+import tempfile
+
+from MOJIZA.engine.compress import brotli, is_compressible
+from MOJIZA.static.files import guess_type
+from MOJIZA.static.manifest import MANIFEST_NAME, get_manifest
+
+logger = logging.getLogger("MOJIZA.static.collect")
+
+ENCODED_SUFFIXES = {".gz": "gzip", ".br": "br"}
+
+# Juda kichik fayllarni siqish foyda bermaydi
+MIN_SIZE = 256
+
+
+def _compress_gzip(data, level):
+    # mtime=0 - bir xil fayl uchun bir xil natija (qayta yig'ishda o'zgarmaydi)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_brotli(data, level):
+    return brotli.compress(data, quality=min(level + 2, 11))
+
+
+def _write_atomic(path, data, st):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp 0600 bilan yaratadi; ruxsatlar manba fayldagidek bo'lsin
+        os.chmod(tmp, st.st_mode & 0o777)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Nusxa manba bilan bir xil vaqtga ega: eskirganini server mtime orqali aniqlaydi
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def collect_static(static_root="STATIC", level=9, min_size=MIN_SIZE):
+    """
+    Siqilgan nusxalarni va hash'li nomlar manifestini (`staticfiles.json`) yozadi.
+    O'zgarmagan fayllar o'tkazib yuboriladi.
+    (yozilgan, o'tkazilgan nusxalar, manifestdagi fayllar) sonini qaytaradi.
+    """
+    encoders = [(".gz", _compress_gzip)]
+    if brotli is not None:
+        encoders.append((".br", _compress_brotli))
+    else:
+        logger.info("brotli o'rnatilmagan, faqat .gz nusxalar yoziladi")
+
+    written = skipped = 0
+    for dirpath, _, filenames in os.walk(static_root):
+        for filename in filenames:
+            if os.path.splitext(filename)[1] in ENCODED_SUFFIXES or filename == MANIFEST_NAME:
+                continue
+            path = os.path.join(dirpath, filename)
+            if not is_compressible(guess_type(path)):
+                continue
+            st = os.stat(path)
+            if st.st_size < min_size:
+                continue
+
+            data = None
+            for suffix, encode in encoders:
+                target = path + suffix
+                try:
+                    if os.stat(target).st_mtime_ns == st.st_mtime_ns:
+                        skipped += 1
+                        continue
+                except OSError:
+                    pass
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                encoded = encode(data, level)
+                if len(encoded) >= len(data):
+                    # Siqish foyda bermadi, eski nusxa qolmasin
+                    try:
+                        os.unlink(target)
+                    except OSError:
+                        pass
+                    continue
+                _write_atomic(target, encoded, st)
+                written += 1
+                logger.debug(f"{target}: {len(data)} -> {len(encoded)} bytes")
+
+    names = get_manifest(static_root).build()
+    logger.info(f"collectstatic: {written} written, {skipped} unchanged, {len(names)} in manifest")
+    return written, skipped, len(names)
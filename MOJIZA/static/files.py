@@ -0,0 +1,327 @@
+"""
+Static fayllarni xotiraga o'qimasdan yuborish.
+
+View `FileResponse` qaytarsa, server faylni `socket.sendfile` (Linux'da
+`os.sendfile`, zero-copy) orqali to'g'ridan-to'g'ri socketga yuboradi; fayl
+heap'ga to'liq o'qilmaydi. `Range: bytes=...` so'rovlari (video, uzilgan
+yuklab olishni davom ettirish) 206 javobi bilan qo'llab-quvvatlanadi.
+
+Fayllar haqidagi ma'lumot (hajm, mtime, content-type, ETag) xotiradagi
+indeksda saqlanadi; `If-None-Match` / `If-Modified-Since` so'rovlariga 304
+hech qanday fayl I/O'siz qaytariladi. `collectstatic` yozgan `.br`/`.gz`
+nusxalar `Accept-Encoding` ga qarab tanlanadi.
+"""
+import os
+import logging
+import mimetypes
+from email.utils import formatdate, parsedate_tz, mktime_tz
+from urllib.parse import unquote
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+from MOJIZA.engine.pagecache import etag_matches
+from MOJIZA.engine.compress import choose_encoding
+from MOJIZA.static.manifest import IMMUTABLE_CACHE_CONTROL, get_manifest
+
+logger = logging.getLogger("MOJIZA.static.files")
+
+
+class FileResponse:
+    __slots__ = ("path", "content_type", "status", "offset", "length", "headers")
+
+    def __init__(self, path, content_type=None, status=200, offset=0, length=None, headers=None):
+        self.path = path
+        self.content_type = content_type or guess_type(path)
+        self.status = status
+        self.offset = offset
+        self.length = os.path.getsize(path) - offset if length is None else length
+        self.headers = headers or {}
+
+
+def guess_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding == "gzip":
+        return "application/gzip"
+    if encoding:
+        return "application/octet-stream"
+    return content_type or "application/octet-stream"
+
+
+def parse_range(header, size):
+    """
+    `Range: bytes=...` sarlavhasini (offset, length) ga aylantiradi.
+    None - sarlavha yo'q yoki tushunarsiz (butun fayl yuboriladi),
+    False - diapazonni qondirib bo'lmaydi (416).
+    Bir nechta diapazon so'ralsa, butun fayl yuboriladi.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, sep, end = header[6:].strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not start:
+            suffix = int(end)
+            if suffix <= 0:
+                return False
+            start = max(size - suffix, 0)
+            end = size - 1
+        else:
+            start = int(start)
+            end = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        return False
+    end = min(end, size - 1)
+    return start, end - start + 1
+
+
+# Oldindan siqilgan nusxalar (collectstatic), afzallik tartibida
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class StaticFile:
+    """Indeksdagi bitta fayl haqida ma'lumot."""
+    __slots__ = ("path", "size", "mtime", "content_type", "etag", "last_modified", "encodings")
+
+    def __init__(self, path, st):
+        self.path = path
+        self.size = st.st_size
+        self.mtime = int(st.st_mtime)
+        self.content_type = guess_type(path)
+        self.etag = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+        self.last_modified = formatdate(st.st_mtime, usegmt=True)
+        self.encodings = None
+
+
+class EncodedFile:
+    """Faylning siqilgan nusxasi (`style.css.gz`); ETag asl fayldan farq qiladi."""
+    __slots__ = ("path", "size", "etag")
+
+    def __init__(self, path, size, etag):
+        self.path = path
+        self.size = size
+        self.etag = etag
+
+
+class StaticIndex:
+    """
+    Static papka indeksi: nisbiy yo'l -> StaticFile. Ishga tushishda papka bir
+    marta aylanib chiqiladi, keyin watchdog hodisalari bo'yicha yangilanadi,
+    shuning uchun so'rov paytida stat/mimetypes chaqirilmaydi.
+    """
+
+    def __init__(self, directory, watch=True, manifest=None):
+        self.directory = directory
+        self.watch = watch
+        self.manifest = manifest
+        self._files = {}
+        self._observer = None
+        self._pid = None
+        self.build()
+
+    def build(self):
+        files = {}
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    files[self._key(path)] = self._entry(path, os.stat(path))
+                except OSError:
+                    pass
+        self._files = files
+        logger.debug(f"Static index: {len(files)} files in {self.directory}")
+
+    def _key(self, path):
+        return os.path.relpath(path, self.directory).replace(os.sep, "/")
+
+    def get(self, key):
+        if self.watch and self._pid != os.getpid():
+            # Observer thread'i fork'dan keyin yo'qoladi, har bir jarayon o'zinikini ishga tushiradi
+            self._start_observer()
+        return self._files.get(key)
+
+    def add(self, path, st):
+        entry = self._entry(path, st)
+        self._files[self._key(path)] = entry
+        return entry
+
+    @staticmethod
+    def _entry(path, st):
+        entry = StaticFile(path, st)
+        for encoding, suffix in ENCODINGS:
+            try:
+                encoded = os.stat(path + suffix)
+            except OSError:
+                continue
+            # collectstatic nusxaga manba mtime'ini beradi; farq qilsa nusxa eskirgan
+            if encoded.st_mtime_ns != st.st_mtime_ns:
+                continue
+            if entry.encodings is None:
+                entry.encodings = {}
+            entry.encodings[encoding] = EncodedFile(path + suffix, encoded.st_size,
+                                                    f'{entry.etag[:-1]}-{encoding}"')
+        return entry
+
+    def discard(self, path):
+        key = self._key(path)
+        self._files.pop(key, None)
+        if self.manifest is not None:
+            self.manifest.discard(key)
+
+    def clear(self):
+        self._files = {}
+        if self.manifest is not None:
+            self.manifest.clear()
+
+    def _start_observer(self):
+        self._pid = os.getpid()
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_IndexEventHandler(self), path=self.directory, recursive=True)
+            observer.start()
+        except OSError as e:
+            logger.warning(f"Static papkani kuzatib bo'lmadi ({self.directory}): {e}")
+            return
+        self._observer = observer
+        # Observer ishga tushguncha o'zgargan fayllar bo'lishi mumkin
+        self.build()
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            if event.event_type in ("deleted", "moved"):
+                self.index.clear()
+            return
+        # Yozuv o'chiriladi, keyingi so'rovda fayl qayta stat qilinadi
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if not path:
+                continue
+            self.index.discard(path)
+            base, suffix = os.path.splitext(path)
+            if suffix in (".gz", ".br"):
+                # Siqilgan nusxa o'zgardi - asl faylning yozuvi ham yangilansin
+                self.index.discard(base)
+
+
+def not_modified(request, entry, etag):
+    """`If-None-Match` (ustuvor) yoki `If-Modified-Since` bo'yicha 304 kerakmi."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            return entry.mtime <= mktime_tz(parsedate_tz(if_modified_since))
+        except (TypeError, ValueError, OverflowError):
+            return False
+    return False
+
+
+def range_allowed(request, entry, etag):
+    """`If-Range` mos kelmasa, Range e'tiborsiz qoldiriladi (butun fayl yuboriladi)."""
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    return if_range == etag or if_range == entry.last_modified
+
+
+class StaticFiles:
+    """
+    Static papkadan fayl beruvchi view: `router.add_route("/static/", StaticFiles("STATIC"), exact=False)`.
+
+    cache_control - javobga qo'shiladigan `Cache-Control` qiymati (None - qo'shilmaydi);
+    watch         - indeksni watchdog orqali yangilab turish;
+    hashed        - `Static()` bergan hash'li nomlarni (`app.<hash>.css`) bir yillik
+                    `immutable` kesh sarlavhasi bilan berish.
+    """
+
+    def __init__(self, directory="STATIC", url_path="/static", cache_control="no-cache", watch=True,
+                 hashed=True):
+        self.directory = os.path.abspath(directory)
+        self.url_path = url_path.rstrip("/")
+        self.cache_control = cache_control
+        self.manifest = get_manifest(self.directory) if hashed else None
+        self.index = StaticIndex(self.directory, watch=watch, manifest=self.manifest)
+
+    def resolve(self, rel_path):
+        """Nisbiy yo'ldan (papka tashqarisiga chiqmagan holda) fayl yo'lini topadi."""
+        file_path = os.path.abspath(os.path.join(self.directory, rel_path))
+        if file_path != self.directory and not file_path.startswith(self.directory + os.sep):
+            return None
+        return file_path
+
+    def lookup(self, key):
+        """Indeksdan yozuvni topadi; topilmasa fayl tizimidan tekshiradi (403/404 uchun status qaytaradi)."""
+        entry = self.index.get(key)
+        if entry is not None:
+            return entry
+        file_path = self.resolve(key)
+        if file_path is None:
+            return 403
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return 404
+        if not os.path.isfile(file_path):
+            return 403
+        return self.index.add(file_path, st)
+
+    def __call__(self, request):
+        path = request.path
+        key = unquote(path[len(self.url_path):].lstrip("/"))
+        entry = self.index.get(key)
+        if entry is None and self.manifest is not None:
+            original = self.manifest.original(key)
+            if original is not None:
+                entry = self.lookup(original)
+                if not isinstance(entry, int):
+                    # Hash'li nom mazmun bilan birga o'zgaradi: abadiy keshlash xavfsiz
+                    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+                    return self.entry_response(request, entry, headers)
+        if entry is None:
+            entry = self.lookup(key)
+        if entry == 403:
+            return 403, "text/plain", b"Forbidden"
+        if entry == 404:
+            return 404, "text/plain", b"File not found"
+        return self.entry_response(request, entry)
+
+    def entry_response(self, request, entry, headers=None):
+        headers = dict(headers or {})
+        target = entry
+        if entry.encodings:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = choose_encoding(request.headers.get("Accept-Encoding"), entry.encodings)
+            if encoding is not None:
+                target = entry.encodings[encoding]
+                headers["Content-Encoding"] = encoding
+        headers["ETag"] = target.etag
+        headers["Last-Modified"] = entry.last_modified
+        if self.cache_control:
+            headers.setdefault("Cache-Control", self.cache_control)
+        if not_modified(request, entry, target.etag):
+            return 304, entry.content_type, b"", headers
+        return self.file_response(request, target.path, target.size, entry.content_type, headers,
+                                  use_range=range_allowed(request, entry, target.etag))
+
+    def file_response(self, request, file_path, size, content_type=None, headers=None, use_range=True):
+        headers = dict(headers or {})
+        headers["Accept-Ranges"] = "bytes"
+        byte_range = parse_range(request.headers.get("Range"), size) if use_range else None
+        if byte_range is False:
+            headers["Content-Range"] = f"bytes */{size}"
+            return 416, "text/plain", b"", headers
+        if byte_range is None:
+            return FileResponse(file_path, content_type, 200, 0, size, headers)
+        offset, length = byte_range
+        headers["Content-Range"] = f"bytes {offset}-{offset + length - 1}/{size}"
+        return FileResponse(file_path, content_type, 206, offset, length, headers)
@@ -0,0 +1,175 @@
+"""
+Kontent hash'li static URL'lar.
+
+`Static("app.css")` -> `/static/app.3f9a1c2b4d5e.css`. Hash fayl mazmunidan
+olinadi, shuning uchun fayl o'zgarsa URL ham o'zgaradi va brauzer hash'li
+nomni bir yilgacha (`immutable`) keshlay oladi.
+
+Manifest (`asl nom -> hash'li nom`) xotirada saqlanadi: `collectstatic` yozgan
+`staticfiles.json` dan yuklanadi, unda yo'q fayllar uchun hash birinchi
+so'ralganda bir marta hisoblanadi. Har bir yozuv faylning hajmi va mtime'i
+bilan saqlanadi: yuklashda `collectstatic` dan keyin o'zgargan fayllarning
+yozuvlari tashlab yuboriladi. Ishlash paytida fayl tizimiga murojaat qilinmaydi —
+o'zgargan fayl yozuvini static indeks watcher'i `discard()` bilan o'chiradi
+va hash keyingi so'rovda qaytadan olinadi.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+
+logger = logging.getLogger("MOJIZA.static.manifest")
+
+MANIFEST_NAME = "staticfiles.json"
+MANIFEST_VERSION = 2
+HASH_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_HASHED_RE = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[^./]+)?$" % HASH_LENGTH)
+
+
+def file_hash(path):
+    h = hashlib.blake2b(digest_size=HASH_LENGTH // 2)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hashed_name(name, digest):
+    """`css/app.css` + hash -> `css/app.<hash>.css`."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest}{ext}"
+
+
+class StaticManifest:
+    def __init__(self, directory="STATIC"):
+        self.directory = os.path.abspath(directory)
+        # asl nom -> (hash'li nom, hajm, mtime_ns)
+        self._names = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST_NAME), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self._names = {}
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"{MANIFEST_NAME} o'qilmadi: {e}")
+            self._names = {}
+            return
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            # Eski format (hajm/mtime'siz): yozuvlarni tekshirib bo'lmaydi, hash'lar qaytadan olinadi
+            logger.warning(f"{MANIFEST_NAME} eski formatda, `collectstatic` ni qayta ishga tushiring")
+            self._names = {}
+            return
+        names = {}
+        stale = 0
+        for name, info in data.get("files", {}).items():
+            st = self._stat(name)
+            if st is None or st.st_size != info["size"] or st.st_mtime_ns != info["mtime"]:
+                stale += 1
+                continue
+            names[name] = (info["hashed"], info["size"], info["mtime"])
+        if stale:
+            logger.warning(f"{MANIFEST_NAME}: {stale} ta fayl collectstatic'dan keyin o'zgargan, hash'lari qayta hisoblanadi")
+        self._names = names
+
+    def _stat(self, name):
+        path = os.path.abspath(os.path.join(self.directory, name))
+        if not path.startswith(self.directory + os.sep):
+            return None
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def _hashed(self, name):
+        """Hash'li nom: manifestdan, yo'q bo'lsa fayldan bir marta hisoblanadi; fayl yo'q bo'lsa None."""
+        entry = self._names.get(name)
+        if entry is not None:
+            return entry[0]
+        st = self._stat(name)
+        if st is None:
+            return None
+        try:
+            hashed = hashed_name(name, file_hash(os.path.join(self.directory, name)))
+        except OSError:
+            return None
+        self._names[name] = (hashed, st.st_size, st.st_mtime_ns)
+        return hashed
+
+    def get(self, name):
+        """Hash'li nomni qaytaradi; fayl topilmasa - asl nomning o'zi."""
+        hashed = self._hashed(name)
+        return name if hashed is None else hashed
+
+    def original(self, hashed):
+        """Hash'li nomdan asl nomni topadi; hash manifestdagi (joriy) hash'ga mos kelmasa - None."""
+        m = _HASHED_RE.match(hashed)
+        if m is None:
+            return None
+        name = m.group("stem") + (m.group("ext") or "")
+        if self._hashed(name) != hashed:
+            return None
+        return name
+
+    def discard(self, name):
+        """Fayl o'zgardi yoki o'chirildi: hash keyingi so'rovda qaytadan hisoblanadi."""
+        self._names.pop(name, None)
+
+    def clear(self):
+        self._names = {}
+
+    def build(self):
+        """Barcha fayllar uchun hash'larni hisoblab, `staticfiles.json` ga yozadi."""
+        names = {}
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename == MANIFEST_NAME or filename.endswith((".gz", ".br")):
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                # stat hash'dan oldin: hisoblash paytida fayl o'zgarsa, yozuv eskirgan chiqadi
+                st = os.stat(path)
+                names[name] = (hashed_name(name, file_hash(path)), st.st_size, st.st_mtime_ns)
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "files": {name: {"hashed": hashed, "size": size, "mtime": mtime}
+                      for name, (hashed, size, mtime) in names.items()},
+        }
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, os.path.join(self.directory, MANIFEST_NAME))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._names = names
+        return names
+
+
+_manifests = {}
+
+
+def get_manifest(directory="STATIC"):
+    """Har bir static papka uchun bitta umumiy manifest."""
+    key = os.path.abspath(directory)
+    manifest = _manifests.get(key)
+    if manifest is None:
+        manifest = _manifests.setdefault(key, StaticManifest(key))
+    return manifest
+
+
+def static_url(filename, directory="STATIC", url_path="/static"):
+    return f"{url_path}/{get_manifest(directory).get(filename.lstrip('/'))}"
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+
+from MOJIZA.engine.aserver import AsyncServer
+from MOJIZA.engine.routing import Router
+
+closed = {}
+
+
+def tracked(name, chunks, fail=False, forever=False):
+    closed[name] = threading.Event()
+
+    def generate():
+        try:
+            for chunk in chunks:
+                yield chunk
+            if fail:
+                raise RuntimeError("render failed")
+            while forever:
+                yield b"x" * 65536
+        finally:
+            closed[name].set()
+    return generate()
+
+
+async def atracked(name, forever=False):
+    closed[name] = threading.Event()
+    try:
+        yield b"a"
+        while forever:
+            yield b"x" * 65536
+            await asyncio.sleep(0)
+    finally:
+        closed[name].set()
+
+
+def make_router():
+    router = Router()
+    router.add_route("/ok", lambda: tracked("ok", [b"bir,", "ikki"]))
+    router.add_route("/fail-first", lambda: tracked("fail-first", [], fail=True))
+    router.add_route("/fail-later", lambda: tracked("fail-later", [b"bir,"], fail=True))
+    router.add_route("/forever", lambda: tracked("forever", [], forever=True))
+    router.add_route("/aforever", lambda: atracked("aforever", forever=True))
+    router.add_route("/hello", lambda: (200, "text/plain", "hello"))
+    return router
+
+
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, value = line.decode().split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+    body = b""
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            line = await reader.readline()
+            if not line:
+                return status, headers, body, False
+            size = int(line.strip(), 16)
+            data = await reader.readexactly(size + 2)
+            if not size:
+                return status, headers, body, True
+            body += data[:size]
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers, body, True
+
+
+def run(scenario):
+    async def main():
+        server = AsyncServer(make_router(), port=0, host="127.0.0.1", workers=2)
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            try:
+                return await scenario(reader, writer)
+            finally:
+                writer.close()
+        finally:
+            await server.shutdown()
+    return asyncio.run(main())
+
+
+def get(path):
+    return f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode()
+
+
+def test_stream_is_chunked():
+    async def scenario(reader, writer):
+        writer.write(get("/ok") + get("/hello"))
+        status, headers, body, complete = await read_response(reader)
+        assert (status, body, complete) == (200, b"bir,ikki", True)
+        assert headers["transfer-encoding"] == "chunked"
+        assert (await read_response(reader))[2] == b"hello"
+    run(scenario)
+    assert closed["ok"].is_set()
+
+
+def test_error_before_first_chunk_is_500():
+    async def scenario(reader, writer):
+        writer.write(get("/fail-first") + get("/hello"))
+        status, headers, body, complete = await read_response(reader)
+        assert (status, complete) == (500, True)
+        assert body.startswith(b"500 Internal Server Error")
+        assert (await read_response(reader))[2] == b"hello"
+    run(scenario)
+    assert closed["fail-first"].is_set()
+
+
+def test_error_after_headers_drops_connection():
+    async def scenario(reader, writer):
+        writer.write(get("/fail-later"))
+        status, _, body, complete = await read_response(reader)
+        assert (status, body, complete) == (200, b"bir,", False)
+    run(scenario)
+
+
+def test_generator_closed_when_client_disconnects():
+    for path in ("/forever", "/aforever"):
+        async def scenario(reader, writer):
+            writer.write(get(path))
+            await reader.readline()
+            writer.transport.abort()
+            for _ in range(200):
+                if closed[path.lstrip("/")].is_set():
+                    return
+                await asyncio.sleep(0.01)
+        run(scenario)
+        assert closed[path.lstrip("/")].is_set(), path
+
@@ -0,0 +1,28 @@
+import gc
+import http.client
+import logging
+import socket
+
+import pytest
+
+from MOJIZA.bench.load import start_server
+
+
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_stop_closes_open_connections(engine, caplog):
+    port, stop = start_server(engine, workers=2)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", "/__bench__/missing")
+    assert conn.getresponse().read()
+    idle = socket.create_connection(("127.0.0.1", port), timeout=5)
+
+    with caplog.at_level(logging.ERROR, logger="asyncio"):
+        stop()
+        gc.collect()
+    assert not [r for r in caplog.records if r.name == "asyncio"]
+    try:
+        assert idle.recv(1) == b""
+    except ConnectionResetError:
+        pass
+    idle.close()
+    conn.close()
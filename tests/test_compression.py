@@ -0,0 +1,46 @@
+import gzip
+
+from MOJIZA.engine.compress import Compression
+from MOJIZA.engine.middleware import CompressionMiddleware, MiddlewareStack
+from MOJIZA.engine.routing import Router
+
+BODY = b"<p>salom</p>" * 200
+
+
+class FakeRequest:
+    command = "GET"
+    headers = {"Accept-Encoding": "gzip"}
+
+
+def core(request, route, path_params):
+    return 200, "text/html", BODY, None
+
+
+def make_router(level):
+    compression = Compression(level=level)
+    stack = MiddlewareStack([CompressionMiddleware(compression)])
+    stack.set_core(core)
+    router = Router(middleware=stack)
+    router.add_route("/", lambda: None)
+    return router, compression
+
+
+def respond(router):
+    route, params = router.match("/")
+    return route.chain(FakeRequest(), route, params)
+
+
+def test_level_enabled_after_route_registration():
+    router, compression = make_router(level=0)
+    assert respond(router)[2] == BODY
+    compression.level = 6
+    _, _, content, headers = respond(router)
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(content) == BODY
+
+
+def test_level_disabled_after_route_registration():
+    router, compression = make_router(level=6)
+    assert respond(router)[3]["Content-Encoding"] == "gzip"
+    compression.level = 0
+    assert respond(router)[2] == BODY
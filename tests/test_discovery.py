@@ -0,0 +1,57 @@
+import logging
+
+from MOJIZA.engine import discovery
+from MOJIZA.engine.discovery import EXCLUDE_DIRS, discover_apps, walk_apps
+
+
+def make_app(root, *parts):
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True)
+    (path / "urls.py").write_text("")
+    (path / "views.py").write_text("")
+    return path
+
+
+def test_apps_with_common_directory_names_are_found(tmp_path):
+    for name in ("blog", "build", "dist", "env", "media", "migrations", "STATIC"):
+        make_app(tmp_path, name)
+    apps, _ = walk_apps(str(tmp_path))
+    assert sorted(app.name for app in apps) == ["STATIC", "blog", "build", "dist", "env", "media", "migrations"]
+
+
+def test_non_app_directories_are_skipped(tmp_path, caplog):
+    make_app(tmp_path, "blog")
+    for parts in (("venv", "lib"), (".venv", "lib"), (".git", "hooks"), ("__pycache__",),
+                  ("node_modules", "pkg"), ("lib", "site-packages", "pkg"), (".mojiza_cache", "discovery"),
+                  ("mojiza.egg-info",)):
+        make_app(tmp_path, *parts)
+    with caplog.at_level(logging.DEBUG, logger="MOJIZA.engine.discovery"):
+        apps, dir_mtimes = walk_apps(str(tmp_path))
+    assert [app.name for app in apps] == ["blog"]
+    assert not any(part in path for path in dir_mtimes for part in ("venv", ".git", "node_modules", "site-packages"))
+    assert "o'tkazib yuborildi" in caplog.text and ".git" in caplog.text
+
+
+def test_extra_excludes(tmp_path):
+    make_app(tmp_path, "blog")
+    make_app(tmp_path, "build")
+    apps = discover_apps(str(tmp_path), EXCLUDE_DIRS | {"build"}, use_manifest=False, refresh=True)
+    assert [app.name for app in apps] == ["blog"]
+
+
+def test_manifest_is_reused(tmp_path):
+    make_app(tmp_path, "blog")
+    first = discover_apps(str(tmp_path), refresh=True)
+    assert (tmp_path / ".mojiza_cache" / "discovery" / "apps.json").exists()
+
+    discovery._discovered.clear()
+    timings = {}
+    second = discover_apps(str(tmp_path), timings=timings)
+    assert timings["discovery_source"] == "manifest"
+    assert [app.path for app in second] == [app.path for app in first]
+
+    make_app(tmp_path, "shop")
+    discovery._discovered.clear()
+    third = discover_apps(str(tmp_path), timings=timings)
+    assert timings["discovery_source"] == "walk"
+    assert sorted(app.name for app in third) == ["blog", "shop"]
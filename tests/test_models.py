@@ -0,0 +1,154 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from MOJIZA.models import Database, Field, Model
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = Database(str(tmp_path / "test.sqlite3"))
+    yield database
+    database.close_all()
+
+
+@pytest.fixture
+def Post(database):
+    class Post(Model):
+        __database__ = database
+        title = Field("string", null=False)
+        slug = Field("string", unique=True)
+        views = Field("integer", default=0)
+        published = Field("boolean", default=False)
+        created = Field("datetime")
+        meta = Field("json")
+
+    Post.create_table()
+    return Post
+
+
+def make_posts(Post, count, start=0):
+    return [Post(title=f"post {i}", slug=f"post-{i}", views=i) for i in range(start, start + count)]
+
+
+def test_bulk_create_assigns_sequential_ids(Post):
+    posts = Post.bulk_create(make_posts(Post, 10))
+    assert [p.id for p in posts] == list(range(1, 11))
+    stored = {p.id: p.slug for p in Post.filter(order_by="id")}
+    assert stored == {p.id: p.slug for p in posts}
+
+
+@pytest.mark.parametrize("batch_size", [None, 1, 3, 7, 100])
+def test_bulk_create_batches(Post, batch_size):
+    Post.create(title="first", slug="first")
+    posts = Post.bulk_create(make_posts(Post, 20), batch_size=batch_size)
+    assert [p.id for p in posts] == list(range(2, 22))
+    assert Post.count() == 21
+    for post in posts:
+        assert Post.get(id=post.id).slug == post.slug
+
+
+def test_bulk_create_with_explicit_ids(Post):
+    explicit = Post(id=100, title="explicit", slug="explicit")
+    new = make_posts(Post, 3)
+    Post.bulk_create([new[0], explicit, new[1], new[2]], batch_size=2)
+    assert explicit.id == 100
+    assert [p.id for p in new] == [101, 102, 103]
+    assert sorted(p.id for p in Post.all()) == [100, 101, 102, 103]
+
+
+def test_bulk_create_round_trips_field_types(Post):
+    created = datetime.datetime(2024, 5, 1, 12, 30)
+    Post.bulk_create([Post(title="t", slug="t", published=True, created=created, meta={"tags": ["a", "b"]})])
+    post = Post.get(slug="t")
+    assert (post.views, post.published, post.created, post.meta) == (0, True, created, {"tags": ["a", "b"]})
+
+
+def test_bulk_create_is_atomic(Post):
+    Post.create(title="taken", slug="post-5")
+    with pytest.raises(sqlite3.IntegrityError):
+        Post.bulk_create(make_posts(Post, 10), batch_size=3)
+    assert Post.count() == 1
+
+
+def test_bulk_create_joins_outer_transaction(Post, database):
+    with pytest.raises(RuntimeError):
+        with database.transaction():
+            Post.bulk_create(make_posts(Post, 5))
+            assert Post.count() == 5
+            raise RuntimeError("rollback")
+    assert Post.count() == 0
+
+
+def test_bulk_create_empty(Post):
+    assert Post.bulk_create([]) == []
+    assert Post.count() == 0
+
+
+def test_bulk_update_selected_fields(Post):
+    posts = Post.bulk_create(make_posts(Post, 10))
+    for post in posts:
+        post.views += 100
+        post.title = "changed"
+    assert Post.bulk_update(posts, fields=["views"], batch_size=4) == 10
+    stored = Post.filter(order_by="id")
+    assert [p.views for p in stored] == [i + 100 for i in range(10)]
+    assert all(p.title.startswith("post ") for p in stored)
+
+
+def test_bulk_update_all_fields(Post):
+    posts = Post.bulk_create(make_posts(Post, 3))
+    for post in posts:
+        post.title = f"new {post.id}"
+        post.published = True
+    Post.bulk_update(posts)
+    assert [(p.title, p.published) for p in Post.filter(order_by="id")] == [
+        ("new 1", True), ("new 2", True), ("new 3", True)]
+
+
+def test_bulk_update_is_atomic(Post):
+    posts = Post.bulk_create(make_posts(Post, 5))
+    for post in posts:
+        post.slug = "same"
+    with pytest.raises(sqlite3.IntegrityError):
+        Post.bulk_update(posts, fields=["slug"])
+    assert sorted(p.slug for p in Post.all()) == [f"post-{i}" for i in range(5)]
+
+
+@pytest.mark.parametrize("fields", [["id"], ["missing"], ["views", "id"]])
+def test_bulk_update_rejects_bad_fields(Post, fields):
+    posts = Post.bulk_create(make_posts(Post, 2))
+    with pytest.raises(TypeError):
+        Post.bulk_update(posts, fields=fields)
+
+
+def test_connection_per_thread(database):
+    main = database.connection()
+    assert database.connection() is main
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(database.connection()))
+    thread.start()
+    thread.join()
+    assert seen[0] is not main
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork() yo'q")
+def test_connection_is_not_reused_after_fork(Post, database):
+    Post.bulk_create(make_posts(Post, 3))
+    parent = database.connection()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ok = database.connection() is not parent
+            Post.bulk_create(make_posts(Post, 3, start=3))
+            os._exit(0 if ok and Post.count() == 6 else 1)
+        except BaseException:
+            os._exit(2)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert database.connection() is parent
+    assert Post.count() == 6
+    assert database.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
@@ -0,0 +1,156 @@
+import pytest
+
+from MOJIZA.engine.multipart import MultipartError, get_boundary, parse_multipart, parse_options
+
+BOUNDARY = b"----mojizaBoundary7MA4YWxk"
+
+
+def build_body(parts, boundary=BOUNDARY):
+    """parts: (name, value) yoki (name, filename, content_type, data)."""
+    out = b"preamble\r\n"
+    for part in parts:
+        out += b"--" + boundary + b"\r\n"
+        if len(part) == 2:
+            name, value = part
+            out += b'Content-Disposition: form-data; name="%s"\r\n\r\n%s\r\n' % (name.encode(), value)
+        else:
+            name, filename, content_type, data = part
+            out += (b'Content-Disposition: form-data; name="%s"; filename="%s"\r\n'
+                    b"Content-Type: %s\r\n\r\n%s\r\n" % (name.encode(), filename.encode(), content_type.encode(), data))
+    return out + b"--" + boundary + b"--\r\nepilogue"
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def read_files(files):
+    return {name: [(f.filename, f.content_type, f.read()) for f in uploads] for name, uploads in files.items()}
+
+
+PARTS = [
+    ("title", b"Salom dunyo"),
+    ("file", "a.txt", "text/plain", b"line 1\r\n--not-a-boundary\r\nline 2"),
+    ("title", b"ikkinchi"),
+    ("blob", "b.bin", "application/octet-stream", bytes(range(256)) * 4),
+]
+
+
+def test_fields_and_files():
+    fields, files = parse_multipart([build_body(PARTS)], BOUNDARY)
+    assert fields == {"title": ["Salom dunyo", "ikkinchi"]}
+    assert read_files(files) == {
+        "file": [("a.txt", "text/plain", b"line 1\r\n--not-a-boundary\r\nline 2")],
+        "blob": [("b.bin", "application/octet-stream", bytes(range(256)) * 4)],
+    }
+    assert files["blob"][0].size == 1024
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 13, 29, 64, 1000])
+def test_boundary_split_across_chunks(size):
+    body = build_body(PARTS)
+    expected_fields, expected_files = parse_multipart([body], BOUNDARY)
+    fields, files = parse_multipart(chunked(body, size), BOUNDARY)
+    assert fields == expected_fields
+    assert read_files(files) == read_files(expected_files)
+
+
+def test_every_split_position():
+    body = build_body([("a", b"x" * 50), ("f", "f.txt", "text/plain", b"y" * 50)])
+    for cut in range(1, len(body)):
+        fields, files = parse_multipart([body[:cut], body[cut:]], BOUNDARY)
+        assert fields == {"a": ["x" * 50]}
+        assert files["f"][0].read() == b"y" * 50
+
+
+@pytest.mark.parametrize("keep", [0.1, 0.5, 0.9, 0.99])
+def test_truncated_body(keep):
+    body = build_body(PARTS)
+    truncated = body[:int(len(body) * keep)]
+    with pytest.raises(MultipartError) as exc:
+        parse_multipart(chunked(truncated, 16), BOUNDARY)
+    assert exc.value.status == 400
+
+
+def test_missing_closing_delimiter():
+    body = build_body(PARTS)
+    without_end = body[:body.rindex(b"--" + BOUNDARY + b"--")]
+    with pytest.raises(MultipartError):
+        parse_multipart([without_end], BOUNDARY)
+
+
+def test_no_boundary_in_body():
+    with pytest.raises(MultipartError):
+        parse_multipart([b"just some bytes"], BOUNDARY)
+
+
+def test_field_size_limit():
+    body = build_body([("small", b"1234567890"), ("big", b"x" * 11)])
+    with pytest.raises(MultipartError) as exc:
+        parse_multipart(chunked(body, 4), BOUNDARY, max_field_size=10)
+    assert exc.value.status == 413
+
+
+def test_field_size_limit_does_not_apply_to_files():
+    body = build_body([("small", b"1234567890"), ("f", "f.bin", "application/octet-stream", b"x" * 100)])
+    fields, files = parse_multipart([body], BOUNDARY, max_field_size=10)
+    assert fields == {"small": ["1234567890"]}
+    assert files["f"][0].size == 100
+
+
+def test_empty_filename():
+    # Fayl tanlanmagan <input type="file">: brauzer filename="" va bo'sh mazmun yuboradi
+    body = build_body([("title", b"t"), ("file", "", "application/octet-stream", b"")])
+    fields, files = parse_multipart([body], BOUNDARY)
+    assert fields == {"title": ["t"]}
+    upload = files["file"][0]
+    assert (upload.filename, upload.size, upload.read()) == ("", 0, b"")
+
+
+def test_filename_path_is_stripped():
+    body = build_body([("file", "C:\\Users\\ali\\photo.png", "image/png", b"png")])
+    _, files = parse_multipart([body], BOUNDARY)
+    assert files["file"][0].filename == "photo.png"
+
+
+def test_large_file_is_spooled_to_disk():
+    data = b"z" * 5000
+    body = build_body([("file", "big.bin", "application/octet-stream", data)])
+    _, files = parse_multipart(chunked(body, 512), BOUNDARY, spool_size=1024)
+    upload = files["file"][0]
+    assert upload.file._rolled
+    assert b"".join(upload.chunks(700)) == data
+
+
+def test_files_are_closed_on_error():
+    body = build_body([("f", "f.txt", "text/plain", b"data"), ("big", b"x" * 20)])
+    opened = []
+    original = __import__("tempfile").SpooledTemporaryFile
+
+    class Tracking(original):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    import MOJIZA.engine.multipart as multipart
+    multipart.tempfile.SpooledTemporaryFile = Tracking
+    try:
+        with pytest.raises(MultipartError):
+            parse_multipart([body], BOUNDARY, max_field_size=10)
+    finally:
+        multipart.tempfile.SpooledTemporaryFile = original
+    assert opened and all(f.closed for f in opened)
+
+
+def test_get_boundary():
+    assert get_boundary('multipart/form-data; boundary="abc"') == b"abc"
+    assert get_boundary("multipart/form-data; boundary=abc") == b"abc"
+    assert get_boundary("application/x-www-form-urlencoded") is None
+    with pytest.raises(MultipartError):
+        get_boundary("multipart/form-data")
+
+
+def test_parse_options_rfc5987_filename():
+    kind, options = parse_options("form-data; name=\"f\"; filename*=UTF-8''%D1%84.txt")
+    assert kind == "form-data"
+    assert options == {"name": "f", "filename": "ф.txt"}
@@ -0,0 +1,126 @@
+import pytest
+
+from MOJIZA.engine.routing import Router, parse_route
+
+
+def make_router(*routes):
+    router = Router()
+    for route in routes:
+        if isinstance(route, tuple):
+            router.add_route(route[0], view_for(route[0]), exact=route[1])
+        else:
+            router.add_route(route, view_for(route))
+    return router
+
+
+def view_for(name):
+    def view(request, **params):
+        return name
+    view.__name__ = name
+    return view
+
+
+def matched(router, path):
+    route, params = router.match(path)
+    return (route.route, params) if route is not None else None
+
+
+def test_literal_routes():
+    router = make_router("/", "/about", "/about/team")
+    assert matched(router, "/") == ("/", {})
+    assert matched(router, "/about") == ("/about", {})
+    assert matched(router, "/about/team") == ("/about/team", {})
+    assert matched(router, "/abou") is None
+    assert matched(router, "/about/") is None
+
+
+def test_exact_beats_prefix_and_longest_prefix_wins():
+    router = make_router(("/static/", False), ("/static/img/", False), "/static/robots.txt")
+    assert matched(router, "/static/robots.txt")[0] == "/static/robots.txt"
+    assert matched(router, "/static/img/a.png")[0] == "/static/img/"
+    assert matched(router, "/static/css/a.css")[0] == "/static/"
+    assert matched(router, "/stat") is None
+
+
+def test_first_added_route_wins():
+    router = Router()
+    first, second = view_for("first"), view_for("second")
+    router.add_route("/same", first)
+    router.add_route("/same", second)
+    assert router.get_view("/same") is first
+
+
+def test_literal_beats_parameter():
+    router = make_router("/users/<int:id>", "/users/me")
+    assert matched(router, "/users/me") == ("/users/me", {})
+    assert matched(router, "/users/7") == ("/users/<int:id>", {"id": 7})
+
+
+def test_converter_precedence():
+    router = make_router("/x/<str:s>", "/x/<slug:s>", "/x/<int:s>", "/x/<path:s>")
+    assert matched(router, "/x/42") == ("/x/<int:s>", {"s": 42})
+    assert matched(router, "/x/ab-c") == ("/x/<slug:s>", {"s": "ab-c"})
+    assert matched(router, "/x/a.b") == ("/x/<str:s>", {"s": "a.b"})
+    assert matched(router, "/x/a/b") == ("/x/<path:s>", {"s": "a/b"})
+
+
+def test_parameter_falls_back_when_rest_does_not_match():
+    router = make_router("/blog/<int:year>/archive", "/blog/<slug:title>/comments")
+    assert matched(router, "/blog/2024/archive") == ("/blog/<int:year>/archive", {"year": 2024})
+    assert matched(router, "/blog/2024/comments") == ("/blog/<slug:title>/comments", {"title": "2024"})
+
+
+def test_str_does_not_cross_segments():
+    router = make_router("/users/<name>")
+    assert matched(router, "/users/ali") == ("/users/<name>", {"name": "ali"})
+    assert matched(router, "/users/ali/x") is None
+    assert matched(router, "/users/") is None
+
+
+@pytest.mark.parametrize("route, path, params", [
+    ("/p/<name>.html", "/p/x.html", {"name": "x"}),
+    ("/p/<name>.html", "/p/a.b.html", {"name": "a.b"}),
+    ("/file-<int:id>.txt", "/file-12.txt", {"id": 12}),
+    ("/a/<x>-<y>", "/a/foo-bar-baz", {"x": "foo-bar", "y": "baz"}),
+    ("/s/<slug:a>_<slug:b>", "/s/one_two_three", {"a": "one_two", "b": "three"}),
+    ("/d/<a>.<b>.gz", "/d/a.tar.gz", {"a": "a", "b": "tar"}),
+])
+def test_backtracking(route, path, params):
+    assert matched(make_router(route), path) == (route, params)
+
+
+@pytest.mark.parametrize("path", ["/p/.html", "/p/x.htm", "/p/x.html/", "/file-.txt", "/file-1x.txt"])
+def test_backtracking_misses(path):
+    assert matched(make_router("/p/<name>.html", "/file-<int:id>.txt"), path) is None
+
+
+def test_prefix_route_with_parameter():
+    router = make_router(("/u/<int:id>/", False))
+    assert matched(router, "/u/5/anything/else") == ("/u/<int:id>/", {"id": 5})
+
+
+def test_path_must_be_last():
+    with pytest.raises(ValueError):
+        parse_route("/a/<path:rest>/b")
+    with pytest.raises(ValueError):
+        parse_route("/a/<float:x>")
+
+
+def test_replace_app_routes_is_atomic():
+    router = Router()
+    router.add_route("/a", view_for("a-old"), app="app-a")
+    router.add_route("/b", view_for("b"), app="app-b")
+
+    router.replace_app_routes("app-a", lambda: router.add_route("/a2", view_for("a-new")))
+    assert matched(router, "/a") is None
+    assert matched(router, "/a2") == ("/a2", {})
+    assert matched(router, "/b") == ("/b", {})
+
+    def broken():
+        router.add_route("/a3", view_for("a3"))
+        raise RuntimeError("import failed")
+
+    with pytest.raises(RuntimeError):
+        router.replace_app_routes("app-a", broken)
+    assert matched(router, "/a2") == ("/a2", {})
+    assert matched(router, "/a3") is None
@@ -0,0 +1,203 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from MOJIZA.engine.routing import router
+from MOJIZA.engine.server import make_server
+
+
+def hello():
+    return 200, "text/plain", "hello"
+
+
+def stream():
+    yield "bir,"
+    yield b"ikki,"
+    yield "uch"
+
+
+def echo(request):
+    return 200, "text/plain", request.body
+
+
+def ignore_body():
+    return 200, "text/plain", "ok"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def routes():
+    def register():
+        router.add_route("/t/hello", hello)
+        router.add_route("/t/stream", stream)
+        router.add_route("/t/echo", echo)
+        router.add_route("/t/ignore", ignore_body)
+    router.replace_app_routes("tests", register)
+    yield
+    router.replace_app_routes("tests", lambda: None)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(workers=1, **kwargs):
+        server = make_server(0, workers=workers, **kwargs)
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        servers.append((server, thread))
+        return server.server_address[1]
+
+    yield start
+    for server, thread in servers:
+        server.shutdown()
+        server.server_close()
+        thread.join(5)
+
+
+class Client:
+    def __init__(self, port):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        self.rfile = self.sock.makefile("rb")
+
+    def send(self, *requests):
+        self.sock.sendall(b"".join(requests))
+
+    def read_response(self):
+        """(status, headers, body): Content-Length va chunked framing bo'yicha o'qiydi."""
+        status_line = self.rfile.readline()
+        if not status_line:
+            return None
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = self.rfile.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, value = line.decode().split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if not size:
+                    break
+                body += chunk
+        else:
+            body = self.rfile.read(int(headers.get("content-length", 0)))
+        return status, headers, body
+
+    def closed_by_server(self):
+        return self.rfile.read(1) == b""
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+
+def get(path, close=False):
+    return (f"GET {path} HTTP/1.1\r\nHost: test\r\n"
+            + ("Connection: close\r\n" if close else "") + "\r\n").encode()
+
+
+def post(path, body):
+    return f"POST {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+
+
+@pytest.fixture(params=[1, 4], ids=["single", "pooled"])
+def workers(request):
+    return request.param
+
+
+def test_one_request_per_connection(serve, workers):
+    port = serve(workers)
+    for _ in range(3):
+        client = Client(port)
+        client.send(get("/t/hello", close=True))
+        status, headers, body = client.read_response()
+        assert (status, body, headers["connection"]) == (200, b"hello", "close")
+        assert client.closed_by_server()
+        client.close()
+
+
+def test_keep_alive_reuses_connection(serve, workers):
+    client = Client(serve(workers))
+    for _ in range(5):
+        client.send(get("/t/hello"))
+        status, headers, body = client.read_response()
+        assert (status, body) == (200, b"hello")
+        assert "connection" not in headers
+    client.close()
+
+
+def test_pipelined_requests(serve, workers):
+    client = Client(serve(workers))
+    client.send(get("/t/hello"), get("/t/stream"), post("/t/echo", b"salom"), get("/t/missing"), get("/t/hello"))
+    responses = [client.read_response() for _ in range(5)]
+    assert [(status, body) for status, _, body in responses] == [
+        (200, b"hello"), (200, b"bir,ikki,uch"), (200, b"salom"), (404, b"404 Not Found"), (200, b"hello")]
+    assert responses[1][1]["transfer-encoding"] == "chunked"
+    client.close()
+
+
+def test_unread_body_does_not_break_next_request(serve, workers):
+    client = Client(serve(workers))
+    client.send(post("/t/ignore", b"x" * 10000), get("/t/hello"))
+    assert client.read_response()[2] == b"ok"
+    assert client.read_response()[2] == b"hello"
+    client.close()
+
+
+def test_idle_connection_does_not_block_others(serve, workers):
+    port = serve(workers)
+    idle = [Client(port) for _ in range(workers + 1)]
+    idle[0].send(get("/t/hello"))
+    idle[0].read_response()
+    client = Client(port)
+    start = time.monotonic()
+    client.send(get("/t/hello"))
+    assert client.read_response()[2] == b"hello"
+    assert time.monotonic() - start < 1
+    for c in idle + [client]:
+        c.close()
+
+
+def test_idle_timeout_closes_connection(serve, workers):
+    client = Client(serve(workers, keep_alive_timeout=1))
+    client.send(get("/t/hello"))
+    assert client.read_response()[0] == 200
+    start = time.monotonic()
+    assert client.closed_by_server()
+    assert 0.5 < time.monotonic() - start < 3
+    client.close()
+
+
+def test_keep_alive_disabled(serve, workers):
+    port = serve(workers, keep_alive_timeout=0)
+    for _ in range(3):
+        client = Client(port)
+        client.send(get("/t/hello"))
+        status, headers, body = client.read_response()
+        assert (status, body, headers["connection"]) == (200, b"hello", "close")
+        assert client.closed_by_server()
+        client.close()
+
+
+def test_keep_alive_disabled_first_request_sent_late(serve, workers):
+    client = Client(serve(workers, keep_alive_timeout=0))
+    time.sleep(0.3)
+    client.send(get("/t/hello"))
+    assert client.read_response()[2] == b"hello"
+    client.close()
+
+
+def test_max_requests_per_connection(serve, workers):
+    client = Client(serve(workers, max_keep_alive_requests=2))
+    client.send(get("/t/hello"), get("/t/hello"), get("/t/hello"))
+    first, second = client.read_response(), client.read_response()
+    assert "connection" not in first[1]
+    assert second[1]["connection"] == "close"
+    assert client.read_response() is None
+    client.close()
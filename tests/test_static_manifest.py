@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+from MOJIZA.static import manifest as manifest_module
+from MOJIZA.static.manifest import MANIFEST_NAME, StaticManifest, file_hash
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "app.css").write_text("body { color: red }")
+    (tmp_path / "app.js").write_text("console.log(1)")
+    return tmp_path
+
+
+def test_hashed_name_round_trip(static_dir):
+    manifest = StaticManifest(str(static_dir))
+    digest = file_hash(str(static_dir / "css" / "app.css"))
+    hashed = manifest.get("css/app.css")
+    assert hashed == f"css/app.{digest}.css"
+    assert manifest.original(hashed) == "css/app.css"
+    assert manifest.original(f"css/app.{'0' * len(digest)}.css") is None
+    assert manifest.get("missing.css") == "missing.css"
+
+
+def test_lookups_do_not_touch_the_filesystem(static_dir, monkeypatch):
+    manifest = StaticManifest(str(static_dir))
+    hashed = manifest.get("app.js")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stat on the hot path")
+
+    monkeypatch.setattr(manifest_module.os, "stat", fail)
+    for _ in range(3):
+        assert manifest.get("app.js") == hashed
+        assert manifest.original(hashed) == "app.js"
+
+
+def test_discard_rehashes_changed_file(static_dir):
+    manifest = StaticManifest(str(static_dir))
+    old = manifest.get("app.js")
+    (static_dir / "app.js").write_text("console.log(2)")
+    assert manifest.get("app.js") == old
+    manifest.discard("app.js")
+    new = manifest.get("app.js")
+    assert new != old
+    assert manifest.original(old) is None
+    assert manifest.original(new) == "app.js"
+
+
+def test_build_and_load(static_dir):
+    names = StaticManifest(str(static_dir)).build()
+    data = json.loads((static_dir / MANIFEST_NAME).read_text())
+    assert data["version"] == 2
+    assert set(data["files"]) == {"css/app.css", "app.js"}
+    loaded = StaticManifest(str(static_dir))
+    assert loaded.get("css/app.css") == names["css/app.css"][0]
+
+
+def test_load_drops_entries_changed_after_build(static_dir):
+    StaticManifest(str(static_dir)).build()
+    path = static_dir / "app.js"
+    path.write_text("console.log('changed')")
+    os.utime(path, ns=(0, 10 ** 18))
+    loaded = StaticManifest(str(static_dir))
+    assert loaded.get("app.js") == f"app.{file_hash(str(path))}.js"
+
+
+def test_old_format_is_ignored(static_dir):
+    (static_dir / MANIFEST_NAME).write_text(json.dumps({"app.js": "app.000000000000.js"}))
+    manifest = StaticManifest(str(static_dir))
+    assert manifest.original("app.000000000000.js") is None
+    assert manifest.get("app.js") == f"app.{file_hash(str(static_dir / 'app.js'))}.js"